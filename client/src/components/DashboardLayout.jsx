@@ -13,6 +13,7 @@ import TrendingSection from './TrendingSection';
 import { useTranslation } from 'react-i18next';
 import { useAuth } from '../context/AuthContext';
 import { useNavigate } from 'react-router-dom';
+import { streamSearch } from '../utils/helpers';
 
 const DashboardLayout = () => {
     const { t, i18n } = useTranslation();
@@ -221,12 +222,11 @@ const DashboardLayout = () => {
         Promise.all([
             fetch(`/api/news?q=${encodeURIComponent(query)}&lang=${i18n.language}`).then(r => r.ok ? r.json() : []).catch(() => []),
             fetch(`/api/videos?q=${encodeURIComponent(query)}&lang=${i18n.language}`).then(r => r.ok ? r.json() : []).catch(() => []),
-            fetch('/api/search', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ topic: query, type: 'web', lang: i18n.language }),
-                signal: AbortSignal.timeout(30000)
-            }).then(r => r.ok ? r.json() : { results: [] }).catch(() => ({ results: [] }))
+            streamSearch(
+                { topic: query, type: 'web', lang: i18n.language },
+                (partial) => setWebResults(partial),
+                { signal: AbortSignal.timeout(30000) }
+            ).catch(() => ({ results: [] }))
         ]).then(([newsData, videoData, webData]) => {
             setNews(Array.isArray(newsData) ? newsData : []);
             setVideos(Array.isArray(videoData) ? videoData : []);
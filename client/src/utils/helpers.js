@@ -15,3 +15,44 @@ export const getTopicImage = (title) => {
     if (t.includes('church') || t.includes('worship')) return "https://images.unsplash.com/photo-1438232992991-995b7058bbb3?auto=format&fit=crop&q=80&w=800";
     return "https://images.unsplash.com/photo-1507643179173-617d6540d696?auto=format&fit=crop&q=80&w=800";
 };
+
+// Helper to consume a streamed (NDJSON) /api/search response.
+// Calls onPartial with the accumulated results after each partial frame
+// and resolves with the final "commit" frame.
+export const streamSearch = async (body, onPartial, { signal } = {}) => {
+    const resp = await fetch('/api/search', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json', 'Accept': 'application/x-ndjson' },
+        body: JSON.stringify({ ...body, stream: true }),
+        signal
+    });
+    if (!resp.ok || !resp.body) return { results: [] };
+
+    const reader = resp.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let partial = [];
+    let commit = { results: [] };
+
+    const handleLine = (line) => {
+        if (!line.trim()) return;
+        const frame = JSON.parse(line);
+        if (frame.type === 'partial') {
+            partial = partial.concat(frame.results || []);
+            onPartial && onPartial(partial);
+        } else if (frame.type === 'commit') {
+            commit = frame;
+        }
+    };
+
+    while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split('\n');
+        buffer = lines.pop();
+        lines.forEach(handleLine);
+    }
+    handleLine(buffer);
+    return commit;
+};
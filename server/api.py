@@ -55,6 +55,8 @@ app.register_blueprint(auth_bp, url_prefix='/api/auth')
 
 from src.video_engine import VideoEngine
 from src.topic_manager import topic_manager
+from src.feed_snapshots import feed_snapshots
+from src.rag_ingest import rag_ingest
 
 # Initialize core components (Lightweight)
 orchestrator = Orchestrator()
@@ -369,6 +371,11 @@ def search_endpoint():
     keys = {'serpapi': serpapi_key}
 
     print(f"📡 API: Searching '{topic}' (Type: {search_type})...")
+
+    # [STREAMING] NDJSON (default) or SSE frames as each agent returns
+    stream_format = _requested_stream_format(data)
+    if stream_format:
+        return _stream_web_search(topic, intents, limit, time_filter, keys, stream_format)
     
     results = []
     errors = []
@@ -386,6 +393,31 @@ def search_endpoint():
         print(f"⚠️ Orchestrator Error: {e}")
         errors.append(f"Orchestrator failed: {str(e)}")
 
+    processed = _finalize_web_results(topic, results, errors, limit)
+
+    return jsonify({
+        "results": processed,
+        "errors": errors,
+        "count": len(processed)
+    })
+
+def _format_web_result(r):
+    """Shape a single orchestrator/discovery result for the frontend."""
+    return {
+        'title': r.get('title') or 'Untitled Result',
+        'url': r.get('url') or r.get('href') or r.get('link') or '#',
+        'snippet': r.get('snippet') or '',
+        'source': r.get('source_type', 'web'),
+        'engine': r.get('engine', 'unknown'),
+        'image': r.get('image'), 
+        'published': r.get('published_at') or r.get('published'),
+        'geo_tier': r.get('_geo_tier', 'Global'),
+        'geo_confidence': r.get('_geo_confidence', 0.0),
+        'debug_score': r.get('_hybrid_score', 0)
+    }
+
+def _finalize_web_results(topic, results, errors, limit):
+    """Background analysis + DiscoveryEngine fallback + frontend formatting (mutates `errors`)."""
     # [NEW] Trigger Background Analysis for Web Search too (User Request)
     if results:
         threading.Thread(target=_run_background_analysis, args=(topic, results)).start()
@@ -420,28 +452,62 @@ def search_endpoint():
             errors.append(f"Fallback search failed: {str(fe)}")
     
     # Process results to ensure frontend friendliness
-    processed = []
-    for r in results:
-        processed.append({
-            'title': r.get('title') or 'Untitled Result',
-            'url': r.get('url') or r.get('href') or r.get('link') or '#',
-            'snippet': r.get('snippet') or '',
-            'source': r.get('source_type', 'web'),
-            'engine': r.get('engine', 'unknown'),
-            'image': r.get('image'), 
-            'published': r.get('published_at') or r.get('published'),
-            'geo_tier': r.get('_geo_tier', 'Global'),
-            'debug_score': r.get('_hybrid_score', 0)
-        })
+    processed = [_format_web_result(r) for r in results]
 
     if not processed and not errors:
         errors.append("No results found. Try broadening your search or enabling more sources.")
 
-    return jsonify({
-        "results": processed,
-        "errors": errors,
-        "count": len(processed)
-    })
+    return processed
+
+def _requested_stream_format(data):
+    """'ndjson' / 'sse' if the client asked for a streamed response, else None."""
+    accept = request.headers.get('Accept', '')
+    if 'text/event-stream' in accept or data.get('stream') == 'sse':
+        return 'sse'
+    if 'application/x-ndjson' in accept or data.get('stream'):
+        return 'ndjson'
+    return None
+
+def _stream_web_search(topic, intents, limit, time_filter, keys, stream_format):
+    """
+    Streams partial, already-filtered batches as each agent returns,
+    then a final re-ranked 'commit' frame with the same shape as the JSON response.
+    """
+    from flask import Response, stream_with_context
+
+    def encode(frame):
+        payload = json.dumps(frame)
+        if stream_format == 'sse':
+            return f"event: {frame['type']}\ndata: {payload}\n\n"
+        return payload + "\n"
+
+    def generate():
+        results = []
+        errors = []
+        try:
+            for frame in orchestrator.run_stream(topic, active_intents=intents, limit=limit, time_filter=time_filter, keys=keys):
+                if frame['type'] == 'partial':
+                    yield encode({
+                        "type": "partial",
+                        "intent": frame['intent'],
+                        "results": [_format_web_result(r) for r in frame['results']]
+                    })
+                elif frame['type'] == 'commit':
+                    results, errors = frame['results'], frame['errors']
+        except Exception as e:
+            print(f"⚠️ Orchestrator Error: {e}")
+            errors.append(f"Orchestrator failed: {str(e)}")
+
+        processed = _finalize_web_results(topic, results, errors, limit)
+        yield encode({
+            "type": "commit",
+            "results": processed,
+            "errors": errors,
+            "count": len(processed)
+        })
+
+    mimetype = 'text/event-stream' if stream_format == 'sse' else 'application/x-ndjson'
+    return Response(stream_with_context(generate()), mimetype=mimetype, headers={'X-Accel-Buffering': 'no'})
 
 @app.route('/api/scrape', methods=['POST'])
 def scrape_endpoint():
@@ -457,10 +523,10 @@ def scrape_endpoint():
         content = extractor.extract(item.get('url'))
         scraped = {'content': content, 'error': None if content else "Failed to extract"}
         
-        # RAG Ingestion
-        if scraped.get('content') and rag_engine:
+        # RAG Ingestion (background queue; the response doesn't wait for embedding)
+        if scraped.get('content'):
             # Scrape thread usually returns dict, let's ensure we ingest valid text
-            rag_engine.ingest(
+            rag_ingest.submit(
                 scraped['content'], 
                 metadata={
                     "source": item.get('url'), 
@@ -468,7 +534,7 @@ def scrape_endpoint():
                     "type": item.get('source_type', 'web')
                 }
             )
-            print("  💾 RAG: Ingested scraped content.")
+            print("  💾 RAG: Queued scraped content for ingestion.")
             
         return jsonify(scraped)
     except Exception as e:
@@ -525,6 +591,167 @@ def analytics_report():
     return jsonify({"error": "No analysis available. Search for a topic first."})
 
 
+def _build_news_feed(lang, active_topics):
+    """[snapshot builder] Topic-filtered, translated news feed for one language."""
+    topic_query = topic_manager.get_active_topic_query(active_topics)
+    
+    articles = []
+    
+    # STRICT MODE: If topics are selected, ONLY show content from those topics
+    if active_topics:
+        if topic_query:
+            # Search specific active topics only
+            try:
+                articles = news_feeder.get_news_by_language(lang, topic_query=topic_query)
+                print(f"✅ [News Feed] Strict topic filtering: Found {len(articles)} articles for topics: {active_topics}")
+            except Exception as e:
+                print(f"⚠️ [News Feed] Topic search failed: {e}")
+                articles = []
+        
+        # If no results from search, try DB but filter by active topics
+        if not articles:
+            try:
+                # Define loose keywords for specific topics
+                topic_keywords = {
+                    "Christianity": ['church', 'jesus', 'christ', 'faith', 'bible', 'prayer', 'gospel', 'pastor', 'bishop', 'vatican', 'catholic', 'protestant', 'ministry'],
+                    "Global News": ['news', 'world', 'international', 'report']
+                }
+
+                # Articles containing any active topic OR its related keywords (trigram index, newest first)
+                terms = []
+                for topic in active_topics:
+                    terms.append(topic)
+                    terms.extend(topic_keywords.get(topic, []))
+                filtered_articles = news_feeder.search_library(None, keywords=terms, limit=20, order='recent')
+                
+                # If we filtered everything out, effectively showing nothing...
+                # Fallback: if 'Christianity' is active, and we have items, just show them (DB is mostly christian anyway)
+                if not filtered_articles and "Christianity" in active_topics:
+                     print("⚠️ [News Feed] Strict filter empty. Defaulting to all DB news (Assuming Christian context).")
+                     filtered_articles = news_feeder.get_news(limit=20)
+
+                articles = filtered_articles[:20]  # Limit to 20
+                print(f"✅ [News Feed] DB filtered by topics: {len(articles)} articles match {active_topics}")
+            except Exception as e:
+                print(f"⚠️ [News Feed] DB filtering failed: {e}")
+                articles = []
+    else:
+        # NO TOPICS SELECTED: Show all content (fallback mode)
+        print("⚠️ [News Feed] No topics active - showing all content")
+        try:
+            articles = news_feeder.get_news(limit=10)
+        except Exception as e:
+            print(f"⚠️ [News Feed] Fallback failed: {e}")
+            articles = []
+         
+    # Ensure list of dicts (fix for sqlite3.Row)
+    articles = [dict(a) for a in articles]
+    # print(f"API News Count: {len(articles)}")
+
+    # Translate if needed
+    # Re-enabling with reduced limit (10 items) to ensure responsiveness
+    if lang != 'en' and articles:
+        try:
+            # print(f"Translating {len(articles)} items to {lang}...")
+            for a in articles:
+                if 'summary' in a: a['snippet'] = a['summary']
+            
+            articles = translator.translate_batch(articles, lang)
+        except Exception as e:
+            print(f"Translation error: {e}")
+            # Return English version if translation fails
+            pass
+    
+    for a in articles:
+        if 'snippet' in a: a['summary'] = a['snippet']
+
+    return articles
+
+
+def _build_video_feed(lang, active_topics):
+    """[snapshot builder] Topic-filtered, translated video feed for one language."""
+    topic_query = topic_manager.get_active_topic_query(active_topics)
+    
+    videos = []
+    
+    # STRICT MODE: If topics are selected, ONLY show content from those topics
+    if active_topics:
+        if topic_query:
+            # Search specific active topics only
+            try:
+                videos = video_engine.get_videos_by_language(lang, topic_query=topic_query)
+                print(f"✅ [Video Feed] Strict topic filtering: Found {len(videos)} videos for topics: {active_topics}")
+            except Exception as e:
+                print(f"⚠️ [Video Feed] Topic search failed: {e}")
+                videos = []
+        
+        # If no results from search, try DB but filter by active topics
+        # If no results from search, try DB but filter by active topics
+        if not videos:
+            try:
+                # Filter by active topics BUT allow Priority Content (JRM)
+                priority_keywords = ['jesus redeems', 'mohan c lazarus', 'mohan c. lazarus', 'comforter tv', 'nalumavadi', 'jrm']
+                
+                # Define loose keywords for specific topics (Shared logic)
+                topic_keywords = {
+                    "Christianity": ['church', 'jesus', 'christ', 'faith', 'bible', 'prayer', 'gospel', 'pastor', 'bishop', 'vatican', 'catholic', 'protestant', 'ministry', 'worship'],
+                    "Global News": ['news', 'world', 'international', 'report']
+                }
+
+                # Priority content, or videos matching any active topic OR its related keywords
+                # (substring match over title + channel via the trigram index, newest first)
+                terms = list(priority_keywords)
+                for topic in active_topics:
+                    terms.append(topic)
+                    terms.extend(topic_keywords.get(topic, []))
+                filtered_videos = video_engine.search_library(None, keywords=terms, limit=100, order='recent')
+                
+                # Sort: Priority content first
+                def sort_key(v):
+                    text = (v.get('title', '') + v.get('channel', '')).lower()
+                    return 0 if any(k in text for k in priority_keywords) else 1
+                
+                filtered_videos.sort(key=sort_key)
+                videos = filtered_videos[:20]  # Limit to 20
+                print(f"✅ [Video Feed] DB filtered: {len(videos)} videos (Priority + Topics)")
+            except Exception as e:
+                print(f"⚠️ [Video Feed] DB filtering failed: {e}")
+                videos = []
+    else:
+        # NO TOPICS SELECTED: Show all content (fallback mode)
+        print("⚠️ [Video Feed] No topics active - showing all content")
+        try:
+            videos = video_engine.get_trending(limit=10)
+        except Exception as e:
+            print(f"⚠️ [Video Feed] Fallback failed: {e}")
+            videos = []
+    
+    # Ensure list of dicts
+    videos = [dict(v) for v in videos]
+    
+    # Translate if needed
+    if lang != 'en' and videos:
+        try:
+            for v in videos:
+                 if 'description' in v: v['snippet'] = v['description']
+                 
+            videos = translator.translate_batch(videos, lang)
+            
+            for v in videos:
+                 if 'snippet' in v: v['description'] = v['snippet']
+        except Exception as e:
+            print(f"Video Translation error: {e}")
+            pass
+
+    return videos
+
+
+# Prebuilt feeds: requests serve stored bytes; fetch cycles, moderation and topic changes trigger rebuilds
+feed_snapshots.register('news', _build_news_feed)
+feed_snapshots.register('videos', _build_video_feed)
+topic_manager.add_listener(feed_snapshots.topics_changed)
+
+
 @app.route('/api/news', methods=['GET'])
 def news_endpoint():
     """Fetch live Christian news (Localized or Cached)"""
@@ -558,14 +785,15 @@ def news_endpoint():
             
             # [ENHANCED] Also scrape content snippets for better relevance
             # This ensures we have full content available for reader mode
-            if articles and rag_engine:
-                print(f"📚 [News Search] Ingesting {len(articles)} articles into RAG for better search...")
+            # Queued for background ingestion (batched with other requests; also kept while RAG loads)
+            if articles:
+                print(f"📚 [News Search] Queueing {min(len(articles), 10)} articles for RAG ingestion...")
                 for article in articles[:10]:  # Limit to top 10 for performance
                     try:
                         # Extract snippet for RAG ingestion
                         snippet = article.get('snippet', '') or article.get('summary', '')
                         if snippet:
-                            rag_engine.ingest(
+                            rag_ingest.submit(
                                 f"{article.get('title', '')}\n{snippet}",
                                 metadata={
                                     "source": article.get('url', ''),
@@ -595,99 +823,10 @@ def news_endpoint():
 
             return jsonify(articles)
 
-        # [STRICT TOPIC FILTERING] Only show content from active topics selected by Super Admin
-        topic_query = topic_manager.get_active_topic_query()
-        active_topics = topic_manager.get_active_keywords()
-        
-        articles = []
-        
-        # STRICT MODE: If topics are selected, ONLY show content from those topics
-        if active_topics:
-            if topic_query:
-                # Search specific active topics only
-                try:
-                    articles = news_feeder.get_news_by_language(lang, topic_query=topic_query)
-                    print(f"✅ [News Feed] Strict topic filtering: Found {len(articles)} articles for topics: {active_topics}")
-                except Exception as e:
-                    print(f"⚠️ [News Feed] Topic search failed: {e}")
-                    articles = []
-            
-            # If no results from search, try DB but filter by active topics
-            if not articles:
-                try:
-                    all_db_news = news_feeder.get_news(limit=100)  # Get more to filter
-                    # Filter by active topics
-                    filtered_articles = []
-                    
-                    # Define loose keywords for specific topics
-                    topic_keywords = {
-                        "Christianity": ['church', 'jesus', 'christ', 'faith', 'bible', 'prayer', 'gospel', 'pastor', 'bishop', 'vatican', 'catholic', 'protestant', 'ministry'],
-                        "Global News": ['news', 'world', 'international', 'report']
-                    }
-
-                    for article in all_db_news:
-                        title_lower = article.get('title', '').lower()
-                        snippet_lower = article.get('snippet', '').lower()
-                        source_lower = article.get('source', '').lower()
-                        combined_text = f"{title_lower} {snippet_lower} {source_lower}"
-                        
-                        # Check if article matches any active topic OR its related keywords
-                        matched = False
-                        for topic in active_topics:
-                            if topic.lower() in combined_text:
-                                matched = True
-                                break
-                            # Check related keywords
-                            if topic in topic_keywords:
-                                if any(k in combined_text for k in topic_keywords[topic]):
-                                    matched = True
-                                    break
-                                    
-                        if matched:
-                            filtered_articles.append(article)
-                    
-                    # If we filtered everything out, effectively showing nothing...
-                    # Fallback: if 'Christianity' is active, and we have items, just show them (DB is mostly christian anyway)
-                    if not filtered_articles and "Christianity" in active_topics and all_db_news:
-                         print("⚠️ [News Feed] Strict filter empty. Defaulting to all DB news (Assuming Christian context).")
-                         filtered_articles = all_db_news
-
-                    articles = filtered_articles[:20]  # Limit to 20
-                    print(f"✅ [News Feed] DB filtered by topics: {len(articles)} articles match {active_topics}")
-                except Exception as e:
-                    print(f"⚠️ [News Feed] DB filtering failed: {e}")
-                    articles = []
-        else:
-            # NO TOPICS SELECTED: Show all content (fallback mode)
-            print("⚠️ [News Feed] No topics active - showing all content")
-            try:
-                articles = news_feeder.get_news(limit=10)
-            except Exception as e:
-                print(f"⚠️ [News Feed] Fallback failed: {e}")
-                articles = []
-             
-        # Ensure list of dicts (fix for sqlite3.Row)
-        articles = [dict(a) for a in articles]
-        # print(f"API News Count: {len(articles)}")
-
-        # Translate if needed
-        # Re-enabling with reduced limit (10 items) to ensure responsiveness
-        if lang != 'en' and articles:
-            try:
-                # print(f"Translating {len(articles)} items to {lang}...")
-                for a in articles:
-                    if 'summary' in a: a['snippet'] = a['summary']
-                
-                articles = translator.translate_batch(articles, lang)
-            except Exception as e:
-                print(f"Translation error: {e}")
-                # Return English version if translation fails
-                pass
-        
-        for a in articles:
-            if 'snippet' in a: a['summary'] = a['snippet']
-
-        return jsonify(articles)
+        # [STRICT TOPIC FILTERING] Only show content from active topics selected by Super Admin.
+        # The feed itself is prebuilt in the background (see _build_news_feed).
+        payload = feed_snapshots.get('news', lang, topic_manager.get_active_keywords())
+        return app.response_class(payload, mimetype='application/json')
     except Exception as e:
         import traceback
         traceback.print_exc()
@@ -719,13 +858,14 @@ def videos_endpoint():
             print(f"✅ [Video Search] Found {len(videos)} videos from YouTube")
             
             # [ENHANCED] Ingest video metadata into RAG for better search
-            if videos and rag_engine:
-                print(f"📚 [Video Search] Ingesting {len(videos)} videos into RAG...")
+            # Queued for background ingestion (batched with other requests; also kept while RAG loads)
+            if videos:
+                print(f"📚 [Video Search] Queueing {min(len(videos), 10)} videos for RAG ingestion...")
                 for video in videos[:10]:  # Limit to top 10 for performance
                     try:
                         description = video.get('description', '') or video.get('snippet', '')
                         if description:
-                            rag_engine.ingest(
+                            rag_ingest.submit(
                                 f"{video.get('title', '')}\n{description}",
                                 metadata={
                                     "source": video.get('url', ''),
@@ -741,122 +881,10 @@ def videos_endpoint():
             
             return jsonify(videos)
 
-        # [STRICT TOPIC FILTERING] Only show content from active topics selected by Super Admin
-        topic_query = topic_manager.get_active_topic_query()
-        active_topics = topic_manager.get_active_keywords()
-        
-        videos = []
-        
-        # STRICT MODE: If topics are selected, ONLY show content from those topics
-        if active_topics:
-            if topic_query:
-                # Search specific active topics only
-                try:
-                    videos = video_engine.get_videos_by_language(lang, topic_query=topic_query)
-                    print(f"✅ [Video Feed] Strict topic filtering: Found {len(videos)} videos for topics: {active_topics}")
-                except Exception as e:
-                    print(f"⚠️ [Video Feed] Topic search failed: {e}")
-                    videos = []
-            
-            # If no results from search, try DB but filter by active topics
-            # If no results from search, try DB but filter by active topics
-            if not videos:
-                try:
-                    all_db_videos = video_engine.get_trending(limit=100)  # Get more to filter
-                    
-                    # Filter by active topics BUT allow Priority Content (JRM)
-                    filtered_videos = []
-                    priority_keywords = ['jesus redeems', 'mohan c lazarus', 'mohan c. lazarus', 'comforter tv', 'nalumavadi', 'jrm']
-                    
-                    # Define loose keywords for specific topics (Shared logic)
-                    topic_keywords = {
-                        "Christianity": ['church', 'jesus', 'christ', 'faith', 'bible', 'prayer', 'gospel', 'pastor', 'bishop', 'vatican', 'catholic', 'protestant', 'ministry', 'worship'],
-                        "Global News": ['news', 'world', 'international', 'report']
-                    }
-
-                    for video in all_db_videos:
-                        title_lower = video.get('title', '').lower()
-                        description_lower = video.get('description', '').lower()
-                        channel_lower = video.get('channel', '').lower()
-                        combined_text = f"{title_lower} {description_lower} {channel_lower}"
-                        
-                        # Always include Priority Content
-                        if any(pk in combined_text for pk in priority_keywords):
-                            filtered_videos.append(video)
-                            continue
-
-                        # Check if video matches any active topic OR its related keywords
-                        matched = False
-                        for topic in active_topics:
-                            if topic.lower() in combined_text:
-                                matched = True
-                                break
-                            # Check related keywords
-                            if topic in topic_keywords:
-                                if any(k in combined_text for k in topic_keywords[topic]):
-                                    matched = True
-                                    break
-                                    
-                        if matched:
-                            filtered_videos.append(video)
-                    
-                    # Fallback: if filtered result is empty but 'Christianity' is active, 
-                    # check if the DB has any christian content that might have been missed or if we should show JRM only
-                    if not filtered_videos and "Christianity" in active_topics:
-                         print("⚠️ [Video Feed] Strict filter empty. Including all Priority Content as fallback.")
-                         # Resort to at least showing priority content if it was filtered out (though it shouldn't be due to the check above)
-                         # But let's check basic christian terms broadly
-                         for video in all_db_videos:
-                             if any(k in (video.get('title', '') + video.get('description', '')).lower() for k in topic_keywords['Christianity']):
-                                 filtered_videos.append(video)
-                         
-                         # De-dup
-                         seen_ids = set()
-                         unique_filtered = []
-                         for v in filtered_videos:
-                             if v['id'] not in seen_ids:
-                                 unique_filtered.append(v)
-                                 seen_ids.add(v['id'])
-                         filtered_videos = unique_filtered
-                    
-                    # Sort: Priority content first
-                    def sort_key(v):
-                        text = (v.get('title', '') + v.get('channel', '')).lower()
-                        return 0 if any(k in text for k in priority_keywords) else 1
-                    
-                    filtered_videos.sort(key=sort_key)
-                    videos = filtered_videos[:20]  # Limit to 20
-                    print(f"✅ [Video Feed] DB filtered: {len(videos)} videos (Priority + Topics)")
-                except Exception as e:
-                    print(f"⚠️ [Video Feed] DB filtering failed: {e}")
-                    videos = []
-        else:
-            # NO TOPICS SELECTED: Show all content (fallback mode)
-            print("⚠️ [Video Feed] No topics active - showing all content")
-            try:
-                videos = video_engine.get_trending(limit=10)
-            except Exception as e:
-                print(f"⚠️ [Video Feed] Fallback failed: {e}")
-                videos = []
-        
-        # Ensure list of dicts
-        videos = [dict(v) for v in videos]
-        
-        # Translate if needed
-        if lang != 'en' and videos:
-            try:
-                for v in videos:
-                     if 'description' in v: v['snippet'] = v['description']
-                     
-                videos = translator.translate_batch(videos, lang)
-                
-                for v in videos:
-                     if 'snippet' in v: v['description'] = v['snippet']
-            except Exception as e:
-                print(f"Video Translation error: {e}")
-                pass
-                 
-        return jsonify(videos)
+        # [STRICT TOPIC FILTERING] Only show content from active topics selected by Super Admin.
+        # The feed itself is prebuilt in the background (see _build_video_feed).
+        payload = feed_snapshots.get('videos', lang, topic_manager.get_active_keywords())
+        return app.response_class(payload, mimetype='application/json')
     except Exception as e:
         import traceback
         traceback.print_exc()
@@ -990,6 +1018,20 @@ def admin_stats_endpoint():
         print(f"Prediction Error: {e}")
         stats['prediction'] = {'error': str(e)}
 
+    # Search result cache health (hit rate, evictions, refreshes)
+    from src.result_cache import search_cache
+    stats['search_cache'] = search_cache.stats()
+    from src.embedding_service import embedding_service
+    stats['embeddings'] = embedding_service.stats()
+    from src.feed_poller import feed_poller
+    stats['feeds'] = feed_poller.stats()
+    stats['feed_snapshots'] = feed_snapshots.stats()
+    stats['rag_ingest'] = rag_ingest.stats()
+    if rag_engine:
+        stats['rag_ingest'].update(rag_engine.stats())  # New vs already-stored chunks, weekly partition sizes
+    from src.db import all_stats
+    stats['db'] = all_stats()
+
     return jsonify(stats)
 
 @app.route('/api/admin/login', methods=['POST'])
@@ -1074,10 +1116,12 @@ def superadmin_add_topic():
 def admin_content_endpoint():
     """Admin: Get all content for moderation"""
     try:
+        # Optional keyword filter (FTS5, best matches first)
+        query = request.args.get('q', '').strip() or None
         # Videos
-        all_videos = video_engine.get_all_videos()
+        all_videos = video_engine.get_all_videos(query)
         # News
-        all_news = news_feeder.get_all_news()
+        all_news = news_feeder.get_all_news(query)
         
         return jsonify({
             "videos": all_videos,
@@ -1273,11 +1317,11 @@ def admin_analytics_query():
         
         # STEP 2: Fallback to RAG if Web Mining failed or wasn't needed
         # Check RAG for existing data
-        context_docs = rag_engine.search(query, k=10)
+        context_docs = rag_engine.search(query, k=10, **llm_analytics.rag_filters())
         
-        # If RAG has data, use LLM to analyze it
+        # If RAG has data, use LLM to analyze it (reusing the hits instead of searching again)
         if context_docs:
-            result = llm_analytics.analyze_and_graph(query, topic_context)
+            result = llm_analytics.analyze_and_graph(query, topic_context, context_docs=context_docs)
             return jsonify(result)
         else:
             return jsonify({"error": "No data found in RAG or Web Search."}), 404
@@ -1318,7 +1362,7 @@ def analytics_query():
         # STEP 2: Hybrid RAG (Live + DB)
         print("   -> Vectorizing & Merging contexts...")
         # Use our new hybrid search
-        hybrid_context_docs = rag_engine.search_hybrid(query, live_texts, k=5)
+        hybrid_context_docs = rag_engine.search_hybrid(query, live_texts, k=5, **llm_analytics.rag_filters())
         
         # Extract just the content for the LLM
         context_str = "\n\n".join([f"[{doc['source'].upper()}] {doc['content']}" for doc in hybrid_context_docs])
@@ -1450,7 +1494,8 @@ def suggestions_endpoint():
         else:
             url = f"http://suggestqueries.google.com/complete/search?client=firefox&q={query}"
             
-        resp = requests.get(url, timeout=2)
+        from src.http_client import http_client
+        resp = http_client.get(url, timeout=2)
         if resp.status_code == 200:
             # Format: ["query", ["suggestion1", "suggestion2", ...]]
             data = resp.json()
@@ -1468,6 +1513,10 @@ if __name__ == '__main__':
     app.config['TEMPLATES_AUTO_RELOAD'] = True
     
     port = int(os.environ.get('PORT', 5001))
+
+    # Process-wide DNS cache, only if HTTP_DNS_CACHE=true
+    from src.http_client import install_dns_cache
+    install_dns_cache()
     
     # Start Video Worker (Since we are running directly with debug=False)
     print("🚀 Starting VideoEngine Background Worker...")
@@ -16,7 +16,7 @@ from src.llm_analytics import LLMAnalytics
 
 # Mock Engines
 class MockRAG:
-    def search(self, query, k=5):
+    def search(self, query, k=5, **filters):
         return [{"metadata": {"source": "Mock"}, "content": "Christian persecution in India has seen a rise in 2024. Reports indicate 150 incidents in Jan-Feb."}]
 
 class MockDiscovery:
@@ -1,6 +1,7 @@
 from duckduckgo_search import DDGS
 import requests
-from bs4 import BeautifulSoup
+from src.http_client import http_client
+from src.page_meta import page_meta
 import concurrent.futures
 from urllib.parse import urlparse
 import ipaddress
@@ -66,38 +67,13 @@ class SearchAgents:
             if not _is_safe_url(url):
                 return None, None, None
             
-            # Fast timeout, we only want the head/meta
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            
-            resp = requests.get(url, headers=headers, timeout=3)
-            
-            if resp.status_code != 200:
+            # Fast timeout; shared page cache, so feed/reader-mode hits on the same URL are free
+            page = page_meta.fetch(url, timeout=3)
+            if page is None:
                 return None, None, None
+
+            return page.image, page.description, page.published
             
-            soup = BeautifulSoup(resp.content, 'html.parser')
-            
-            # Image
-            og_image = soup.find("meta", property="og:image")
-            image = og_image.get("content") if og_image else None
-            
-            # Description
-            og_desc = soup.find("meta", property="og:description")
-            desc = og_desc.get("content") if og_desc else None
-            
-            # Published Time
-            og_time = soup.find("meta", property="article:published_time") or \
-                      soup.find("meta", property="og:updated_time") or \
-                      soup.find("meta", attrs={"name": "pubdate"})
-            pub_time = og_time.get("content") if og_time else None
-            
-            return image, desc, pub_time
-            
-        except requests.exceptions.Timeout:
-            return None, None, None
-        except requests.exceptions.ConnectionError:
-            return None, None, None
         except Exception as e:
             # Log unexpected errors for debugging
             if 'SSL' not in str(e) and 'certificate' not in str(e).lower():
@@ -136,6 +112,17 @@ class SearchAgents:
 
     @staticmethod
     def search_ddg(query, intent, limit, time_filter=None, region='wt-wt'):
+        """
+        Broad Web Search using DuckDuckGo, served from the result cache when possible.
+        """
+        from src.result_cache import search_cache
+        return search_cache.get_or_fetch(
+            lambda: SearchAgents._search_ddg_live(query, intent, limit, time_filter, region),
+            query, intent, time_filter=time_filter, region=region, engine='DuckDuckGo', limit=limit
+        )
+
+    @staticmethod
+    def _search_ddg_live(query, intent, limit, time_filter=None, region='wt-wt'):
         """
         Broad Web Search using DuckDuckGo with validation and error handling.
         Increased limits for comprehensive internet-wide coverage.
@@ -191,6 +178,15 @@ class SearchAgents:
 
     @staticmethod
     def search_google(query, intent, limit, time_filter, api_key):
+        """Search Google via SerpAPI, served from the result cache to save quota."""
+        from src.result_cache import search_cache
+        return search_cache.get_or_fetch(
+            lambda: SearchAgents._search_google_live(query, intent, limit, time_filter, api_key),
+            query, intent, time_filter=time_filter, engine='Google', limit=limit
+        )
+
+    @staticmethod
+    def _search_google_live(query, intent, limit, time_filter, api_key):
         """Search Google via SerpAPI with validation and error handling."""
         from src.search_utils import sanitize_query, validate_url
         
@@ -214,7 +210,7 @@ class SearchAgents:
             params["tbs"] = f"qdr:{time_filter}" if time_filter != '6m' else "qdr:y"
 
         try:
-            resp = requests.get(
+            resp = http_client.get(
                 "https://serpapi.com/search.json", 
                 params=params, 
                 timeout=30
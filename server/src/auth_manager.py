@@ -6,6 +6,7 @@ import datetime
 import random
 import time
 from src.email_service import email_service
+from src.db import get_database, add_column
 
 # Database File Path
 DB_FILE = os.path.join(os.path.dirname(__file__), '..', 'users.db')
@@ -13,114 +14,97 @@ SECRET_KEY = os.environ.get('SECRET_KEY', 'your_secret_key_here_change_in_produc
 
 class AuthManager:
     def __init__(self):
+        self.db = get_database(DB_FILE)
         self._init_db()
         self.pending_verifications = {} # email -> {otp, timestamp, data}
 
     def _init_db(self):
-        """Initialize the users database with necessary tables."""
-        conn = sqlite3.connect(DB_FILE)
-        cursor = conn.cursor()
-        cursor.execute('PRAGMA journal_mode=WAL;')
-        
-        # Users Table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                email TEXT UNIQUE NOT NULL,
-                password_hash TEXT NOT NULL,
-                full_name TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                is_verified INTEGER DEFAULT 0,
-                role TEXT DEFAULT 'user'
-            )
-        ''')
-
-        # Migration: Add role column if not exists
-        try:
-            cursor.execute("ALTER TABLE users ADD COLUMN role TEXT DEFAULT 'user'")
-        except sqlite3.OperationalError:
-            pass # Column already exists
-
-        # Profiles Table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS profiles (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                name TEXT NOT NULL,
-                avatar TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
-            )
-        ''')
-
-        # Saved Videos Table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS saved_videos (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                profile_id INTEGER NOT NULL,
-                video_id TEXT NOT NULL,
-                title TEXT,
-                thumbnail TEXT,
-                channel TEXT,
-                added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (profile_id) REFERENCES profiles (id) ON DELETE CASCADE,
-                UNIQUE(profile_id, video_id)
-            )
-        ''')
-
-        # Saved News Table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS saved_news (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                profile_id INTEGER NOT NULL,
-                article_url TEXT NOT NULL,
-                title TEXT,
-                source TEXT,
-                added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (profile_id) REFERENCES profiles (id) ON DELETE CASCADE,
-                UNIQUE(profile_id, article_url)
-            )
-        ''')
-        
-        # Legal Assistant Conversations Table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS legal_conversations (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                profile_id INTEGER NOT NULL,
-                conversation_id TEXT UNIQUE NOT NULL,
-                title TEXT,
-                last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (profile_id) REFERENCES profiles (id) ON DELETE CASCADE
-            )
-        ''')
-        
-        # Legal Conversation Messages Table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS legal_messages (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                conversation_id TEXT NOT NULL,
-                sender TEXT NOT NULL, -- 'user' or 'ai'
-                message TEXT NOT NULL,
-                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (conversation_id) REFERENCES legal_conversations (conversation_id) ON DELETE CASCADE
-            )
-        ''')
-
-        conn.commit()
-        conn.close()
-
-    def get_db_connection(self):
-        conn = sqlite3.connect(DB_FILE, timeout=30.0)
-        conn.execute('PRAGMA journal_mode=WAL;')
-        conn.row_factory = sqlite3.Row
-        return conn
+        """Initialize the users database with necessary tables (append-only migration steps)."""
+        self.db.migrate('users', [
+            # Users Table
+            '''
+                CREATE TABLE IF NOT EXISTS users (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    email TEXT UNIQUE NOT NULL,
+                    password_hash TEXT NOT NULL,
+                    full_name TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    is_verified INTEGER DEFAULT 0,
+                    role TEXT DEFAULT 'user'
+                )
+            ''',
+            # Migration: Add role column if not exists
+            add_column('users', 'role', "TEXT DEFAULT 'user'"),
+            # Profiles Table
+            '''
+                CREATE TABLE IF NOT EXISTS profiles (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id INTEGER NOT NULL,
+                    name TEXT NOT NULL,
+                    avatar TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+                )
+            ''',
+            # Saved Videos Table
+            '''
+                CREATE TABLE IF NOT EXISTS saved_videos (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    profile_id INTEGER NOT NULL,
+                    video_id TEXT NOT NULL,
+                    title TEXT,
+                    thumbnail TEXT,
+                    channel TEXT,
+                    added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (profile_id) REFERENCES profiles (id) ON DELETE CASCADE,
+                    UNIQUE(profile_id, video_id)
+                )
+            ''',
+            # Saved News Table
+            '''
+                CREATE TABLE IF NOT EXISTS saved_news (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    profile_id INTEGER NOT NULL,
+                    article_url TEXT NOT NULL,
+                    title TEXT,
+                    source TEXT,
+                    added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (profile_id) REFERENCES profiles (id) ON DELETE CASCADE,
+                    UNIQUE(profile_id, article_url)
+                )
+            ''',
+            # Legal Assistant Conversations Table
+            '''
+                CREATE TABLE IF NOT EXISTS legal_conversations (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    profile_id INTEGER NOT NULL,
+                    conversation_id TEXT UNIQUE NOT NULL,
+                    title TEXT,
+                    last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (profile_id) REFERENCES profiles (id) ON DELETE CASCADE
+                )
+            ''',
+            # Legal Conversation Messages Table
+            '''
+                CREATE TABLE IF NOT EXISTS legal_messages (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    conversation_id TEXT NOT NULL,
+                    sender TEXT NOT NULL, -- 'user' or 'ai'
+                    message TEXT NOT NULL,
+                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (conversation_id) REFERENCES legal_conversations (conversation_id) ON DELETE CASCADE
+                )
+            ''',
+            # Hot lookups: profiles per user, conversations per profile, messages per conversation
+            "CREATE INDEX IF NOT EXISTS idx_profiles_user ON profiles(user_id)",
+            "CREATE INDEX IF NOT EXISTS idx_legal_conversations_profile ON legal_conversations(profile_id, last_updated)",
+            "CREATE INDEX IF NOT EXISTS idx_legal_messages_conversation ON legal_messages(conversation_id, timestamp)",
+        ])
 
     def register_user(self, email, password, full_name):
         """Initiate user registration with OTP."""
         # Check if user already exists
-        conn = self.get_db_connection()
-        user = conn.execute('SELECT * FROM users WHERE email = ?', (email,)).fetchone()
-        conn.close()
+        user = self.db.query_one('SELECT * FROM users WHERE email = ?', (email,))
 
         if user:
             return {'error': 'Email already registered.'}
@@ -194,34 +178,31 @@ class AuthManager:
 
         # Create User
         data = record['data']
-        conn = self.get_db_connection()
-        cursor = conn.cursor()
-        try:
-            cursor.execute(
+
+        def create(conn):
+            cursor = conn.execute(
                 'INSERT INTO users (email, password_hash, full_name, is_verified) VALUES (?, ?, ?, 1)',
                 (data['email'], data['password_hash'], data['full_name'])
             )
             # Create default profile
             user_id = cursor.lastrowid
-            cursor.execute(
+            conn.execute(
                 'INSERT INTO profiles (user_id, name, avatar) VALUES (?, ?, ?)',
                 (user_id, data['full_name'], 'default_avatar.png')
             )
-            conn.commit()
+
+        try:
+            self.db.transaction(create)
         except sqlite3.IntegrityError:
-            conn.close()
             return {'error': 'User creation failed. Email might be duplicate.'}
         finally:
-            conn.close()
             del self.pending_verifications[email]
 
         return {'message': 'Registration successful.', 'success': True}
 
     def login_user(self, email, password):
         """Authenticate user and return JWT."""
-        conn = self.get_db_connection()
-        user = conn.execute('SELECT * FROM users WHERE email = ?', (email,)).fetchone()
-        conn.close()
+        user = self.db.query_one('SELECT * FROM users WHERE email = ?', (email,))
 
         if not user:
             return {'error': 'Invalid email or password.'}
@@ -249,9 +230,7 @@ class AuthManager:
 
     def get_profiles(self, user_id):
         try:
-            conn = self.get_db_connection()
-            profiles = conn.execute('SELECT * FROM profiles WHERE user_id = ?', (user_id,)).fetchall()
-            conn.close()
+            profiles = self.db.query('SELECT * FROM profiles WHERE user_id = ?', (user_id,))
             return [dict(p) for p in profiles]
         except Exception as e:
             print(f"❌ [AuthManager] get_profiles error for user {user_id}: {e}")
@@ -260,152 +239,113 @@ class AuthManager:
             return []
 
     def create_profile(self, user_id, name, avatar="default_avatar.png"):
-        conn = self.get_db_connection()
-        cursor = conn.cursor()
-        
-        # Check profile count limit (e.g., 5)
-        count = cursor.execute('SELECT COUNT(*) FROM profiles WHERE user_id = ?', (user_id,)).fetchone()[0]
-        if count >= 5:
-            conn.close()
-            return {'error': 'Maximum profile limit reached.'}
+        def create(conn):
+            # Check profile count limit (e.g., 5) - same transaction as the insert
+            count = conn.execute('SELECT COUNT(*) FROM profiles WHERE user_id = ?', (user_id,)).fetchone()[0]
+            if count >= 5:
+                return {'error': 'Maximum profile limit reached.'}
 
-        cursor.execute('INSERT INTO profiles (user_id, name, avatar) VALUES (?, ?, ?)', (user_id, name, avatar))
-        conn.commit()
-        conn.close()
-        return {'message': 'Profile created successfully.', 'success': True}
+            conn.execute('INSERT INTO profiles (user_id, name, avatar) VALUES (?, ?, ?)', (user_id, name, avatar))
+            return {'message': 'Profile created successfully.', 'success': True}
+
+        return self.db.transaction(create)
 
     def update_profile(self, user_id, profile_id, name, avatar):
-        conn = self.get_db_connection()
-        cursor = conn.cursor()
-        
-        # Verify ownership
-        owner = cursor.execute('SELECT user_id FROM profiles WHERE id = ?', (profile_id,)).fetchone()
-        if not owner or owner[0] != user_id:
-             conn.close()
-             return {'error': 'Profile not found or access denied.'}
+        def update(conn):
+            # Verify ownership
+            owner = conn.execute('SELECT user_id FROM profiles WHERE id = ?', (profile_id,)).fetchone()
+            if not owner or owner[0] != user_id:
+                 return {'error': 'Profile not found or access denied.'}
 
-        cursor.execute('UPDATE profiles SET name = ?, avatar = ? WHERE id = ?', (name, avatar, profile_id))
-        conn.commit()
-        conn.close()
-        return {'message': 'Profile updated.', 'success': True}
+            conn.execute('UPDATE profiles SET name = ?, avatar = ? WHERE id = ?', (name, avatar, profile_id))
+            return {'message': 'Profile updated.', 'success': True}
+
+        return self.db.transaction(update)
 
     def delete_profile(self, user_id, profile_id):
-        conn = self.get_db_connection()
-        cursor = conn.cursor()
-        
-        # Verify ownership
-        owner = cursor.execute('SELECT user_id FROM profiles WHERE id = ?', (profile_id,)).fetchone()
-        if not owner or owner[0] != user_id:
-             conn.close()
-             return {'error': 'Profile not found or access denied.'}
+        def delete(conn):
+            # Verify ownership
+            owner = conn.execute('SELECT user_id FROM profiles WHERE id = ?', (profile_id,)).fetchone()
+            if not owner or owner[0] != user_id:
+                 return {'error': 'Profile not found or access denied.'}
 
-        cursor.execute('DELETE FROM profiles WHERE id = ?', (profile_id,))
-        conn.commit()
-        conn.close()
-        return {'message': 'Profile deleted.', 'success': True}
+            conn.execute('DELETE FROM profiles WHERE id = ?', (profile_id,))
+            return {'message': 'Profile deleted.', 'success': True}
+
+        return self.db.transaction(delete)
 
     # --- Video Saving ---
     def save_video(self, profile_id, video_data):
-        conn = self.get_db_connection()
-        cursor = conn.cursor()
         try:
-            cursor.execute('''
+            self.db.execute('''
                 INSERT INTO saved_videos (profile_id, video_id, title, thumbnail, channel)
                 VALUES (?, ?, ?, ?, ?)
             ''', (profile_id, video_data['video_id'], video_data['title'], video_data['thumbnail'], video_data['channel']))
-            conn.commit()
             return {'message': 'Video saved.', 'success': True}
         except sqlite3.IntegrityError:
             return {'message': 'Video already saved.', 'success': True} # Idempotent
         except Exception as e:
              return {'error': str(e)}
-        finally:
-            conn.close()
 
     def unsave_video(self, profile_id, video_id):
-        conn = self.get_db_connection()
-        conn.execute('DELETE FROM saved_videos WHERE profile_id = ? AND video_id = ?', (profile_id, video_id))
-        conn.commit()
-        conn.close()
+        self.db.execute('DELETE FROM saved_videos WHERE profile_id = ? AND video_id = ?', (profile_id, video_id))
         return {'message': 'Video removed.', 'success': True}
 
     def get_saved_videos(self, profile_id):
-        conn = self.get_db_connection()
-        videos = conn.execute('SELECT * FROM saved_videos WHERE profile_id = ? ORDER BY added_at DESC', (profile_id,)).fetchall()
-        conn.close()
+        videos = self.db.query('SELECT * FROM saved_videos WHERE profile_id = ? ORDER BY added_at DESC', (profile_id,))
         return [dict(v) for v in videos]
         
     # --- News Saving ---
     def save_news(self, profile_id, article_data):
-        conn = self.get_db_connection()
-        cursor = conn.cursor()
         try:
-            cursor.execute('''
+            self.db.execute('''
                 INSERT INTO saved_news (profile_id, article_url, title, source)
                 VALUES (?, ?, ?, ?)
             ''', (profile_id, article_data['url'], article_data['title'], article_data['source']))
-            conn.commit()
             return {'message': 'Article saved.', 'success': True}
         except sqlite3.IntegrityError:
             return {'message': 'Article already saved.', 'success': True}
         except Exception as e:
              return {'error': str(e)}
-        finally:
-            conn.close()
 
     def unsave_news(self, profile_id, article_url):
-        conn = self.get_db_connection()
-        conn.execute('DELETE FROM saved_news WHERE profile_id = ? AND article_url = ?', (profile_id, article_url))
-        conn.commit()
-        conn.close()
+        self.db.execute('DELETE FROM saved_news WHERE profile_id = ? AND article_url = ?', (profile_id, article_url))
         return {'message': 'Article removed.', 'success': True}
 
     def get_saved_news(self, profile_id):
-        conn = self.get_db_connection()
-        news = conn.execute('SELECT * FROM saved_news WHERE profile_id = ? ORDER BY added_at DESC', (profile_id,)).fetchall()
-        conn.close()
+        news = self.db.query('SELECT * FROM saved_news WHERE profile_id = ? ORDER BY added_at DESC', (profile_id,))
         return [dict(n) for n in news]
 
     # --- Legal Assistant Storage ---
     def create_legal_conversation(self, profile_id, title="New Conversation"):
-        conn = self.get_db_connection()
-        cursor = conn.cursor()
-        
         # Generate unique ID
         conversation_id = f"conv_{int(time.time())}_{random.randint(1000, 9999)}"
         
-        cursor.execute('''
+        self.db.execute('''
             INSERT INTO legal_conversations (profile_id, conversation_id, title)
             VALUES (?, ?, ?)
         ''', (profile_id, conversation_id, title))
-        conn.commit()
-        conn.close()
         return {'conversation_id': conversation_id, 'title': title}
 
     def add_legal_message(self, conversation_id, sender, message):
-        conn = self.get_db_connection()
-        conn.execute('''
-            INSERT INTO legal_messages (conversation_id, sender, message)
-            VALUES (?, ?, ?)
-        ''', (conversation_id, sender, message))
-        
-        # Update last_updated
-        conn.execute('UPDATE legal_conversations SET last_updated = CURRENT_TIMESTAMP WHERE conversation_id = ?', (conversation_id,))
-        
-        conn.commit()
-        conn.close()
+        def add(conn):
+            conn.execute('''
+                INSERT INTO legal_messages (conversation_id, sender, message)
+                VALUES (?, ?, ?)
+            ''', (conversation_id, sender, message))
+            
+            # Update last_updated
+            conn.execute('UPDATE legal_conversations SET last_updated = CURRENT_TIMESTAMP WHERE conversation_id = ?', (conversation_id,))
+
+        self.db.transaction(add)
         return {'success': True}
 
     def get_legal_conversations(self, profile_id):
-        conn = self.get_db_connection()
-        convs = conn.execute('SELECT * FROM legal_conversations WHERE profile_id = ? ORDER BY last_updated DESC', (profile_id,)).fetchall()
-        conn.close()
+        convs = self.db.query('SELECT * FROM legal_conversations WHERE profile_id = ? ORDER BY last_updated DESC', (profile_id,))
         return [dict(c) for c in convs]
 
     def get_legal_messages(self, conversation_id):
-        conn = self.get_db_connection()
-        msgs = conn.execute('SELECT * FROM legal_messages WHERE conversation_id = ? ORDER BY timestamp ASC', (conversation_id,)).fetchall()
-        conn.close()
+        msgs = self.db.query('SELECT * FROM legal_messages WHERE conversation_id = ? ORDER BY timestamp ASC', (conversation_id,))
         return [dict(m) for m in msgs]
 
 # Export a singleton instance
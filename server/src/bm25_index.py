@@ -0,0 +1,195 @@
+"""
+Incremental BM25 Index
+Shared tokenizer + a process-wide BM25 index whose document statistics
+(document frequency, average length) accumulate across requests, so IDF
+reflects what we've crawled recently rather than the current result page.
+Scoring is vectorized over a scipy sparse term-frequency matrix.
+"""
+import re
+import threading
+
+import numpy as np
+from scipy import sparse
+
+# Pure noise for lexical scoring (kept small: BM25's IDF handles the rest)
+STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'in', 'on', 'at', 'for', 'to', 'of', 'and', 'or', 'with', 'about',
+    'is', 'are', 'was', 'were', 'be', 'been', 'by', 'as', 'from', 'that', 'this', 'it',
+    'its', 'into', 'than', 'then', 'but', 'not', 'no', 'so', 'if', 'we', 'you', 'they',
+    'he', 'she', 'his', 'her', 'their', 'our', 'your', 'what', 'how', 'where', 'when',
+    'who', 'which', 'will', 'can', 'has', 'have', 'had', 'do', 'does', 'did', 'site'
+})
+
+# \w excludes combining marks, which would split Indic words at every vowel sign
+# ("சபை" -> "சப" + "ை"); keep the marks of the Brahmic blocks inside tokens, but
+# not the danda / double danda (U+0964-5), the Hindi full stop ("चुनाव।")
+TOKEN_PATTERN = re.compile(r"[\w\u0900-\u0963\u0966-\u0dff]+")
+
+
+def tokenize(text):
+    """Lowercase word tokens with stop words and 1-char noise removed (Unicode-aware)."""
+    if not text:
+        return []
+    return [t for t in TOKEN_PATTERN.findall(text.lower()) if len(t) > 1 and t not in STOP_WORDS]
+
+
+class BM25Index:
+    """
+    Okapi BM25 with corpus statistics that grow incrementally.
+
+    Each distinct document (keyed by a hash of its text) is counted once in
+    the corpus statistics and gets a row in a sparse (documents x vocabulary)
+    term-frequency matrix. Re-ranking already-seen results is then a pure
+    row/column slice of that matrix - no re-tokenization, no Python loop.
+
+    Once `max_rows` documents or `max_vocab` terms are reached, the index is
+    compacted: the newest half of the documents is kept and the statistics
+    and vocabulary are rebuilt from them, so memory stays bounded.
+    """
+
+    def __init__(self, k1=1.5, b=0.75, max_rows=100000, max_vocab=200000):
+        self.k1 = k1
+        self.b = b
+        self.max_rows = max_rows
+        self.max_vocab = max_vocab
+
+        self.vocab = {}                       # term -> column id
+        self.df = np.zeros(1024, dtype=np.int64)
+        self.n_docs = 0
+        self.total_len = 0
+
+        self._row_of = {}                     # doc key -> matrix row (every document counted in df)
+        self._pending = []                    # (term_ids, counts, length) not yet in the matrix
+        self._lengths = np.zeros(0, dtype=np.float32)
+        self._matrix = sparse.csr_matrix((0, 0), dtype=np.float32)
+        self._lock = threading.Lock()
+        self.compactions = 0
+
+    # --- Corpus Statistics ---
+
+    def _term_id(self, term):
+        tid = self.vocab.get(term)
+        if tid is None:
+            tid = len(self.vocab)
+            self.vocab[term] = tid
+            if tid >= len(self.df):
+                self.df = np.concatenate([self.df, np.zeros(len(self.df), dtype=np.int64)])
+        return tid
+
+    def _vectorize(self, text):
+        counts = {}
+        tokens = tokenize(text)
+        for tok in tokens:
+            tid = self._term_id(tok)
+            counts[tid] = counts.get(tid, 0) + 1
+        ids = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        tfs = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+        return ids, tfs, len(tokens)
+
+    def _index(self, key, text):
+        """Tokenize a new document, count it into the stats and queue its matrix row."""
+        ids, tfs, length = self._vectorize(text)
+        self.n_docs += 1
+        self.total_len += length
+        self.df[ids] += 1
+
+        row = len(self._row_of)
+        self._row_of[key] = row
+        self._pending.append((ids, tfs, length))
+        return row
+
+    def _flush(self):
+        """Append queued rows to the TF matrix (one vstack per batch of new docs)."""
+        vocab_size = len(self.vocab)
+        if self._pending:
+            nnz = np.fromiter((len(p[0]) for p in self._pending), dtype=np.int64, count=len(self._pending))
+            indptr = np.concatenate([[0], np.cumsum(nnz)])
+            indices = np.concatenate([p[0] for p in self._pending])
+            data = np.concatenate([p[1] for p in self._pending])
+            block = sparse.csr_matrix((data, indices, indptr), shape=(len(self._pending), vocab_size))
+            lengths = np.fromiter((p[2] for p in self._pending), dtype=np.float32, count=len(self._pending))
+
+            self._matrix.resize((self._matrix.shape[0], vocab_size))
+            self._matrix = sparse.vstack([self._matrix, block], format='csr')
+            self._lengths = np.concatenate([self._lengths, lengths])
+            self._pending = []
+        elif self._matrix.shape[1] < vocab_size:
+            self._matrix.resize((self._matrix.shape[0], vocab_size))
+
+    def _compact(self, keep):
+        """Keep the newest `keep` documents; rebuild the vocabulary and statistics from them alone."""
+        self._flush()
+        start = len(self._row_of) - keep
+        matrix = self._matrix[start:]
+        used = np.unique(matrix.indices)
+        new_id = np.full(len(self.vocab), -1, dtype=np.int64)
+        new_id[used] = np.arange(len(used))
+
+        self._matrix = matrix[:, used].tocsr()
+        self._lengths = self._lengths[start:]
+        self._row_of = {key: row - start for key, row in self._row_of.items() if row >= start}
+        self.vocab = {term: int(new_id[tid]) for term, tid in self.vocab.items() if new_id[tid] >= 0}
+        self.df = np.zeros(max(1024, 2 * len(used)), dtype=np.int64)
+        self.df[:len(used)] = np.bincount(self._matrix.indices, minlength=len(used))
+        self.n_docs = len(self._row_of)
+        self.total_len = int(self._lengths.sum(dtype=np.float64))
+        self.compactions += 1
+
+    def _rows(self, texts):
+        if len(self._row_of) + len(texts) > self.max_rows or len(self.vocab) > self.max_vocab:
+            self._compact(keep=max(len(self._row_of) // 2 - len(texts), 0))
+
+        rows = np.empty(len(texts), dtype=np.int64)
+        row_of = self._row_of
+        for i, text in enumerate(texts):
+            key = hash(text)
+            row = row_of.get(key)
+            rows[i] = row if row is not None else self._index(key, text)
+        return rows
+
+    def add(self, texts):
+        """Index documents into the corpus statistics without scoring them."""
+        with self._lock:
+            self._rows(texts)
+
+    def stats(self):
+        return {
+            'documents': self.n_docs,
+            'vocabulary': len(self.vocab),
+            'avg_doc_len': round(self.total_len / self.n_docs, 2) if self.n_docs else 0.0,
+            'matrix_rows': len(self._row_of),
+            'compactions': self.compactions
+        }
+
+    # --- Scoring ---
+
+    def score(self, query, texts):
+        """
+        BM25 score of each text for `query` as a float numpy array.
+        Candidates are indexed first, so IDF includes them plus all past documents.
+        """
+        if not texts:
+            return np.zeros(0, dtype=np.float32)
+
+        with self._lock:
+            rows = self._rows(texts)
+            q_ids = sorted({self.vocab[t] for t in tokenize(query) if t in self.vocab})
+            if not q_ids:
+                return np.zeros(len(texts), dtype=np.float32)
+            self._flush()
+
+            tf = self._matrix[rows][:, q_ids].toarray()
+            lengths = self._lengths[rows]
+            n_docs = self.n_docs
+            avgdl = (self.total_len / n_docs) if n_docs else 1.0
+            df = self.df[q_ids].astype(np.float64)
+
+        # Non-negative IDF variant (Lucene) so very common terms never subtract
+        idf = np.log((n_docs - df + 0.5) / (df + 0.5) + 1.0)
+        norm = self.k1 * (1.0 - self.b + self.b * lengths / max(avgdl, 1e-9))
+        scores = (tf * (self.k1 + 1.0)) / (tf + norm[:, None])
+        return (scores @ idf).astype(np.float32)
+
+
+# Shared index (one corpus view for the whole process)
+bm25_index = BM25Index()
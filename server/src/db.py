@@ -0,0 +1,317 @@
+"""
+SQLite Data Access Layer
+One `Database` per file, shared by every component that uses it:
+
+- Reads run on a per-thread connection that is opened once and reused, so
+  sqlite's prepared-statement cache stays warm across requests.
+- Writes are funnelled through a single writer thread. Concurrently
+  submitted writes are grouped into one transaction (each in its own
+  SAVEPOINT, so one failing write doesn't take the others down) instead of
+  fighting over the write lock with retries and sleeps.
+- WAL + synchronous=NORMAL on every connection: readers never block the
+  writer and vice versa.
+- `migrate(component, steps)` applies numbered schema steps once, tracked
+  in a `schema_migrations` table (several components can share a file).
+- `fts_index(...)` / `fts_match(...)`: trigger-synced FTS5 indexes over
+  ordinary tables, for keyword search that would otherwise scan rows.
+  A trigram index + `contains_any(...)` gives the substring semantics of
+  the in-Python keyword filters ("news" inside "CBSNews", "AI" anywhere).
+"""
+import os
+import re
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+
+# Defaults (overridable via .env)
+BUSY_TIMEOUT = float(os.getenv('DB_BUSY_TIMEOUT', 15))
+STATEMENT_CACHE = int(os.getenv('DB_STATEMENT_CACHE', 256))
+WRITE_BATCH = int(os.getenv('DB_WRITE_BATCH', 64))
+
+
+class Database:
+    """
+    `query(sql, params)` / `query_one(...)` -> sqlite3.Row results.
+    `execute(sql, params)` / `executemany(sql, rows)` -> rowcount.
+    `transaction(fn)` -> runs `fn(conn)` atomically on the writer thread and
+    returns its result (for read-check-write sequences).
+    Write calls block until committed unless `wait=False`.
+    """
+
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        self._local = threading.local()
+        self._queue = queue.Queue()
+        self._writer = None
+        self._writer_conn = None
+        self._start_lock = threading.Lock()
+        self.writes = 0
+        self.transactions = 0
+
+    def _connect(self, check_same_thread=True):
+        conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, check_same_thread=check_same_thread,
+                               cached_statements=STATEMENT_CACHE)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL;')
+        conn.execute('PRAGMA synchronous=NORMAL;')
+        return conn
+
+    # --- Reads ---
+
+    def connection(self):
+        """This thread's read connection (do not close it)."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    def query(self, sql, params=()):
+        return self.connection().execute(sql, params).fetchall()
+
+    def query_one(self, sql, params=()):
+        return self.connection().execute(sql, params).fetchone()
+
+    # --- Writes ---
+
+    def _ensure_writer(self):
+        if self._writer is None:
+            with self._start_lock:
+                if self._writer is None:
+                    self._writer_conn = self._connect(check_same_thread=False)
+                    self._writer_conn.isolation_level = None  # Transactions are managed explicitly
+                    self._writer = threading.Thread(target=self._write_loop, daemon=True,
+                                                    name=f'db-writer-{os.path.basename(self.path)}')
+                    self._writer.start()
+
+    def _submit(self, fn, wait):
+        if threading.current_thread() is self._writer:
+            return fn(self._writer_conn)  # Nested call from inside a transaction
+        self._ensure_writer()
+        future = Future()
+        self._queue.put((fn, future))
+        if wait:
+            return future.result()
+        future.add_done_callback(_log_failure)
+        return future
+
+    def transaction(self, fn, wait=True):
+        return self._submit(fn, wait)
+
+    def execute(self, sql, params=(), wait=True):
+        return self._submit(lambda conn: conn.execute(sql, params).rowcount, wait)
+
+    def executemany(self, sql, rows, wait=True):
+        rows = list(rows)
+        return self._submit(lambda conn: conn.executemany(sql, rows).rowcount, wait)
+
+    def _write_loop(self):
+        conn = self._writer_conn
+        while True:
+            jobs = [self._queue.get()]
+            while len(jobs) < WRITE_BATCH:
+                try:
+                    jobs.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            outcomes = []
+            try:
+                conn.execute('BEGIN IMMEDIATE')
+                for fn, future in jobs:
+                    conn.execute('SAVEPOINT job')
+                    try:
+                        outcomes.append((future, fn(conn), None))
+                        conn.execute('RELEASE job')
+                    except BaseException as e:
+                        conn.execute('ROLLBACK TO job')
+                        conn.execute('RELEASE job')
+                        outcomes.append((future, None, e))
+                conn.execute('COMMIT')
+            except Exception as e:
+                # The transaction itself failed (e.g. disk I/O): every job in it failed
+                try: conn.execute('ROLLBACK')
+                except Exception: pass
+                outcomes = [(future, None, e) for _, future in jobs]
+
+            self.transactions += 1
+            self.writes += len(jobs)
+            # Resolve only after COMMIT: callers may read their write back immediately
+            for future, result, error in outcomes:
+                if error is None:
+                    future.set_result(result)
+                else:
+                    future.set_exception(error)
+
+    # --- Schema ---
+
+    def migrate(self, component, steps):
+        """
+        Apply `steps` (SQL strings or callables taking the connection) that
+        haven't run yet for `component`. Step numbers are list positions, so
+        only ever append new steps.
+        """
+        def apply(conn):
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS schema_migrations (
+                    component TEXT,
+                    version INTEGER,
+                    PRIMARY KEY (component, version)
+                )
+            ''')
+            done = {row[0] for row in conn.execute("SELECT version FROM schema_migrations WHERE component = ?", (component,))}
+            applied = 0
+            for version, step in enumerate(steps, start=1):
+                if version in done:
+                    continue
+                if callable(step):
+                    step(conn)
+                else:
+                    conn.execute(step)
+                conn.execute("INSERT INTO schema_migrations (component, version) VALUES (?, ?)", (component, version))
+                applied += 1
+            return applied
+
+        applied = self.transaction(apply)
+        if applied:
+            print(f"🗄️ [DB] {os.path.basename(self.path)}: applied {applied} migration(s) for '{component}'.")
+        return applied
+
+    def has_table(self, name):
+        return self.query_one("SELECT 1 FROM sqlite_master WHERE name = ?", (name,)) is not None
+
+    def stats(self):
+        return {'path': os.path.basename(self.path), 'writes': self.writes,
+                'transactions': self.transactions, 'queued': self._queue.qsize()}
+
+
+def _log_failure(future):
+    error = future.exception()
+    if error is not None:
+        print(f"⚠️ [DB] Background write failed: {error}")
+
+
+def add_column(table, column, decl):
+    """Migration step: ALTER TABLE ADD COLUMN, skipped if the column already exists."""
+    def step(conn):
+        cols = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        if column not in cols:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+    return step
+
+
+def fts_index(table, columns, tokenize="unicode61 remove_diacritics 2", name=None):
+    """
+    Migration step: external-content FTS5 table `name` (default
+    `<table>_fts`) over `columns` of `table` (joined on rowid), kept in sync
+    by triggers and backfilled from existing rows. Skipped with a warning if
+    sqlite lacks FTS5 (or the tokenizer); callers check `db.has_table(...)`
+    and fall back to scanning.
+    """
+    fts = name or f"{table}_fts"
+    cols = ', '.join(columns)
+    new_vals = ', '.join(f"new.{c}" for c in columns)
+    old_vals = ', '.join(f"old.{c}" for c in columns)
+
+    def step(conn):
+        try:
+            conn.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({cols}, content='{table}', "
+                         f"content_rowid='rowid', tokenize='{tokenize}')")
+        except sqlite3.OperationalError as e:
+            print(f"⚠️ [DB] FTS5 ({tokenize}) unavailable, {fts} lookups will scan {table}: {e}")
+            return
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{fts}_insert AFTER INSERT ON {table} BEGIN
+                INSERT INTO {fts}(rowid, {cols}) VALUES (new.rowid, {new_vals});
+            END""")
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{fts}_delete AFTER DELETE ON {table} BEGIN
+                INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.rowid, {old_vals});
+            END""")
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{fts}_update AFTER UPDATE OF {cols} ON {table} BEGIN
+                INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.rowid, {old_vals});
+                INSERT INTO {fts}(rowid, {cols}) VALUES (new.rowid, {new_vals});
+            END""")
+        conn.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+    return step
+
+
+# Anything but whitespace / FTS5 syntax (\w alone splits Indic words at their vowel signs)
+_FTS_TOKEN = r'([^\s"()*:^{}+\-,.;!?\'/]+)'
+
+
+def fts_match(text):
+    """
+    Free text or a topic query ('"Global News" OR Sports') -> FTS5 MATCH
+    expression, or None if nothing is searchable. Words within an OR branch
+    are ANDed; every term matches as a prefix ("church" finds "churches").
+    User input never reaches FTS5 syntax unquoted.
+    """
+    branches = []
+    for alt in re.split(r'\s+OR\s+', text or ''):
+        terms = []
+        for phrase, word in re.findall(r'"([^"]*)"|' + _FTS_TOKEN, alt):
+            if word and word.upper() in ('AND', 'NOT', 'NEAR'):
+                continue
+            words = re.findall(_FTS_TOKEN, phrase or word)
+            if words:
+                terms.append('"' + ' '.join(words) + '"*')
+        if terms:
+            branches.append(' AND '.join(terms) if len(terms) == 1 else '(' + ' AND '.join(terms) + ')')
+    return ' OR '.join(branches) or None
+
+
+def fts_contains(terms):
+    """
+    MATCH expression for a trigram index: any term occurs as a substring
+    (case-insensitive). Trigrams can't find terms under 3 characters, so
+    those are left out; None if no term is usable.
+    """
+    quoted = ['"' + t.replace('"', '""') + '"' for t in dict.fromkeys(t.strip() for t in terms if t) if len(t) >= 3]
+    return ' OR '.join(quoted) or None
+
+
+def like_any(columns, terms):
+    """(sql, params) for "any term is a substring of any column" without an index."""
+    clauses = [f"{c} LIKE ?" for t in terms if t for c in columns]
+    params = [f"%{t}%" for t in terms if t for _ in columns]
+    return '(' + (' OR '.join(clauses) or '0') + ')', params
+
+
+def contains_any(columns, terms, kw_index=None, rowid='rowid'):
+    """
+    (sql, params) for "any term is a substring of any column". Terms of 3+
+    characters go through the trigram index `kw_index` (matched on `rowid`);
+    shorter ones ("AI", "UN"), or all of them without an index, through LIKE.
+    """
+    terms = list(dict.fromkeys(t.strip() for t in terms if t and t.strip()))
+    indexed = [t for t in terms if len(t) >= 3] if kw_index else []
+    clauses, params = [], []
+    if indexed:
+        clauses.append(f"{rowid} IN (SELECT rowid FROM {kw_index} WHERE {kw_index} MATCH ?)")
+        params.append(fts_contains(indexed))
+    short = [t for t in terms if t not in indexed]
+    if short:
+        sql, like_params = like_any(columns, short)
+        clauses.append(sql)
+        params.extend(like_params)
+    return '(' + (' OR '.join(clauses) or '0') + ')', params
+
+
+_databases = {}
+_databases_lock = threading.Lock()
+
+
+def get_database(path):
+    """The shared Database for a file (one writer thread per file)."""
+    key = os.path.abspath(path)
+    db = _databases.get(key)
+    if db is None:
+        with _databases_lock:
+            db = _databases.setdefault(key, Database(key))
+    return db
+
+
+def all_stats():
+    return [db.stats() for db in list(_databases.values())]
@@ -0,0 +1,206 @@
+"""
+Persistent Embedding Cache
+Second tier behind EmbeddingService's in-process LRU, so a restart doesn't
+re-embed every title and snippet it has already seen:
+
+- Vectors live in one memory-mapped float32 matrix (`vectors.f32`), one
+  row per text; the file grows in steps up to `EMBED_DISK_CACHE_ROWS`.
+- `index.db` maps text hash -> row (+ last use); it's loaded into an
+  in-process LRU at startup and kept in sync through the shared Database
+  writer thread.
+- Once full, the least recently used row is overwritten.
+- A different model or dimension invalidates the whole cache.
+"""
+import os
+import time
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from src.db import get_database
+
+# Defaults (overridable via .env)
+CACHE_DIR = os.getenv('EMBED_DISK_CACHE_DIR',
+                      os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'embedding_cache'))
+CAPACITY = int(os.getenv('EMBED_DISK_CACHE_ROWS', 200000))
+GROW_ROWS = 4096  # Initial file size; doubled as rows fill up
+
+
+class EmbeddingCache:
+    """
+    `get_many(keys)` -> {key: vector (list of floats)} for the cached keys.
+    `put_many({key: vector})` stores new vectors, evicting LRU rows when full.
+    """
+
+    def __init__(self, model_name, cache_dir=CACHE_DIR, capacity=CAPACITY):
+        self.model_name = model_name
+        self.cache_dir = cache_dir
+        self.capacity = capacity
+        os.makedirs(cache_dir, exist_ok=True)
+        self.matrix_path = os.path.join(cache_dir, 'vectors.f32')
+        self.db = get_database(os.path.join(cache_dir, 'index.db'))
+        self.dim = None
+        self._matrix = None
+        self._rows = OrderedDict()   # key -> row, least recently used first
+        self._free = []              # unreferenced rows, reused before growing
+        self._next_row = 0
+        self._lock = threading.Lock()
+        self.counters = {'hits': 0, 'misses': 0, 'stored': 0, 'evicted': 0}
+        self._init_db()
+        self._load()
+
+    def _init_db(self):
+        try:
+            self.db.migrate('embedding_cache', [
+                '''
+                CREATE TABLE IF NOT EXISTS embedding_rows (
+                    row INTEGER PRIMARY KEY,
+                    key TEXT UNIQUE,
+                    last_used REAL
+                )
+                ''',
+                '''
+                CREATE TABLE IF NOT EXISTS embedding_meta (
+                    name TEXT PRIMARY KEY,
+                    value TEXT
+                )
+                ''',
+            ])
+        except Exception as e:
+            print(f"❌ [EmbeddingCache] DB Init Error: {e}")
+
+    def _load(self):
+        try:
+            meta = dict(self.db.query("SELECT name, value FROM embedding_meta"))
+            if meta.get('model') != self.model_name or not meta.get('dim') or not os.path.exists(self.matrix_path):
+                self._reset()
+                return
+            self.dim = int(meta['dim'])
+            rows = self.db.query("SELECT key, row FROM embedding_rows WHERE row < ? ORDER BY last_used", (self.capacity,))
+        except Exception as e:
+            print(f"⚠️ [EmbeddingCache] Load failed: {e}")
+            return
+        for key, row in rows:
+            self._rows[key] = row
+        self._next_row = max(self._rows.values(), default=-1) + 1
+        self._free = sorted(set(range(self._next_row)) - set(self._rows.values()), reverse=True)
+        self._open(self._file_rows())
+        if self._rows:
+            print(f"🧠 [EmbeddingCache] {len(self._rows)} cached embeddings loaded.")
+
+    def _reset(self):
+        """Forget everything (model changed or files missing)."""
+        self.db.transaction(lambda conn: (conn.execute("DELETE FROM embedding_rows"),
+                                          conn.execute("DELETE FROM embedding_meta")))
+        if os.path.exists(self.matrix_path):
+            os.remove(self.matrix_path)
+        self.dim = None
+        self._matrix = None
+        self._rows.clear()
+        self._free = []
+        self._next_row = 0
+
+    # --- Matrix file ---
+
+    def _file_rows(self):
+        if not self.dim or not os.path.exists(self.matrix_path):
+            return 0
+        return os.path.getsize(self.matrix_path) // (4 * self.dim)
+
+    def _open(self, rows):
+        """(Re)map the matrix with `rows` rows, growing the file if needed."""
+        if self._matrix is not None:
+            self._matrix.flush()
+            self._matrix = None
+        if rows <= 0:
+            return
+        with open(self.matrix_path, 'ab') as f:
+            f.truncate(max(rows * 4 * self.dim, os.path.getsize(self.matrix_path)))
+        self._matrix = np.memmap(self.matrix_path, dtype=np.float32, mode='r+', shape=(rows, self.dim))
+
+    def _allocate(self):
+        """(row, evicted) for a new vector: a free row, a fresh one, or the LRU entry's (evicted=True)."""
+        if self._free:
+            return self._free.pop(), False
+        if self._next_row < self.capacity:
+            row = self._next_row
+            self._next_row += 1
+            if self._matrix is None or row >= self._matrix.shape[0]:
+                self._open(min(self.capacity, max(GROW_ROWS, 2 * row)))
+            return row, False
+        _, row = self._rows.popitem(last=False)
+        self.counters['evicted'] += 1
+        return row, True
+
+    # --- Public API ---
+
+    def get_many(self, keys):
+        found = {}
+        touched = []
+        with self._lock:
+            if self._matrix is not None:
+                for key in keys:
+                    row = self._rows.get(key)
+                    if row is not None and key not in found:
+                        self._rows.move_to_end(key)
+                        found[key] = self._matrix[row].tolist()
+                        touched.append(row)
+            self.counters['hits'] += len(found)
+            self.counters['misses'] += len(keys) - len(found)
+        if touched:
+            # LRU order only needs to survive a restart approximately: fire-and-forget
+            now = time.time()
+            self.db.executemany("UPDATE embedding_rows SET last_used = ? WHERE row = ?",
+                                [(now, row) for row in touched], wait=False)
+        return found
+
+    def put_many(self, by_key):
+        if not by_key:
+            return
+        dim = len(next(iter(by_key.values())))
+        with self._lock:
+            if self.dim != dim:
+                if self.dim is not None:
+                    print(f"⚠️ [EmbeddingCache] Dimension changed ({self.dim} -> {dim}), resetting.")
+                    self._reset()
+                self.dim = dim
+                self.db.executemany("INSERT OR REPLACE INTO embedding_meta (name, value) VALUES (?, ?)",
+                                    [('model', self.model_name), ('dim', str(dim))])
+            # Rows are taken out of the LRU here, so no reader can hit them until they're rewritten
+            planned, evicted = [], []
+            for key, vec in by_key.items():
+                if key in self._rows:
+                    continue
+                row, was_evicted = self._allocate()
+                planned.append((row, key, vec))
+                if was_evicted:
+                    evicted.append(row)
+
+        if not planned:
+            return
+        if evicted:
+            # The old key's index row must be gone before its row holds another text's vector,
+            # or a crash in between would serve the wrong embedding after restart
+            self.db.executemany("DELETE FROM embedding_rows WHERE row = ?", [(row,) for row in evicted])
+
+        stored = []
+        with self._lock:
+            for row, key, vec in planned:
+                if key in self._rows:
+                    self._free.append(row)  # Stored concurrently by another caller
+                    continue
+                self._matrix[row] = vec
+                self._rows[key] = row
+                stored.append((row, key))
+            # Vectors reach the file before the index points at them
+            self._matrix.flush()
+            self.counters['stored'] += len(stored)
+        if stored:
+            now = time.time()
+            self.db.executemany("INSERT OR REPLACE INTO embedding_rows (row, key, last_used) VALUES (?, ?, ?)",
+                                [(row, key, now) for row, key in stored], wait=False)
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counters, rows=len(self._rows), capacity=self.capacity, dim=self.dim)
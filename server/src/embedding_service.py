@@ -0,0 +1,216 @@
+"""
+Shared Embedding Service
+One lazily-loaded all-MiniLM-L6-v2 model for the whole process (RAG + ranking),
+with cross-request micro-batching, an LRU cache of embeddings and a
+persistent on-disk cache behind it (see embedding_cache.py).
+"""
+import os
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+import numpy as np
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+BATCH_WINDOW = float(os.getenv('EMBED_BATCH_WINDOW_MS', 10)) / 1000.0
+MAX_BATCH = int(os.getenv('EMBED_MAX_BATCH', 128))
+CACHE_SIZE = int(os.getenv('EMBED_CACHE_SIZE', 20000))
+DISK_CACHE = os.getenv('EMBED_DISK_CACHE', '1') != '0'
+
+
+def text_key(text):
+    """Stable cache key for a text (e.g. 'title snippet')."""
+    return hashlib.sha1(text.encode('utf-8', 'ignore')).hexdigest()
+
+
+class EmbeddingService:
+    """
+    Drop-in replacement for LangChain's `HuggingFaceEmbeddings`
+    (`embed_documents` / `embed_query`), shared by RAGEngine and HybridRanker.
+
+    - The model loads on first use (or via `warm_up()` in the background),
+      never at import time, so startup stays fast.
+    - Concurrent callers are coalesced: texts submitted within a short window
+      are encoded in a single forward pass.
+    - Embeddings are cached by a hash of the text, so repeated titles and
+      snippets cost a dict lookup; misses fall through to the disk cache,
+      which survives restarts.
+    """
+
+    def __init__(self, model_name=MODEL_NAME, cache_size=CACHE_SIZE, disk_cache=DISK_CACHE):
+        self.model_name = model_name
+        self.cache_size = cache_size
+        self._model = None
+        self._load_error = None
+        self._load_lock = threading.Lock()
+
+        self._cache = OrderedDict()   # text hash -> vector (float32 array; lists only at the API boundary)
+        self._cache_lock = threading.Lock()
+
+        self._queue = []              # (text, key, Future) awaiting the batcher
+        self._queue_cond = threading.Condition()
+        self._batcher = None
+        self._batcher_lock = threading.Lock()
+        self.counters = {'hits': 0, 'misses': 0, 'batches': 0, 'encoded': 0}
+        self._disk_enabled = disk_cache
+        self._disk = None
+        self._disk_lock = threading.Lock()
+
+    # --- Model Lifecycle ---
+
+    def _load(self):
+        with self._load_lock:
+            if self._model is not None or self._load_error is not None:
+                return self._model
+            try:
+                from langchain_huggingface import HuggingFaceEmbeddings
+                print(f"🧠 EmbeddingService: Loading '{self.model_name}'...")
+                self._model = HuggingFaceEmbeddings(model_name=self.model_name)
+                print("✅ EmbeddingService: Model ready.")
+            except Exception as e:
+                print(f"⚠️ EmbeddingService: Model failed to load: {e}")
+                self._load_error = e
+            return self._model
+
+    def warm_up(self):
+        """Load the model on a background thread (non-blocking)."""
+        if self._model is None and self._load_error is None:
+            threading.Thread(target=self._load, daemon=True).start()
+
+    def is_ready(self):
+        return self._model is not None
+
+    def ensure_loaded(self):
+        """Blocking load. Returns True when the model is usable."""
+        return self._load() is not None
+
+    # --- Batching ---
+
+    def _start_batcher(self):
+        if self._batcher is None:
+            with self._batcher_lock:
+                if self._batcher is None:
+                    self._batcher = threading.Thread(target=self._batch_loop, daemon=True)
+                    self._batcher.start()
+
+    def _batch_loop(self):
+        while True:
+            with self._queue_cond:
+                while not self._queue:
+                    self._queue_cond.wait()
+            # Let concurrent requests pile in before a forward pass
+            time.sleep(BATCH_WINDOW)
+            with self._queue_cond:
+                batch, self._queue = self._queue[:MAX_BATCH], self._queue[MAX_BATCH:]
+
+            # The same text may be queued by several callers
+            unique = OrderedDict()
+            for text, key, _ in batch:
+                unique.setdefault(key, text)
+            try:
+                vectors = self._model.embed_documents(list(unique.values()))
+                by_key = {key: np.asarray(vec, dtype=np.float32) for key, vec in zip(unique.keys(), vectors)}
+                self._remember(by_key)
+                with self._cache_lock:
+                    self.counters['batches'] += 1
+                    self.counters['encoded'] += len(unique)
+                for _, key, future in batch:
+                    future.set_result(by_key[key])
+            except Exception as e:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    # --- Cache ---
+
+    def _disk_cache(self):
+        """The persistent cache, opened on first use (None if disabled or broken)."""
+        if self._disk is None and self._disk_enabled:
+            with self._disk_lock:
+                if self._disk is None and self._disk_enabled:
+                    try:
+                        from src.embedding_cache import EmbeddingCache
+                        self._disk = EmbeddingCache(self.model_name)
+                    except Exception as e:
+                        print(f"⚠️ EmbeddingService: Disk cache unavailable: {e}")
+                        self._disk_enabled = False
+        return self._disk
+
+    def _lookup(self, keys):
+        found = {}
+        with self._cache_lock:
+            for key in keys:
+                vec = self._cache.get(key)
+                if vec is not None:
+                    self._cache.move_to_end(key)
+                    found[key] = vec
+            self.counters['hits'] += len(found)
+            self.counters['misses'] += len(keys) - len(found)
+
+        disk = self._disk_cache()
+        if disk is not None and len(found) < len(keys):
+            from_disk = {k: np.asarray(v, dtype=np.float32)
+                         for k, v in disk.get_many([k for k in keys if k not in found]).items()}
+            if from_disk:
+                self._remember(from_disk, persist=False)
+                found.update(from_disk)
+        return found
+
+    def _remember(self, by_key, persist=True):
+        if persist and self._disk is not None:
+            try:
+                self._disk.put_many(by_key)
+            except Exception as e:
+                print(f"⚠️ EmbeddingService: Disk cache write failed: {e}")
+        with self._cache_lock:
+            for key, vec in by_key.items():
+                self._cache[key] = vec
+                self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    # --- Public API (HuggingFaceEmbeddings-compatible) ---
+
+    def embed_documents(self, texts):
+        if not texts:
+            return []
+        if not self.ensure_loaded():
+            raise RuntimeError(f"Embedding model unavailable: {self._load_error}")
+
+        keys = [text_key(t) for t in texts]
+        found = self._lookup(keys)
+
+        missing = OrderedDict()
+        for text, key in zip(texts, keys):
+            if key not in found:
+                missing.setdefault(key, text)
+
+        if missing:
+            futures = {key: Future() for key in missing}
+            self._start_batcher()
+            with self._queue_cond:
+                for key, text in missing.items():
+                    self._queue.append((text, key, futures[key]))
+                self._queue_cond.notify()
+            for key, future in futures.items():
+                found[key] = future.result()
+
+        return [found[k].tolist() for k in keys]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+    def stats(self):
+        with self._cache_lock:
+            stats = dict(self.counters)
+            stats['cached'] = len(self._cache)
+        stats['ready'] = self.is_ready()
+        if self._disk is not None:
+            stats['disk'] = self._disk.stats()
+        return stats
+
+
+# Singleton instance
+embedding_service = EmbeddingService()
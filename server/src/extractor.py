@@ -1,7 +1,7 @@
 from newspaper import Article
 import time
-import trafilatura
-import requests
+from src.page_meta import page_meta
+from src.url_resolver import url_resolver, is_redirect_url
 from urllib.parse import urlparse
 import ipaddress
 import re
@@ -55,75 +55,20 @@ def _is_safe_url(url):
 class ContentExtractor:
     """
     Extracts the main content of an article for 'Reader Mode'.
-    Uses newspaper3k as primary, trafilatura as fallback.
+    Uses trafilatura (via the shared page_meta cache) as primary, newspaper3k as fallback.
     """
     def _resolve_final_url(self, url):
         """
         Follows redirects (especially from Google News) to find the actual article URL.
+        Shared persistent cache with NewsFeeder: a link opened from the feed is already resolved.
         """
         if not url: return ""
-        if "news.google.com" not in url and "google.com/rss" not in url and "google.com/url" not in url:
+        if not is_redirect_url(url):
             return url
-            
-        try:
-            print(f"🔗 [Extractor] Resolving redirect for: {url}")
-            
-            # [FIX] Use context manager to close session and release connection to pool
-            with requests.Session() as session:
-                # USE A SPOOFED MOBILE USER AGENT - Google often redirects mobile bots faster
-                session.headers.update({
-                    "User-Agent": "Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Mobile/15E148 Safari/604.1",
-                    "Referer": "https://news.google.com/",
-                    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-                    "Connection": "close" # Ensure we don't hold this connection
-                })
-                
-                # Try a quick HEAD request first (very fast)
-                try:
-                    resp = session.head(url, timeout=5, allow_redirects=True)
-                    if "google.com" not in resp.url and "googleusercontent.com" not in resp.url:
-                        print(f"✅ [Extractor] HEAD Resolved to: {resp.url}")
-                        return resp.url
-                except: pass
-
-                # 1. First attempt: Simple GET with redirects
-                resp = session.get(url, timeout=8, allow_redirects=True)
-                
-                # If we land on a non-google page, we're done
-                if "google.com" not in resp.url and "googleusercontent.com" not in resp.url:
-                    print(f"✅ [Extractor] GET Resolved to: {resp.url}")
-                    return resp.url
-                
-                # 2. Extract from Splash Page (WIZ_global_data or IJ_values)
-                text = resp.text
-                import re
-                
-                # More specific pattern for JSON-like arrays in Google splash pages
-                patterns = [
-                    r'\["(https?://[^"]+)"', 
-                    r'"(https?://[^"]+)"',
-                ]
-                
-                found_urls = []
-                for p in patterns:
-                    matches = re.findall(p, text)
-                    for m in matches:
-                        # BLOCK tracking and meta domains
-                        blocked = ["google.com", "gstatic.com", "googleusercontent.com", "google-analytics.com", "doubleclick.net", "googletagmanager.com", "googlesyndication.com"]
-                        if not any(b in m for b in blocked):
-                            found_urls.append(m)
-                
-                if found_urls:
-                    # Prioritize URLs that contain 'article', 'news', or common extensions
-                    priority_urls = [u for u in found_urls if any(p in u.lower() for p in ['/20', '.html', 'article', 'news'])]
-                    final_url = priority_urls[0] if priority_urls else found_urls[0]
-                    print(f"✅ [Extractor] Found via Splash Scrape: {final_url}")
-                    return final_url
-                
-        except Exception as e:
-            print(f"⚠️ [Extractor] Resolution failed: {e}")
-            
-        return url
+        resolved = url_resolver.resolve(url)
+        if resolved != url:
+            print(f"✅ [Extractor] Resolved to: {resolved}")
+        return resolved
 
     def extract(self, url):
         try:
@@ -143,46 +88,35 @@ class ContentExtractor:
             config.browser_user_agent = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
             config.request_timeout = 15
 
-            # Try newspaper3k first (it handles its own downloading well usually)
+            # One download + one lxml parse (shared page cache): metadata and trafilatura text from the same tree
+            page = page_meta.fetch(url, timeout=15, headers={"User-Agent": config.browser_user_agent}, with_text=True)
+            final_text = (page.text or "") if page else ""
+            print(f"📰 PageMeta extraction: Title={bool(page and page.title)}, Text length={len(final_text)}")
+
+            # newspaper3k only when trafilatura came up short (or the download failed), on the same HTML
             article = Article(url, config=config)
-            try:
-                article.download()
-                article.parse()
-            except Exception as ne:
-                print(f"⚠️ Newspaper3k download failed: {ne}")
+            if len(final_text) <= 200:
+                print("⚠️ Trafilatura failed or stub page detected. Trying Newspaper3k...")
+                try:
+                    if page:
+                        article.download(input_html=page.html)
+                    else:
+                        article.download() # Let newspaper3k try its own downloader as a last resort
+                    article.parse()
+                    if article.text and len(article.text) > len(final_text):
+                        final_text = article.text
+                except Exception as ne:
+                    print(f"⚠️ Newspaper3k download failed: {ne}")
 
-            print(f"📰 Newspaper3k extraction: Title={bool(article.title)}, Text length={len(article.text) if article.text else 0}")
-            
-            # [CRITICAL] If we are STILL on Google (Splash Page), Text length will be 0 but Title will be set
-            final_text = ""
-            if article.text and len(article.text) > 200:
-                 final_text = article.text
-            else:
-                 print("⚠️ Newspaper3k failed or stub page detected. Trying Trafilatura with unified session...")
-                 # [FIX] Manually download using requests to control headers and encoding
-                 try:
-                     session = requests.Session()
-                     session.headers.update({
-                        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-                        "Accept-Encoding": "gzip, deflate", # EXPLICITLY disable br/zstd if causing issues
-                        "Accept-Language": "en-US,en;q=0.5"
-                     })
-                     resp = session.get(url, timeout=15)
-                     resp.raise_for_status()
-                     # Pass RESPONSE CONTENT/TEXT to trafilatura
-                     downloaded = resp.text
-                     if downloaded:
-                         final_text = trafilatura.extract(downloaded) or ""
-                 except Exception as te:
-                     print(f"⚠️ Trafilatura manual fetch failed: {te}")
+            title = (page and page.title) or article.title
+            image = (page and page.image) or article.top_image
             
             # [FINAL FALLBACK] If text is still suspiciously empty, use the title to search for a clean copy
-            if len(final_text) < 200 and article.title:
-                 print(f"🕵️ Deep Recovery: Searching for clean copy of '{article.title}'")
+            if len(final_text) < 200 and title:
+                 print(f"🕵️ Deep Recovery: Searching for clean copy of '{title}'")
                  from src.ddg_client import DDGClient
                  ddg = DDGClient()
-                 search_results = ddg.search_news(article.title, limit=3)
+                 search_results = ddg.search_news(title, limit=3)
                  if search_results:
                      for res in search_results:
                          new_url = res.get('link')
@@ -191,15 +125,15 @@ class ContentExtractor:
                              # Quick scrape of this new URL
                              try:
                                  # Use same safe download logic
-                                 rec_resp = requests.get(new_url, headers={"User-Agent": config.browser_user_agent}, timeout=10)
-                                 if rec_resp.status_code == 200:
-                                     recovered_text = trafilatura.extract(rec_resp.text)
+                                 rec_page = page_meta.fetch(new_url, timeout=10, headers={"User-Agent": config.browser_user_agent}, with_text=True)
+                                 if rec_page:
+                                     recovered_text = rec_page.text
                                      if recovered_text and len(recovered_text) > 300:
                                          print(f"✅ Recovery successful! {len(recovered_text)} chars found.")
                                          return {
-                                             'title': article.title,
+                                             'title': title,
                                              'text': recovered_text,
-                                             'image': article.top_image or res.get('thumbnail'),
+                                             'image': image or rec_page.image or res.get('thumbnail'),
                                              'url': new_url,
                                              'is_recovered': True
                                          }
@@ -207,11 +141,11 @@ class ContentExtractor:
 
             # Return results
             result = {
-                'title': article.title or "Article",
+                'title': title or "Article",
                 'text': final_text,
-                'image': article.top_image,
-                'authors': article.authors,
-                'publish_date': str(article.publish_date) if article.publish_date else None,
+                'image': image,
+                'authors': (page and page.authors) or article.authors,
+                'publish_date': (page and page.published) or (str(article.publish_date) if article.publish_date else None),
                 'url': url
             }
             
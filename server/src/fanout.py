@@ -0,0 +1,119 @@
+"""
+Search Fan-out Engine
+Runs many blocking agent calls concurrently on an asyncio loop with
+per-query deadlines, a global request deadline and early cut-off.
+"""
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Defaults (overridable via .env)
+QUERY_TIMEOUT = float(os.getenv('FANOUT_QUERY_TIMEOUT', 8))
+REQUEST_TIMEOUT = float(os.getenv('FANOUT_REQUEST_TIMEOUT', 15))
+MAX_WORKERS = int(os.getenv('FANOUT_MAX_WORKERS', 24))
+
+
+class FanoutJob:
+    """A single blocking call (e.g. one dork query) plus a label for error reporting."""
+    __slots__ = ('label', 'func', 'args', 'meta')
+
+    def __init__(self, label, func, *args, meta=None):
+        self.label = label
+        self.func = func
+        self.args = args
+        self.meta = meta or {}
+
+
+class FanoutEngine:
+    """
+    Asyncio-driven fan-out for blocking search agents.
+
+    - Every job gets its own deadline (`query_timeout`).
+    - The whole request gets a global deadline (`request_timeout`).
+    - `enough(results)` can end the fan-out early once sufficient
+      high-scoring results are in; the slow tail is cancelled, never awaited.
+
+    Agents (DDGS / SerpAPI) are synchronous, so they run on a shared
+    thread pool. Cancelled jobs that already started finish in the
+    background; their results are simply dropped.
+    """
+
+    def __init__(self, max_workers=MAX_WORKERS, query_timeout=QUERY_TIMEOUT, request_timeout=REQUEST_TIMEOUT):
+        self.query_timeout = query_timeout
+        self.request_timeout = request_timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='fanout')
+
+    def stream(self, jobs, enough=None, query_timeout=None, request_timeout=None):
+        """
+        Sync generator yielding `(job, result, error)` in completion order.
+        Runs a private event loop so it can be used from Flask request threads.
+        Closing the generator early cancels every job still in flight.
+        """
+        if not jobs:
+            return
+
+        query_timeout = query_timeout or self.query_timeout
+        request_timeout = request_timeout or self.request_timeout
+        loop = asyncio.new_event_loop()
+        deadline = time.monotonic() + request_timeout
+
+        async def _run(job):
+            return await asyncio.wait_for(
+                loop.run_in_executor(self._executor, job.func, *job.args),
+                timeout=query_timeout
+            )
+
+        task_to_job = {}
+        try:
+            for job in jobs:
+                task_to_job[loop.create_task(_run(job))] = job
+
+            pending = set(task_to_job)
+            collected = []
+            while pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    print(f"⏱️ Fanout: Request deadline hit. Cancelling {len(pending)} slow queries.")
+                    break
+
+                done, pending = loop.run_until_complete(
+                    asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                )
+                for task in done:
+                    job = task_to_job[task]
+                    try:
+                        data = task.result() or []
+                        collected.extend(data)
+                        yield job, data, None
+                    except asyncio.TimeoutError:
+                        yield job, [], TimeoutError(f"timed out after {query_timeout:.0f}s")
+                    except Exception as e:
+                        yield job, [], e
+
+                if pending and enough and enough(collected):
+                    print(f"⚡ Fanout: Enough results ({len(collected)}). Cancelling {len(pending)} slow queries.")
+                    break
+        finally:
+            # Cancel the slow tail instead of awaiting it
+            leftovers = [t for t in task_to_job if not t.done()]
+            for task in leftovers:
+                task.cancel()
+            if leftovers:
+                loop.run_until_complete(asyncio.gather(*leftovers, return_exceptions=True))
+            loop.close()
+
+    def run(self, jobs, enough=None, **kwargs):
+        """Blocking helper: returns `(results, errors)` once the fan-out settles."""
+        results = []
+        errors = []
+        for job, data, error in self.stream(jobs, enough=enough, **kwargs):
+            if error:
+                errors.append((job, error))
+            else:
+                results.extend(data)
+        return results, errors
+
+
+# Shared engine (one thread pool for the whole process)
+fanout_engine = FanoutEngine()
@@ -0,0 +1,198 @@
+"""
+Feed Poller
+Conditional, adaptively scheduled RSS polling. Per-feed state (ETag,
+Last-Modified, recently seen GUIDs, observed update cadence, next poll
+time) lives in the `feed_state` table of news.db:
+
+- Requests send If-None-Match / If-Modified-Since; a 304 costs no parsing.
+- Entries whose GUID the feed already served are dropped before any
+  enrichment work.
+- New validators and GUIDs are only remembered once the caller `commit()`s
+  the poll (its entries are stored), so a failed or interrupted cycle
+  re-fetches them instead of losing them behind a 304.
+- Feeds that publish often are polled often; quiet or failing feeds back
+  off towards `FEED_MAX_INTERVAL`.
+"""
+import os
+import json
+import time
+import random
+import threading
+
+import feedparser
+import requests
+
+from src.http_client import http_client
+from src.db import get_database
+
+# Database Configuration (shares the news DB)
+DB_FILE = os.getenv('NEWS_DB_FILE', os.path.join(os.path.dirname(__file__), '..', 'news.db'))
+
+# Defaults (overridable via .env)
+MIN_INTERVAL = float(os.getenv('FEED_MIN_INTERVAL', 60))
+MAX_INTERVAL = float(os.getenv('FEED_MAX_INTERVAL', 3600))
+BACKOFF = float(os.getenv('FEED_BACKOFF', 1.5))
+MAX_GUIDS = 200  # Remembered per feed; comfortably more than one feed window
+
+
+def entry_key(entry):
+    """Identity of a feed entry: its GUID, or its link for feeds without one."""
+    return entry.get('guid') or entry.get('link')
+
+
+class FeedPoller:
+    """
+    `due(urls)` -> the subset whose next poll time has passed.
+    `poll(url)` -> (new entries, feed title); [] on 304 / nothing new / error.
+    `commit(url)` -> persist the validators and GUIDs of the last poll once
+    its entries are safely stored.
+    """
+
+    def __init__(self, db_file=DB_FILE, min_interval=MIN_INTERVAL, max_interval=MAX_INTERVAL):
+        self.db = get_database(db_file)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self._states = {}
+        self._lock = threading.Lock()
+        self._init_db()
+        self._load()
+
+    def _init_db(self):
+        try:
+            self.db.migrate('feed_state', [
+                '''
+                CREATE TABLE IF NOT EXISTS feed_state (
+                    url TEXT PRIMARY KEY,
+                    etag TEXT,
+                    modified TEXT,
+                    last_guids TEXT,
+                    cadence REAL DEFAULT 0,
+                    interval REAL,
+                    last_new_at REAL,
+                    last_polled REAL,
+                    next_poll REAL DEFAULT 0,
+                    failures INTEGER DEFAULT 0
+                )
+                ''',
+            ])
+        except Exception as e:
+            print(f"❌ [FeedPoller] DB Init Error: {e}")
+
+    def _load(self):
+        try:
+            rows = self.db.query("SELECT * FROM feed_state")
+        except Exception as e:
+            print(f"⚠️ [FeedPoller] State load failed: {e}")
+            return
+        for row in rows:
+            state = dict(row)
+            state['last_guids'] = json.loads(state['last_guids'] or '[]')
+            self._states[state['url']] = state
+
+    def _state(self, url):
+        state = self._states.get(url)
+        if state is None:
+            with self._lock:
+                state = self._states.setdefault(url, {
+                    'url': url, 'etag': None, 'modified': None, 'last_guids': [], 'cadence': 0.0,
+                    'interval': self.min_interval, 'last_new_at': None, 'last_polled': None,
+                    'next_poll': 0.0, 'failures': 0,
+                })
+        return state
+
+    def _save(self, state):
+        # Queued on the writer thread; the in-memory state is authoritative for this process
+        self.db.execute('''
+            INSERT OR REPLACE INTO feed_state
+            (url, etag, modified, last_guids, cadence, interval, last_new_at, last_polled, next_poll, failures)
+            VALUES (?,?,?,?,?,?,?,?,?,?)
+        ''', (state['url'], state['etag'], state['modified'], json.dumps(state['last_guids']), state['cadence'],
+              state['interval'], state['last_new_at'], state['last_polled'], state['next_poll'], state['failures']), wait=False)
+
+    def _schedule(self, state, now, new_items, failed=False):
+        """Adaptive interval: hot feeds ~ half their cadence, quiet/failing feeds back off."""
+        interval = state['interval'] or self.min_interval
+        if failed:
+            state['failures'] += 1
+            interval *= 2
+        elif new_items:
+            state['failures'] = 0
+            if state['last_new_at']:
+                gap = now - state['last_new_at']
+                state['cadence'] = gap if not state['cadence'] else 0.5 * state['cadence'] + 0.5 * gap
+            state['last_new_at'] = now
+            interval = state['cadence'] / 2 if state['cadence'] else self.min_interval
+        else:
+            state['failures'] = 0
+            interval *= BACKOFF
+        state['interval'] = min(self.max_interval, max(self.min_interval, interval))
+        state['last_polled'] = now
+        # Jitter so feeds that started together don't stay in lockstep
+        state['next_poll'] = now + state['interval'] * random.uniform(0.9, 1.1)
+        self._save(state)
+
+    def due(self, urls, now=None):
+        now = now or time.time()
+        return [u for u in urls if self._state(u)['next_poll'] <= now]
+
+    def poll(self, url, limit=10):
+        state = self._state(url)
+        headers = {}
+        if state['etag']:
+            headers['If-None-Match'] = state['etag']
+        if state['modified']:
+            headers['If-Modified-Since'] = state['modified']
+
+        now = time.time()
+        try:
+            resp = http_client.get(url, headers=headers, timeout=15)
+        except requests.exceptions.RequestException:
+            self._schedule(state, now, 0, failed=True)
+            return [], None
+
+        if resp.status_code == 304:
+            self._schedule(state, now, 0)
+            return [], None
+        if resp.status_code != 200:
+            self._schedule(state, now, 0, failed=True)
+            return [], None
+
+        feed = feedparser.parse(resp.content, response_headers={
+            'content-location': resp.url, 'content-type': resp.headers.get('Content-Type', '')})
+        entries = feed.entries[:limit]
+        known = set(state['last_guids'])
+        guids = [entry_key(entry) for entry in entries]
+        fresh = [entry for entry, guid in zip(entries, guids) if guid not in known]
+
+        current = set(guids)
+        state['_pending'] = {
+            'etag': resp.headers.get('ETag'),
+            'modified': resp.headers.get('Last-Modified'),
+            'last_guids': (guids + [g for g in state['last_guids'] if g not in current])[:MAX_GUIDS],
+        }
+        self._schedule(state, now, len(fresh))
+        if not fresh:
+            self.commit(url)  # Nothing to store, nothing to lose
+        return fresh, feed.feed.get('title', 'RSS')
+
+    def commit(self, url):
+        """The entries from the last `poll(url)` are stored: send its validators from now on."""
+        state = self._states.get(url)
+        pending = state.pop('_pending', None) if state else None
+        if pending:
+            state.update(pending)
+            self._save(state)
+
+    def stats(self):
+        now = time.time()
+        states = list(self._states.values())
+        return {
+            'feeds': len(states),
+            'due': sum(1 for s in states if s['next_poll'] <= now),
+            'failing': sum(1 for s in states if s['failures']),
+            'mean_interval': round(sum(s['interval'] or 0 for s in states) / len(states), 1) if states else 0,
+        }
+
+
+# Shared poller (feed state is per news DB)
+feed_poller = FeedPoller()
@@ -0,0 +1,237 @@
+"""
+Feed Snapshots
+Ready-to-serve, pre-serialized feeds for `/api/news` and `/api/videos`.
+One snapshot per (kind, language, active-topic-set), built by a registered
+builder off the request path:
+
+- A request returns the stored JSON bytes as-is (no live RSS / YouTube
+  searches, URL resolution, image scraping or translation).
+- Background fetch cycles and moderation changes call `invalidate(kind)`;
+  recently served snapshots are rebuilt on a background thread while the
+  previous bytes keep being served.
+- Topic changes re-key the feed, so the new topic set is prebuilt for
+  every language that was recently requested.
+- Snapshots are persisted in news.db so a restart serves the last feed
+  immediately (marked stale, rebuilt in the background). Rows of evicted
+  or long-unused snapshots are deleted.
+- Unsupported languages fall back to 'en', so arbitrary `?lang=` values
+  can't mint new snapshot keys (each a cold build + stored row).
+"""
+import os
+import json
+import time
+import queue
+import threading
+from concurrent.futures import Future
+
+from src.db import get_database
+
+# Database Configuration (shares the news DB)
+DB_FILE = os.getenv('NEWS_DB_FILE', os.path.join(os.path.dirname(__file__), '..', 'news.db'))
+
+# Defaults (overridable via .env)
+SNAPSHOT_TTL = float(os.getenv('FEED_SNAPSHOT_TTL', 900))          # Live searches age even without DB writes
+SNAPSHOT_RECENT = float(os.getenv('FEED_SNAPSHOT_RECENT', 3 * 3600))  # Only keep rebuilding feeds someone reads
+MAX_SNAPSHOTS = int(os.getenv('FEED_SNAPSHOT_MAX', 64))
+SUPPORTED_LANGS = ('en', 'ta', 'hi')
+
+
+class Snapshot:
+    __slots__ = ('payload', 'count', 'built_at', 'generation', 'last_served')
+
+    def __init__(self, payload, count, built_at, generation):
+        self.payload = payload
+        self.count = count
+        self.built_at = built_at
+        self.generation = generation
+        self.last_served = time.time()
+
+
+class FeedSnapshots:
+    """
+    `register(kind, builder)` with `builder(lang, topics) -> list of dicts`.
+    `get(kind, lang, topics)` -> JSON bytes; builds synchronously only when
+    no snapshot exists for the key yet (concurrent cold requests share one
+    build).
+    """
+
+    def __init__(self, db_file=DB_FILE, ttl=SNAPSHOT_TTL):
+        self.db = get_database(db_file)
+        self.ttl = ttl
+        self._builders = {}
+        self._snapshots = {}      # (kind, lang, topics) -> Snapshot
+        self._generation = {}     # kind -> int, bumped on invalidate
+        self._inflight = {}       # key -> Future
+        self._pending = set()
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker = None
+        self.counters = {'hits': 0, 'stale_hits': 0, 'cold_builds': 0, 'rebuilds': 0, 'errors': 0}
+        self._init_db()
+        self._load()
+
+    def _init_db(self):
+        try:
+            self.db.migrate('feed_snapshots', [
+                '''
+                CREATE TABLE IF NOT EXISTS feed_snapshots (
+                    kind TEXT,
+                    lang TEXT,
+                    topics TEXT,
+                    payload BLOB,
+                    item_count INTEGER,
+                    built_at REAL,
+                    PRIMARY KEY (kind, lang, topics)
+                )
+                ''',
+            ])
+        except Exception as e:
+            print(f"❌ [FeedSnapshots] DB Init Error: {e}")
+
+    def _load(self):
+        try:
+            self.db.execute(f"DELETE FROM feed_snapshots WHERE built_at <= ? OR lang NOT IN ({','.join('?' * len(SUPPORTED_LANGS))})",
+                            (time.time() - SNAPSHOT_RECENT, *SUPPORTED_LANGS))
+            rows = self.db.query("SELECT kind, lang, topics, payload, item_count, built_at FROM feed_snapshots")
+        except Exception as e:
+            print(f"⚠️ [FeedSnapshots] Load failed: {e}")
+            return
+        for kind, lang, topics, payload, count, built_at in rows:
+            # Generation -1: served straight away, but rebuilt on first use
+            self._snapshots[(kind, lang, tuple(json.loads(topics)))] = Snapshot(bytes(payload), count, built_at, -1)
+
+    @staticmethod
+    def _key(kind, lang, topics):
+        return (kind, lang if lang in SUPPORTED_LANGS else 'en', tuple(sorted(topics or ())))
+
+    # --- Public API ---
+
+    def register(self, kind, builder):
+        self._builders[kind] = builder
+
+    def get(self, kind, lang, topics):
+        key = self._key(kind, lang, topics)
+        snap = self._snapshots.get(key)
+        if snap is not None:
+            snap.last_served = time.time()
+            if self._is_stale(snap, kind):
+                self._count('stale_hits')
+                self._schedule(key)
+            else:
+                self._count('hits')
+            return snap.payload
+        self._count('cold_builds')
+        return self._build(key).payload
+
+    def invalidate(self, kind=None):
+        """The underlying data changed: rebuild recently served snapshots in the background."""
+        with self._lock:
+            kinds = [kind] if kind else list(self._builders)
+            for k in kinds:
+                self._generation[k] = self._generation.get(k, 0) + 1
+        for key in self._recent_keys(kinds):
+            self._schedule(key)
+
+    def topics_changed(self, topics):
+        """Prebuild the new topic set for every (kind, lang) that was recently served."""
+        targets = {(kind, lang) for kind, lang, _ in self._recent_keys(list(self._builders))}
+        for kind, lang in targets:
+            key = self._key(kind, lang, topics)
+            if key not in self._snapshots:
+                self._schedule(key)
+
+    def stats(self):
+        now = time.time()
+        snaps = list(self._snapshots.items())
+        return dict(self.counters, snapshots=len(snaps), queued=self._queue.qsize(),
+                    stale=sum(1 for (kind, _, _), s in snaps if self._is_stale(s, kind, now)))
+
+    # --- Internals ---
+
+    def _count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def _is_stale(self, snap, kind, now=None):
+        return snap.generation != self._generation.get(kind, 0) or (now or time.time()) - snap.built_at > self.ttl
+
+    def _recent_keys(self, kinds):
+        cutoff = time.time() - SNAPSHOT_RECENT
+        return [key for key, snap in list(self._snapshots.items()) if key[0] in kinds and snap.last_served > cutoff]
+
+    def _build(self, key):
+        """Build (or join an in-flight build of) one snapshot; returns it."""
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+        if not owner:
+            return future.result()
+
+        kind, lang, topics = key
+        # Captured before building: an invalidate that lands mid-build leaves this snapshot stale
+        generation = self._generation.get(kind, 0)
+        try:
+            items = self._builders[kind](lang, list(topics))
+            snap = Snapshot(json.dumps(items).encode('utf-8'), len(items), time.time(), generation)
+        except Exception as e:
+            self._count('errors')
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            previous = self._snapshots.get(key)
+            if previous is not None:
+                snap.last_served = previous.last_served
+            self._snapshots[key] = snap
+            evicted = self._evict()
+            self._inflight.pop(key, None)
+        future.set_result(snap)
+
+        def store(conn):
+            conn.execute("INSERT OR REPLACE INTO feed_snapshots (kind, lang, topics, payload, item_count, built_at) VALUES (?,?,?,?,?,?)",
+                         (kind, lang, json.dumps(list(topics)), snap.payload, snap.count, snap.built_at))
+            conn.executemany("DELETE FROM feed_snapshots WHERE kind = ? AND lang = ? AND topics = ?",
+                             [(k, l, json.dumps(list(t))) for k, l, t in evicted])
+            conn.execute("DELETE FROM feed_snapshots WHERE built_at <= ?", (time.time() - SNAPSHOT_RECENT,))
+        self.db.transaction(store, wait=False)
+        return snap
+
+    def _evict(self):
+        """Drop least recently served snapshots over the cap; returns their keys."""
+        evicted = []
+        while len(self._snapshots) > MAX_SNAPSHOTS:
+            oldest = min(self._snapshots, key=lambda k: self._snapshots[k].last_served)
+            del self._snapshots[oldest]
+            evicted.append(oldest)
+        return evicted
+
+    def _schedule(self, key):
+        with self._lock:
+            if key in self._pending or key[0] not in self._builders:
+                return
+            self._pending.add(key)
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._rebuild_loop, daemon=True, name='feed-snapshots')
+                self._worker.start()
+        self._queue.put(key)
+
+    def _rebuild_loop(self):
+        while True:
+            key = self._queue.get()
+            with self._lock:
+                self._pending.discard(key)
+            started = time.time()
+            try:
+                snap = self._build(key)
+                self._count('rebuilds')
+                print(f"📦 [FeedSnapshots] Rebuilt {key[0]}/{key[1]} ({snap.count} items, {time.time() - started:.1f}s).")
+            except Exception as e:
+                print(f"⚠️ [FeedSnapshots] Rebuild failed for {key[0]}/{key[1]}: {e}")
+
+
+# Shared snapshot store (builders are registered by the API layer)
+feed_snapshots = FeedSnapshots()
@@ -1,3 +1,6 @@
+import re
+
+from src.keyword_matcher import KeywordMatcher
 
 class ContentFilter:
     """
@@ -38,80 +41,132 @@ class ContentFilter:
             'trinity', 'salvation', 'grace', 'holy spirit', 'resurrection', 'crucifixion',
             'persecution', 'martyr', 'testament', 'revelation', 'psalms', 'proverbs'
         }
+
+        # 5. Tech Spam (penalized unless the topic itself is technical)
+        self.tech_topic_words = ['windows', 'microsoft', 'update', 'android', 'software', 'linux', 'code']
+        self.spam_terms = {'windows update', 'android', 'software download', 'crack', 'serial', 'hack'}
+
+        # Compiled matchers: the blacklist is static, text matchers are built once per topic
+        self._blacklist_pattern = re.compile('|'.join(re.escape(d) for d in sorted(self.blacklist_domains)))
+        self._profiles = {}
+        self._max_profiles = 256
     
-    def calculate_relevance(self, topic, item):
+    def _topic_profile(self, topic):
         """
-        Returns a Score (0-100). Returns -1 if blacklisted.
+        Parses a topic once and compiles a single matcher over every keyword
+        set that applies to it (core, generic, christian, spam).
+        """
+        profile = self._profiles.get(topic)
+        if profile is not None:
+            return profile
+
+        raw_keywords = [w.lower() for w in topic.split() if w.lower() not in self.stop_words and len(w) > 2]
+        core_keywords = [k for k in raw_keywords if k not in self.generic_words]
+        generic_keywords = [k for k in raw_keywords if k in self.generic_words]
+        is_tech_topic = any(w in topic.lower() for w in self.tech_topic_words)
+
+        categories = {
+            'core': core_keywords,
+            'generic': generic_keywords,
+            'christian': self.christian_keywords,
+        }
+        if not is_tech_topic:
+            categories['spam'] = self.spam_terms
+
+        profile = {
+            'raw_keywords': raw_keywords,
+            'core_keywords': core_keywords,      # lists: repeated topic words count repeatedly
+            'generic_keywords': generic_keywords,
+            'matcher': KeywordMatcher(categories),
+            'scores': {},                        # (title, snippet, url) -> score
+        }
+        if len(self._profiles) >= self._max_profiles:
+            self._profiles.clear()
+        self._profiles[topic] = profile
+        return profile
+
+    def score_item(self, profile, item):
+        """
+        Scores one result against a compiled topic profile in a single scan.
+        Returns (score, per-category hit counts); score is -1 if blacklisted.
         """
         title = item.get('title', '').lower()
         snippet = item.get('snippet', '').lower()
         url = item.get('url', '').lower()
-        
+
         # A. Hard Blacklists
-        if any(b in url for b in self.blacklist_domains):
-            return -1
-        
-        full_text = f"{title} {snippet}"
-        
+        if self._blacklist_pattern.search(url):
+            return -1, {}
+
         # B. Topic Parsing
-        raw_keywords = [w.lower() for w in topic.split() if w.lower() not in self.stop_words and len(w) > 2]
-        if not raw_keywords: return 50 # If topic is all stop words, strictness is low
-        
-        core_keywords = [k for k in raw_keywords if k not in self.generic_words]
-        
+        if not profile['raw_keywords']: return 50, {} # If topic is all stop words, strictness is low
+
+        full_text = f"{title} {snippet}"
+
+        # One pass over the text for every keyword set of this topic
+        matcher = profile['matcher']
+        found = matcher.find(full_text)
+
         # C. Scoring Engine
         score = 0
-        
+
         # C1. Core Keywords (High Value)
-        hits = 0
         missing_core_keywords = 0
-        
-        for k in core_keywords:
-            if k in title:
+        for k in profile['core_keywords']:
+            if k not in found:
+                missing_core_keywords += 1
+            elif k in title:
                 score += 40 # Title match is strong
-                hits += 1
             elif k in snippet:
                 score += 15 # Snippet match is okay
-                hits += 1
             else:
-                missing_core_keywords += 1
-        
+                missing_core_keywords += 1 # Only spans "title snippet"
+
         # STRONG FILTERING: Penalize missing core keywords
         # RELAXED: Reduced penalty from 20 to 5 to allow broader results
         score -= (missing_core_keywords * 5)
-                
+
         # C2. Generic Keywords (Context Value)
-        for k in [w for w in raw_keywords if w in self.generic_words]:
-            if k in full_text:
-                score += 10 # Boost generic matches slightly more
-        
-        # C3. Christian Keyword Bonus (NEW - Ensures Christian content is prioritized)
-        for keyword in self.christian_keywords:
-            if keyword in full_text:
-                score += 25  # Strong boost for Christian keywords
-                
+        score += 10 * sum(1 for k in profile['generic_keywords'] if k in found) # Boost generic matches slightly more
+
+        # C3. Christian Keyword Bonus (Ensures Christian content is prioritized)
+        counts = matcher.counts(found)
+        score += 25 * counts['christian']
+
         # D. Penalties (Contextual Pollution)
         # If topic does NOT contain tech words, penalize tech spam
-        is_tech_topic = any(w in topic.lower() for w in ['windows', 'microsoft', 'update', 'android', 'software', 'linux', 'code'])
-        if not is_tech_topic:
-            spam_terms = ['windows update', 'android', 'software download', 'crack', 'serial', 'hack']
-            if any(s in full_text for s in spam_terms):
-                score -= 100
-                
+        if counts.get('spam'):
+            score -= 100
+
         # E. Mandatory Core Presence (The "Gatekeeper")
-        # RELAXED: Removed strict failure. If no core words, we still return calculated score (which might be low but > 0)
-        # if core_keywords and hits == 0:
-        #    return 0 
-            
+        # RELAXED: No strict failure. If no core words, we still return calculated score (which might be low but > 0)
+        return score, counts
+
+    def _score(self, profile, item):
+        """Memoized score: the orchestrator scores the same result several times per search."""
+        key = (item.get('title', ''), item.get('snippet', ''), item.get('url', ''))
+        scores = profile['scores']
+        score = scores.get(key)
+        if score is None:
+            if len(scores) >= 5000:
+                scores.clear()
+            score = scores[key] = self.score_item(profile, item)[0]
         return score
 
+    def calculate_relevance(self, topic, item):
+        """
+        Returns a Score (0-100). Returns -1 if blacklisted.
+        """
+        return self._score(self._topic_profile(topic), item)
+
     def filter_batch(self, results, topic, min_score=25):
         """
         Filters a list of results based on threshold.
         """
+        profile = self._topic_profile(topic)
         kept = []
         for r in results:
-            score = self.calculate_relevance(topic, r)
+            score = self._score(profile, r)
             if score >= min_score:
                 r['_relevance_score'] = score
                 kept.append(r)
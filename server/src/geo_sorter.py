@@ -1,59 +1,158 @@
+import re
+import threading
+from urllib.parse import urlsplit
+
+# 1. Tier 1 Gazetteer: Tamil Nadu Specific
+TN_KEYWORDS = [
+    'tamil nadu', 'tamilnadu', 'chennai', 'madurai', 'coimbatore', 'salem',
+    'tiruchirappalli', 'trichy', 'tirunelveli', 'vellore', 'erode',
+    'thoothukudi', 'thanjavur', 'dindigul', 'kanyakumari', 'nagercoil',
+    'kanchipuram', 'cuddalore', 'tiruppur', 'sivakasi', 'karur', 'hosur',
+    'virudhunagar', 'theni', 'ramanathapuram', 'sivaganga'
+]
+
+# 2. Tier 2 Gazetteer: India Specific (excluding what's already caught by TN)
+INDIA_KEYWORDS = [
+    'india', 'indian', 'delhi', 'mumbai', 'bangalore', 'bengaluru',
+    'kerala', 'hyderabad', 'kolkata', 'rupee', 'inr',
+    'matterindia', 'christianity india', 'dalit', 'persecution india'
+]
+
+# Short or ambiguous names that must match as whole words ("inr" in "dinner",
+# "salem" in "jerusalem", "erode" in "eroded", "theni" in "athenian")
+STRICT_NAMES = {'inr', 'salem', 'erode', 'theni'}
+
+# Evidence weight of a gazetteer hit by where it was found
+FIELD_WEIGHTS = {'title': 1.0, 'snippet': 0.5, 'url': 0.7}
+INDIA_TLD_WEIGHT = 0.5
+FIELDS = ('title', 'snippet', 'url')
+
+
+def _gazetteer_names(tiers):
+    """Every tier's place names, longest first so "persecution india" wins over "india"."""
+    return sorted({kw for kws in tiers.values() for kw in kws}, key=len, reverse=True)
+
+
+def _compile_gazetteer(names, host=False):
+    """
+    One regex over all place names; group i+1 captures `names[i]`. Names
+    must start a word but may run on ("indians", "chennaiites"); the
+    STRICT_NAMES must end it too. For URL hosts (`host=True`) names match
+    anywhere, so compound domains like "timesofindia.indiatimes.com" count.
+    Multi-word names also match slugs like "tamil-nadu" in URLs.
+    """
+    parts = []
+    for name in names:
+        words = r'[\s\-_]*'.join(re.escape(w) for w in name.split())
+        if name in STRICT_NAMES:
+            parts.append(r'(?<![a-z0-9])(' + words + r')(?![a-z0-9])')
+        elif host:
+            parts.append('(' + words + ')')
+        else:
+            parts.append(r'(?<![a-z0-9])(' + words + r')[a-z0-9]*')
+    return re.compile('|'.join(parts))
+
+
 class GeoSorter:
     """
     Sorts search results into three priority tiers:
     1. Tamil Nadu (Local) - Cities, Districts, State
     2. India (National) - Country, Other States
     3. Global (Rest of World)
+
+    Each result is classified in one regex pass over title, snippet and url,
+    yielding a tier plus a confidence (0-1) from how much evidence was found.
+    Classifications are cached per item (id or url, plus title), shared by
+    every GeoSorter instance, so feed reads don't re-scan known items.
     """
-    
+
+    TIERS = ('Tamil Nadu', 'India', 'Global')
+
+    _tier_of = {kw: 'Tamil Nadu' for kw in TN_KEYWORDS}
+    _tier_of.update({kw: 'India' for kw in INDIA_KEYWORDS})
+    _names = _gazetteer_names({'Tamil Nadu': TN_KEYWORDS, 'India': INDIA_KEYWORDS})
+    _pattern = _compile_gazetteer(_names)
+    _host_pattern = _compile_gazetteer(_names, host=True)
+
+    _cache = {}
+    _cache_lock = threading.Lock()
+    _max_cache = 50000
+
     def __init__(self):
-        # 1. Tier 1 Keywords: Tamil Nadu Specific
-        self.tn_keywords = [
-            'tamil nadu', 'tamilnadu', 'chennai', 'madurai', 'coimbatore', 'salem', 
-            'tiruchirappalli', 'trichy', 'tirunelveli', 'vellore', 'erode', 
-            'thoothukudi', 'thanjavur', 'dindigul', 'kanyakumari', 'nagercoil', 
-            'kanchipuram', 'cuddalore', 'tiruppur', 'sivakasi', 'karur', 'hosur',
-            'virudhunagar', 'theni', 'ramanathapuram', 'sivaganga'
-        ]
-        
-        # 2. Tier 2 Keywords: India Specific (excluding what's already caught by TN)
-        self.india_keywords = [
-            'india', 'indian', 'delhi', 'mumbai', 'bangalore', 'bengaluru', 
-            'kerala', 'hyderabad', 'kolkata', 'rupee', 'inr',
-            'matterindia', 'christianity india', 'dalit', 'persecution india'
-        ]
+        self.tn_keywords = TN_KEYWORDS
+        self.india_keywords = INDIA_KEYWORDS
+
+    @staticmethod
+    def _cache_key(r):
+        return (r.get('id') or r.get('url', ''), r.get('title', ''))
+
+    def _matches(self, field, text):
+        """Gazetteer names found in one field (URL hosts are matched as substrings)."""
+        text = text.lower()
+        if field != 'url':
+            return (self._names[m.lastindex - 1] for m in self._pattern.finditer(text))
+        try:
+            parts = urlsplit(text)
+            host, rest = parts.netloc, parts.path + ' ' + parts.query
+        except ValueError:
+            host, rest = '', text
+        found = [self._names[m.lastindex - 1] for m in self._host_pattern.finditer(host)]
+        found.extend(self._names[m.lastindex - 1] for m in self._pattern.finditer(rest))
+        return found
+
+    def _scan(self, r):
+        """Single pass over the item's fields -> (tier, confidence)."""
+        evidence = {'Tamil Nadu': 0.0, 'India': 0.0}
+        seen = set()
+        for field in FIELDS:
+            text = r.get(field) or ''
+            if not text:
+                continue
+            for name in self._matches(field, text):
+                if (name, field) in seen:
+                    continue
+                seen.add((name, field))
+                evidence[self._tier_of[name]] += FIELD_WEIGHTS[field]
+
+        # Explicit '.in' top-level domain counts as national evidence
+        if '.in/' in (r.get('url') or '').lower():
+            evidence['India'] += INDIA_TLD_WEIGHT
+
+        for tier in ('Tamil Nadu', 'India'):
+            if evidence[tier] > 0:
+                # Saturating: one title hit ~0.5, a few corroborating hits -> ~1.0
+                return tier, round(1.0 - 0.5 ** evidence[tier], 2)
+        # Global is the fallback tier: there is no regional evidence to report
+        return 'Global', 0.0
+
+    def classify(self, r):
+        """Returns (tier, confidence) for a result, using the shared cache."""
+        key = self._cache_key(r)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        cached = self._scan(r)
+        with self._cache_lock:
+            if len(self._cache) >= self._max_cache:
+                self._cache.clear()
+            self._cache[key] = cached
+        return cached
 
     def sort_results(self, results):
         """
         Takes a list of search result dicts and returns a sorted list.
         Each result usually has: 'title', 'snippet', 'url'
         """
-        tier1_tn = []
-        tier2_india = []
-        tier3_global = []
-        
+        tiers = {tier: [] for tier in self.TIERS}
+
         for r in results:
-            # Create a "Searchable Context" string for easy matching
-            context = (r.get('title', '') + " " + r.get('snippet', '') + " " + r.get('url', '')).lower()
-            
-            # Check Tier 1: Tamil Nadu
-            if any(kw in context for kw in self.tn_keywords):
-                r['_geo_tier'] = 'Tamil Nadu'
-                tier1_tn.append(r)
-                continue
-            
-            # Check Tier 2: India
-            # Logic: Explicit 'india' keyword OR '.in' top-level domain
-            if '.in/' in r.get('url', '').lower() or any(kw in context for kw in self.india_keywords):
-                r['_geo_tier'] = 'India'
-                tier2_india.append(r)
-                continue
-                
-            # Check Tier 3: Global (Default)
-            r['_geo_tier'] = 'Global'
-            tier3_global.append(r)
-            
-        print(f"🌍 GeoSorter: Sorted {len(results)} results -> TN: {len(tier1_tn)}, India: {len(tier2_india)}, Global: {len(tier3_global)}")
-        
+            tier, confidence = self.classify(r)
+            r['_geo_tier'] = tier
+            r['_geo_confidence'] = confidence
+            tiers[tier].append(r)
+
+        print(f"🌍 GeoSorter: Sorted {len(results)} results -> TN: {len(tiers['Tamil Nadu'])}, India: {len(tiers['India'])}, Global: {len(tiers['Global'])}")
+
         # Merge priorities
-        return tier1_tn + tier2_india + tier3_global
\ No newline at end of file
+        return tiers['Tamil Nadu'] + tiers['India'] + tiers['Global']
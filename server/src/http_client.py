@@ -0,0 +1,248 @@
+"""
+Shared HTTP Client
+One pooled, keep-alive fetch layer for every scraper (agents, extractor,
+news feeder): per-host concurrency caps, gzip/br decoding, optional HTTP/2
+and an opt-in DNS cache. Connections to a publisher are reused across requests
+instead of paying TCP + TLS setup on every article fetch.
+"""
+import os
+import time
+import socket
+import threading
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Defaults (overridable via .env)
+POOL_HOSTS = int(os.getenv('HTTP_POOL_HOSTS', 64))
+POOL_PER_HOST = int(os.getenv('HTTP_POOL_PER_HOST', 16))
+PER_HOST_LIMIT = int(os.getenv('HTTP_PER_HOST_LIMIT', 6))
+DNS_CACHE = os.getenv('HTTP_DNS_CACHE', 'false').lower() == 'true'
+DNS_TTL = float(os.getenv('HTTP_DNS_TTL', 300))
+HOST_RATE = float(os.getenv('HTTP_HOST_RATE', 2.0))    # Politeness: sustained requests/sec per paced host
+HOST_BURST = float(os.getenv('HTTP_HOST_BURST', 4))
+HTTP2_ENABLED = os.getenv('HTTP2_ENABLED', 'false').lower() == 'true'
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+try:
+    import brotli  # noqa: F401 - urllib3 decodes 'br' only when brotli is installed
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    ACCEPT_ENCODING = 'gzip, deflate'
+
+
+# --- DNS Cache ---
+
+_dns_cache = {}
+_dns_lock = threading.Lock()
+_original_getaddrinfo = socket.getaddrinfo
+
+
+def _cached_getaddrinfo(*args, **kwargs):
+    key = (args, tuple(sorted(kwargs.items())))
+    now = time.monotonic()
+    entry = _dns_cache.get(key)
+    if entry and entry[0] > now:
+        return entry[1]
+    result = _original_getaddrinfo(*args, **kwargs)
+    with _dns_lock:
+        if len(_dns_cache) > 4096:
+            _dns_cache.clear()
+        _dns_cache[key] = (now + DNS_TTL, result)
+    return result
+
+
+def install_dns_cache(enabled=DNS_CACHE):
+    """
+    Opt-in (HTTP_DNS_CACHE=true), called explicitly at server startup, never
+    on import: it replaces socket.getaddrinfo for the whole process, so every
+    library's lookups are held for HTTP_DNS_TTL regardless of the record's
+    own TTL. Idempotent; failed lookups are not cached.
+    """
+    if enabled and DNS_TTL > 0 and socket.getaddrinfo is not _cached_getaddrinfo:
+        socket.getaddrinfo = _cached_getaddrinfo
+        print(f"🌐 HttpClient: Process-wide DNS cache enabled (TTL {DNS_TTL:.0f}s).")
+
+
+# --- Per-host Pacing ---
+
+class TokenBucket:
+    """
+    Classic token bucket: `rate` tokens/sec, holding at most `burst`.
+    `acquire()` blocks until a token is available, so concurrent workers
+    share one request budget instead of each sleeping a fixed interval.
+    """
+
+    def __init__(self, rate, burst):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens=1.0):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+# --- HTTP/2 Response Adapter ---
+
+class _Http2Response:
+    """Exposes an httpx response through the subset of the requests API our callers use."""
+
+    def __init__(self, resp):
+        self._resp = resp
+        self.status_code = resp.status_code
+        self.headers = resp.headers
+        self.url = str(resp.url)
+        self.history = list(resp.history)
+        self.encoding = resp.encoding
+
+    @property
+    def content(self):
+        return self._resp.content
+
+    @property
+    def text(self):
+        return self._resp.text
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    def json(self, **kwargs):
+        return self._resp.json(**kwargs)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+    def close(self):
+        self._resp.close()
+
+
+class HttpClient:
+    """
+    Drop-in for the `requests` calls scattered across the scrapers:
+    `http_client.get(url, headers=..., timeout=...)` returns a requests-style
+    response and raises `requests.exceptions.*`, so existing error handling
+    keeps working whichever transport is used.
+
+    - Pooling/keep-alive: one Session with a sized HTTPAdapter.
+    - Retries: idempotent requests retry on connect errors and 502/503/504.
+    - Per-host caps: at most `per_host_limit` concurrent requests per host,
+      so a burst of article fetches can't hammer one publisher.
+    - HTTP/2: opt-in (HTTP2_ENABLED=true) when httpx[http2] is installed.
+    - Pacing: `pace(host)` draws from a per-host token bucket, for callers
+      (e.g. scrapetube) that hit a host through their own transport.
+    """
+
+    def __init__(self, pool_hosts=POOL_HOSTS, pool_per_host=POOL_PER_HOST, per_host_limit=PER_HOST_LIMIT, http2=HTTP2_ENABLED):
+        self.per_host_limit = per_host_limit
+        self._host_slots = {}
+        self._buckets = {}
+        self._slots_lock = threading.Lock()
+
+        retry = Retry(total=2, connect=2, read=1, backoff_factor=0.3,
+                      status_forcelist=(502, 503, 504), allowed_methods=frozenset({'GET', 'HEAD'}),
+                      raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=pool_hosts, pool_maxsize=pool_per_host, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update(self.default_headers())
+
+        self._h2 = None
+        if http2:
+            try:
+                import httpx
+                self._httpx = httpx
+                self._h2 = httpx.Client(
+                    http2=True, headers=self.default_headers(), follow_redirects=True,
+                    limits=httpx.Limits(max_connections=pool_hosts * 4, max_keepalive_connections=pool_hosts)
+                )
+                print("✅ HttpClient: HTTP/2 enabled.")
+            except Exception as e:
+                print(f"⚠️ HttpClient: HTTP/2 unavailable ({e}). Using HTTP/1.1 keep-alive.")
+
+    @staticmethod
+    def default_headers():
+        return {
+            'User-Agent': DEFAULT_USER_AGENT,
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.5',
+            'Accept-Encoding': ACCEPT_ENCODING,
+        }
+
+    def _slot(self, url):
+        host = (urlparse(url).hostname or '').lower()
+        slot = self._host_slots.get(host)
+        if slot is None:
+            with self._slots_lock:
+                slot = self._host_slots.setdefault(host, threading.BoundedSemaphore(self.per_host_limit))
+        return slot
+
+    def pace(self, host, rate=HOST_RATE, burst=HOST_BURST):
+        """Block until `host` (a hostname or URL) has request budget left."""
+        host = (urlparse(host).hostname if '://' in host else host).lower()
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            with self._slots_lock:
+                bucket = self._buckets.setdefault(host, TokenBucket(rate, burst))
+        bucket.acquire()
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', 10)
+        with self._slot(url):
+            if self._h2 is not None and not kwargs.get('stream'):
+                return self._request_h2(method, url, **kwargs)
+            return self.session.request(method, url, **kwargs)
+
+    def _request_h2(self, method, url, **kwargs):
+        httpx = self._httpx
+        follow = kwargs.pop('allow_redirects', method != 'HEAD')
+        kwargs.pop('verify', None)
+        try:
+            resp = self._h2.request(method, url, follow_redirects=follow, **kwargs)
+            # Body is read here so the per-host slot covers the whole transfer
+            resp.read()
+            return _Http2Response(resp)
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(str(e))
+        except httpx.ConnectError as e:
+            raise requests.exceptions.ConnectionError(str(e))
+        except httpx.HTTPError as e:
+            raise requests.exceptions.RequestException(str(e))
+
+    def get(self, url, **kwargs):
+        kwargs.setdefault('allow_redirects', True)
+        return self.request('GET', url, **kwargs)
+
+    def head(self, url, **kwargs):
+        kwargs.setdefault('allow_redirects', False)
+        return self.request('HEAD', url, **kwargs)
+
+    def fetch_text(self, url, timeout=10, **kwargs):
+        """GET and return the decoded body, or None on any error / non-200."""
+        try:
+            resp = self.get(url, timeout=timeout, **kwargs)
+            if resp.status_code == 200:
+                return resp.text
+        except requests.exceptions.RequestException:
+            pass
+        return None
+
+
+# Shared client (one connection pool for the whole process)
+http_client = HttpClient()
@@ -0,0 +1,86 @@
+"""
+Keyword Matcher
+Multi-pattern substring matcher over named keyword sets. Texts are split
+into tokens once; each distinct token is resolved against every keyword
+set a single time and memoized, so repeated vocabulary costs a set lookup.
+"""
+import threading
+
+
+class KeywordMatcher:
+    """
+    Matches named keyword categories against text in a single pass.
+
+    `categories` maps a category name to an iterable of (lowercase) keywords.
+    A keyword may belong to several categories. Semantics are plain substring
+    containment (`kw in text`), identical to the per-keyword scans it replaces:
+
+    - A keyword without whitespace can only occur inside one whitespace
+      separated token, so it is found by checking the tokens, and each
+      distinct token is checked once per matcher (memoized).
+    - Multi-word keywords ('holy spirit') are few and fall back to direct
+      containment.
+    """
+
+    def __init__(self, categories, memo_size=50000):
+        self.categories = {name: frozenset(k for k in kws if k) for name, kws in categories.items()}
+        self.memo_size = memo_size
+
+        keywords = set().union(*self.categories.values())
+        self._word_keywords = [k for k in keywords if len(k.split()) == 1 and k == k.strip()]
+        self._phrase_keywords = [k for k in keywords if k not in self._word_keywords]
+
+        # (every token already resolved, token -> keywords it contains (only tokens with hits)).
+        # Shared by request threads: grown under the lock, replaced wholesale (never
+        # cleared) once full, so a reader's snapshot always stays consistent.
+        self._memo = (set(), {})
+        self._memo_lock = threading.Lock()
+
+    def _resolve(self, tokens):
+        """Keywords contained in not-yet-seen tokens, recorded in the memo."""
+        fresh = {}
+        for token in tokens:
+            hits = tuple(k for k in self._word_keywords if k in token)
+            if hits:
+                fresh[token] = hits
+        with self._memo_lock:
+            seen, token_hits = self._memo
+            if len(seen) > self.memo_size:
+                seen, token_hits = set(), {}
+            # Hits before seen: a token visible in `seen` always has its hits recorded
+            token_hits.update(fresh)
+            seen.update(tokens)
+            self._memo = (seen, token_hits)
+        return fresh
+
+    def find(self, text):
+        """Set of keywords contained in `text`."""
+        if not text:
+            return set()
+
+        found = set()
+        if self._word_keywords:
+            tokens = set(text.split())
+            seen, token_hits = self._memo
+            unseen = tokens - seen
+            if unseen:
+                found.update(*self._resolve(unseen).values())
+                tokens -= unseen
+            found.update(*[token_hits.get(t, ()) for t in tokens.intersection(token_hits)])
+
+        for kw in self._phrase_keywords:
+            if kw in text:
+                found.add(kw)
+        return found
+
+    def counts(self, found):
+        """Per-category number of distinct keywords in a `find()` result."""
+        return {name: len(kws.intersection(found)) for name, kws in self.categories.items()}
+
+    def find_batch(self, texts):
+        """`find()` over many texts, with per-category hit counts for each."""
+        return [(found, self.counts(found)) for found in map(self.find, texts)]
+
+    def contains_any(self, text):
+        """True if any keyword occurs in `text`."""
+        return bool(self.find(text))
@@ -1,16 +1,26 @@
 import os
 import json
 import re
+import time
 from datetime import datetime
 from openai import OpenAI
 from .utils import retry_with_backoff
 
+# RAG context for analytics: recent text sources only (video descriptions carry little trend data)
+RAG_LOOKBACK_DAYS = float(os.getenv('ANALYTICS_RAG_DAYS', 56))
+RAG_EXCLUDE_TYPES = ('video', 'video_search')
+
 class LLMAnalytics:
     def __init__(self, rag_engine, discovery_engine=None):
         self.rag_engine = rag_engine
         self.discovery_engine = discovery_engine
         self.api_key = os.getenv("OPENAI_API_KEY")
         self.client = OpenAI(api_key=self.api_key)
+
+    @staticmethod
+    def rag_filters():
+        """RAGEngine.search filters for analytics context (bounds the partitions queried)."""
+        return {'exclude_types': RAG_EXCLUDE_TYPES, 'since': time.time() - RAG_LOOKBACK_DAYS * 86400}
         
     def _invoke_llm(self, prompt, model="gpt-4-turbo-preview"):
         """Direct OpenAI call with fallback logic"""
@@ -37,11 +47,12 @@ class LLMAnalytics:
         if direct_context:
             context_text = direct_context
             print(f"🧠 Analytics: Using DIRECT web context ({len(context_text)} chars).")
-        elif context_docs:
+        elif context_docs and not isinstance(context_docs[0], dict):
             context_text = "\n\n".join([d.page_content if hasattr(d, 'page_content') else str(d) for d in context_docs])
         else:
-            # Fallback to internal RAG
-            context_docs = self.rag_engine.search(query, k=10)
+            # Fallback to internal RAG (unless the caller already searched it)
+            if not context_docs:
+                context_docs = self.rag_engine.search(query, k=10, **self.rag_filters())
             
             # Live Search Fallback
             if (not context_docs or len(context_docs) < 2) and self.discovery_engine:
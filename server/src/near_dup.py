@@ -0,0 +1,228 @@
+"""
+Near-Duplicate Detection
+MinHash signatures + LSH banding over title/snippet shingles. Finds
+syndicated copies of the same story (slightly different titles, different
+URLs) in near-linear time instead of comparing every pair. Texts whose
+numbers disagree ("... Day 12" / "... Day 13", "Part 1" / "Part 2") are
+distinct episodes, never duplicates, however similar the rest is.
+"""
+import re
+import zlib
+
+import numpy as np
+
+# Hashes are stable across processes (crc32, fixed seed) so signatures and
+# band keys can be persisted (see VideoEngine's fuzzy-title index).
+_SHIFT = np.uint64(32)
+_WORD = re.compile(r"\w+")
+_NOISE = frozenset({'the', 'a', 'an', 'of', 'in', 'on', 'to', 'and', 'for', 'at', 'by', 'with', 'is', 'are'})
+
+
+def normalize_text(text):
+    """Lowercase word tokens with punctuation, emoji and filler words removed."""
+    return [t for t in _WORD.findall((text or '').lower()) if t not in _NOISE]
+
+
+def numbers(text):
+    """Number tokens of a text ('12', '2024', '3rd'), used to tell episodes apart."""
+    return frozenset(t for t in normalize_text(text) if any(c.isdigit() for c in t))
+
+
+def numbers_conflict(a, b):
+    """Both texts carry numbers and neither set contains the other (a copy may add a date, not change one)."""
+    return bool(a and b and not (a <= b or b <= a))
+
+
+def shingles(text):
+    """Word unigrams + bigrams: tolerant of reordered/added words in short texts."""
+    tokens = normalize_text(text)
+    grams = set(tokens)
+    grams.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+    return grams
+
+
+def char_shingles(text, k=3):
+    """Character k-grams: for short, already-normalized strings (e.g. video titles)."""
+    if not text:
+        return set()
+    if len(text) <= k:
+        return {text}
+    return {text[i:i + k] for i in range(len(text) - k + 1)}
+
+
+class MinHasher:
+    """
+    `num_perm` universal hash permutations, grouped into `bands` LSH bands.
+    With 64 perms / 32 bands (2 rows each) a pair at 0.5 Jaccard becomes a
+    candidate with >99.9% probability; candidates are then verified on the
+    full signature, so the bands only decide what gets compared.
+    """
+
+    def __init__(self, num_perm=64, bands=32, seed=7, shingler=shingles):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.shingler = shingler
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = np.random.RandomState(seed)
+        # Multiply-shift hash family: h(x) = (a*x + b) mod 2^64 >> 32, a odd
+        self._a = self._random_u64(rng, num_perm) | np.uint64(1)
+        self._b = self._random_u64(rng, num_perm)
+        # Odd multipliers to fold a band's rows into one 63-bit key
+        self._mix = self._random_u64(rng, self.rows) | np.uint64(1)
+
+    @staticmethod
+    def _random_u64(rng, size):
+        hi = rng.randint(0, 1 << 32, size=size, dtype=np.uint64)
+        lo = rng.randint(0, 1 << 32, size=size, dtype=np.uint64)
+        return (hi << _SHIFT) | lo
+
+    def signatures(self, texts):
+        """
+        MinHash signatures for many texts in one vectorized pass.
+        Returns (uint32 array of shape (n, num_perm), bool mask of non-empty texts).
+        Empty texts get an all-max signature and must be ignored via the mask.
+        """
+        gram_hashes = []
+        counts = np.zeros(len(texts), dtype=np.int64)
+        for i, text in enumerate(texts):
+            grams = self.shingler(text)
+            counts[i] = len(grams)
+            gram_hashes.extend(zlib.crc32(g.encode('utf-8')) for g in grams)
+
+        sigs = np.full((len(texts), self.num_perm), 0xFFFFFFFF, dtype=np.uint32)
+        valid = counts > 0
+        if not gram_hashes:
+            return sigs, valid
+
+        hashed = np.asarray(gram_hashes, dtype=np.uint64)
+        with np.errstate(over='ignore'):
+            perms = ((hashed[:, None] * self._a[None, :] + self._b[None, :]) >> _SHIFT).astype(np.uint32)
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        sigs[valid] = np.minimum.reduceat(perms, starts[valid], axis=0)
+        return sigs, valid
+
+    def signature(self, text):
+        """MinHash signature of one text, None for empty text."""
+        sigs, valid = self.signatures([text])
+        return sigs[0] if valid[0] else None
+
+    def band_keys(self, sigs):
+        """
+        Band keys for a (n, num_perm) or (num_perm,) signature array:
+        int64 array of shape (n, bands) / (bands,), stable across processes.
+        """
+        rows = sigs.astype(np.uint64).reshape(sigs.shape[:-1] + (self.bands, self.rows))
+        with np.errstate(over='ignore'):
+            folded = (rows * self._mix).sum(axis=-1)
+        return (folded >> np.uint64(1)).astype(np.int64)
+
+    @staticmethod
+    def similarity(sig_a, sig_b):
+        """Estimated Jaccard similarity of two signatures (or one vs many rows)."""
+        return np.mean(sig_a == sig_b, axis=-1)
+
+
+# Shared hasher (fixed parameters: signatures stay comparable everywhere)
+minhasher = MinHasher()
+
+
+class NearDuplicateIndex:
+    """
+    In-memory LSH index. `check_and_add(key, text)` returns the key of an
+    already-indexed near-duplicate, or None after indexing the new text.
+    Insert order decides the cluster representative: index best-first.
+    """
+
+    def __init__(self, threshold=0.6, hasher=None):
+        self.threshold = threshold
+        self.hasher = hasher or minhasher
+        self._buckets = [{} for _ in range(self.hasher.bands)]   # per band: key -> [item keys]
+        self._sigs = {}                                          # item key -> signature
+        self._numbers = {}                                       # item key -> number tokens
+
+    def find(self, sig, bands, nums=frozenset()):
+        """Key of an indexed item whose signature is within the threshold (and numbers agree), else None."""
+        candidates = []
+        seen = set()
+        for band, bucket in zip(bands, self._buckets):
+            for other in bucket.get(band, ()):
+                if other not in seen:
+                    seen.add(other)
+                    if not numbers_conflict(nums, self._numbers[other]):
+                        candidates.append(other)
+        if not candidates:
+            return None
+        sims = self.hasher.similarity(sig, np.stack([self._sigs[c] for c in candidates]))
+        best = int(np.argmax(sims))
+        return candidates[best] if sims[best] >= self.threshold else None
+
+    def add(self, key, sig, bands, nums=frozenset()):
+        self._sigs[key] = sig
+        self._numbers[key] = nums
+        for band, bucket in zip(bands, self._buckets):
+            bucket.setdefault(band, []).append(key)
+
+    def check_and_add(self, key, text):
+        sig = self.hasher.signature(text)
+        if sig is None:
+            return None  # Nothing to compare on (empty text): never a duplicate
+        bands = self.hasher.band_keys(sig).tolist()
+        nums = numbers(text)
+        dup_of = self.find(sig, bands, nums)
+        if dup_of is None:
+            self.add(key, sig, bands, nums)
+        return dup_of
+
+
+def _default_text(item):
+    return f"{item.get('title', '')} {item.get('snippet', '')}"
+
+
+def near_deduplicate(items, text_of=_default_text, rank_of=None, threshold=0.6):
+    """
+    Collapses near-duplicate items (e.g. syndicated copies of one story).
+
+    Items are assumed best-first unless `rank_of(item)` is given (higher is
+    better); each cluster keeps its best-ranked representative, which gets
+    `_near_dups` = number of copies it absorbed. Survivors keep input order.
+    """
+    if len(items) < 2:
+        return list(items)
+
+    order = range(len(items))
+    if rank_of is not None:
+        order = sorted(order, key=lambda i: rank_of(items[i]), reverse=True)
+
+    hasher = minhasher
+    texts = [text_of(item) for item in items]
+    sigs, valid = hasher.signatures(texts)
+    all_bands = hasher.band_keys(sigs).tolist()
+
+    index = NearDuplicateIndex(threshold=threshold, hasher=hasher)
+    absorbed = {}
+    for i in order:
+        if not valid[i]:
+            continue
+        nums = numbers(texts[i])
+        dup_of = index.find(sigs[i], all_bands[i], nums)
+        if dup_of is None:
+            index.add(i, sigs[i], all_bands[i], nums)
+        else:
+            absorbed[dup_of] = absorbed.get(dup_of, 0) + 1
+            absorbed[i] = None
+
+    kept = []
+    for i, item in enumerate(items):
+        count = absorbed.get(i, 0)
+        if count is None:
+            continue
+        if count:
+            item['_near_dups'] = count
+        kept.append(item)
+
+    dropped = len(items) - len(kept)
+    if dropped:
+        print(f"🧬 NearDup: Collapsed {dropped} near-duplicates out of {len(items)} items.")
+    return kept
@@ -1,11 +1,7 @@
 import feedparser
 import time
-import random
 import re
-import requests
 import hashlib
-import trafilatura
-import sqlite3
 import os
 import threading
 from datetime import datetime
@@ -14,19 +10,41 @@ from ddgs import DDGS # [NEW] Hybrid Engine for Images
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import urllib.parse
 from src.geo_sorter import GeoSorter
+from src.near_dup import near_deduplicate
+from src.pipeline import StagedPipeline, Stage
+from src.http_client import http_client
+from src.page_meta import page_meta
+from src.url_resolver import url_resolver
+from src.feed_poller import feed_poller, entry_key
+from src.feed_snapshots import feed_snapshots
+from src.db import get_database, fts_index, fts_match, contains_any
 from src.topic_manager import topic_manager
 from src.resource_definitions import RSS_FEEDS
 from src.ddg_client import DDGClient # [FALLBACK]
-from newspaper import Article # [NEW] Deep Extraction Engine
 
 # Database Configuration
-DB_FILE = os.path.join(os.path.dirname(__file__), '..', 'news.db')
+DB_FILE = os.getenv('NEWS_DB_FILE', os.path.join(os.path.dirname(__file__), '..', 'news.db'))
+
+# Fetch pipeline pool sizes (overridable via .env)
+PARSE_WORKERS = int(os.getenv('NEWS_PARSE_WORKERS', 10))
+RESOLVE_WORKERS = int(os.getenv('NEWS_RESOLVE_WORKERS', 8))
+IMAGE_WORKERS = int(os.getenv('NEWS_IMAGE_WORKERS', 8))
+FALLBACK_WORKERS = int(os.getenv('NEWS_FALLBACK_WORKERS', 2))
+
+# Library-first search: enough fresh stored matches and Google News isn't queried (overridable via .env)
+LIBRARY_MIN_RESULTS = int(os.getenv('NEWS_LIBRARY_MIN_RESULTS', 10))
+LIBRARY_MAX_AGE = float(os.getenv('NEWS_LIBRARY_MAX_AGE', 2 * 86400))
 
 class NewsFeeder:
     """
     Fetches live news from Christian RSS feeds, caches in SQLite, and supports Moderation.
     Integrated with ThreadPoolExecutor for high-performance scraping.
+    Fetch cycles run as a staged pipeline (see src/pipeline.py).
     """
+
+    # Entries from "Christianity" feeds must mention at least one of these
+    CHRISTIAN_KEYWORDS = ['church', 'christian', 'christ', 'jesus', 'mohan', 'bishop', 'pastor', 'ministry', 'diocese', 'vatican', 'catholic', 'protestant', 'CSI', 'gospel', 'prayer', 'worship', 'faith', 'bible', 'religious', 'persecution', 'redeems', 'lazarus', 'jrm']
+
     def _format_relative_time(self, timestamp):
         diff = time.time() - timestamp
         if diff < 60: return "Just now"
@@ -58,6 +76,7 @@ class NewsFeeder:
         ]
 
         self.sorter = GeoSorter()
+        self.db = get_database(DB_FILE)
         self._init_db()
         self.cleanup_stale_news() # [FIX] Clean on startup
         self.clear_bad_images_from_db() # [FIX] Purge logos on startup
@@ -158,8 +177,8 @@ class NewsFeeder:
 
         self.last_fetch = 0
         self.fetch_interval = 60 # 1 minute
-        self.session = requests.Session()
-        self.session.headers.update({'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'})
+        # Shared pooled client (keep-alive, per-host caps)
+        self.session = http_client
 
     def _is_bad_image(self, url):
         if not url: return True
@@ -169,41 +188,18 @@ class NewsFeeder:
     def clear_bad_images_from_db(self):
         """Hard purge of all generic logos from DB."""
         try:
-            conn = self._get_connection()
-            c = conn.cursor()
             pattern_query = " OR ".join([f"image LIKE '%{p}%'" for p in self.BAD_IMAGE_PATTERNS])
-            c.execute(f"UPDATE news SET image = NULL WHERE {pattern_query}")
-            count = c.rowcount
-            conn.commit()
-            conn.close()
+            count = self.db.execute(f"UPDATE news SET image = NULL WHERE {pattern_query}")
             if count > 0: print(f"🧹 [NewsFeeder] Purged {count} bad images from Database.")
         except Exception as e:
             print(f"⚠️ [NewsFeeder] DB Purge failed: {e}")
 
 
-    def _get_connection(self):
-        """Get DB connection with robust retry logic for locking."""
-        retries = 10
-        for i in range(retries):
-            try:
-                # Increased timeout to 60s and check_same_thread=False for safety
-                conn = sqlite3.connect(DB_FILE, timeout=60.0, check_same_thread=False)
-                conn.execute('PRAGMA journal_mode=WAL;')
-                return conn
-            except sqlite3.OperationalError as e:
-                if "locked" in str(e):
-                    if i < retries - 1:
-                        time.sleep(random.uniform(0.5, 2.0)) # Random jitter
-                        continue
-                raise
-        raise sqlite3.OperationalError(f"Database locked after {retries} retries")
-
     def _init_db(self):
-        """Initialize SQLite Database."""
+        """Initialize SQLite Database (append-only migration steps)."""
         try:
-            conn = self._get_connection()
-            c = conn.cursor()
-            c.execute('''
+            self.db.migrate('news', [
+                '''
                 CREATE TABLE IF NOT EXISTS news (
                     id TEXT PRIMARY KEY,
                     title TEXT,
@@ -216,11 +212,22 @@ class NewsFeeder:
                     snippet TEXT,
                     is_approved INTEGER DEFAULT 1
                 )
-            ''')
-            conn.commit()
-            conn.close()
+                ''',
+                # Bulk "already stored?" checks before enrichment look up by guid
+                "CREATE INDEX IF NOT EXISTS idx_news_guid ON news(guid)",
+                # Feed query (is_approved = 1 ORDER BY timestamp DESC LIMIT n) walks this index in order
+                "CREATE INDEX IF NOT EXISTS idx_news_approved_ts ON news(is_approved, timestamp DESC)",
+                # Admin listing / stale cleanup
+                "CREATE INDEX IF NOT EXISTS idx_news_ts ON news(timestamp)",
+                # Keyword filters (topic feeds, library search, admin search) via FTS5 + BM25
+                fts_index('news', ['title', 'snippet', 'source']),
+                # Topic keyword filters keep substring semantics ("news" in "CBSNews") via trigrams
+                fts_index('news', ['title', 'snippet', 'source'], tokenize='trigram', name='news_kw'),
+            ])
         except Exception as e:
             print(f"❌ [NewsFeeder] DB Init Error: {e}")
+        self.fts = self.db.has_table('news_fts')
+        self.kw_index = self.db.has_table('news_kw')
 
     def start_background_worker(self):
         """Starts the background fetch thread."""
@@ -228,19 +235,17 @@ class NewsFeeder:
         print("🚀 [NewsFeeder] Background Worker Started.")
 
     def update_news(self):
-        """Force manual update (Public API)."""
-        self._fetch_and_store()
+        """Force manual update (Public API): polls every feed, due or not."""
+        self._fetch_and_store(force=True)
         
     def cleanup_stale_news(self):
         """Delete old news to keep feed fresh (3 days retention), PRESERVING JRM."""
         try:
-            conn = self._get_connection()
-            c = conn.cursor()
             # Keep JRM forever-ish, delete others older than 3 days
             cutoff = time.time() - (3 * 24 * 3600)
-            c.execute("DELETE FROM news WHERE timestamp < ? AND title NOT LIKE '%Jesus Redeems%' AND title NOT LIKE '%Mohan%'", (cutoff,))
-            conn.commit()
-            conn.close()
+            if self.db.execute("DELETE FROM news WHERE timestamp < ? AND title NOT LIKE '%Jesus Redeems%' AND title NOT LIKE '%Mohan%'", (cutoff,)):
+                feed_snapshots.invalidate('news')
+            url_resolver.prune()
             print("🧹 [NewsFeeder] Stale news cleaned.")
         except Exception as e:
             print(f"⚠️ [NewsFeeder] Cleanup failed: {e}")
@@ -316,75 +321,28 @@ class NewsFeeder:
         return None
 
     def _fetch_og_image(self, url):
-        """Aggressively fetch image using Trafilatura, Newspaper3k, and BeautifulSoup."""
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36'}
-        try:
-            # 1. Newspaper3k (Built-in image logic is very smart)
-            try:
-                article = Article(url)
-                article.download()
-                article.parse()
-                if article.top_image:
-                    if not self._is_bad_image(article.top_image):
-                        return article.top_image
-            except: pass
-
-            # 2. Trafilatura for deep metadata
-            downloaded = trafilatura.fetch_url(url)
-            if downloaded:
-                metadata = trafilatura.extract_metadata(downloaded)
-                if metadata and metadata.image:
-                    if not self._is_bad_image(metadata.image):
-                        return metadata.image
-
-            # 3. BeautifulSoup Fallback for various meta tags
-            resp = self.session.get(url, headers=headers, timeout=10)
-            if resp.status_code == 200:
-                soup = BeautifulSoup(resp.content, 'html.parser')
-                # Try common tags
-                for attr in ["property", "name"]:
-                    for val in ["og:image", "twitter:image", "thumbnail", "image", "sailthru.image", "sailthru.image.full"]:
-                        tag = soup.find("meta", {attr: val})
-                        if tag and tag.get("content"): 
-                            src = tag["content"]
-                            if not self._is_bad_image(src):
-                                return src
-                
-                # Check for link rel="image_src"
-                link_tag = soup.find("link", rel="image_src")
-                if link_tag and link_tag.get("href"):
-                    if not self._is_bad_image(link_tag["href"]):
-                        return link_tag["href"]
-                
-                # Try finding the first large-ish image in the body
-                first_img = soup.find("img", {"src": True})
-                if first_img:
-                    src = first_img["src"]
-                    if not self._is_bad_image(src):
-                        return urllib.parse.urljoin(url, src)
-        except Exception as e:
-            # print(f"⚠️ [ImageFetch] Error for {url}: {e}")
-            pass
+        """First usable image declared by the page (og/twitter/meta tags, image_src, first <img>)."""
+        # One download + one lxml parse, shared with search enrichment and reader mode
+        page = page_meta.fetch(url, timeout=10)
+        if page is None:
+            return None
+        for src in page.images:
+            if not self._is_bad_image(src):
+                return src
         return None
 
     def get_news(self, limit=50):
         """Fetch news from DB with JRM prioritization and Geo-Sorting."""
         try:
-            conn = self._get_connection()
-            conn.row_factory = sqlite3.Row
-            c = conn.cursor()
-            c.execute("SELECT * FROM news WHERE is_approved = 1 ORDER BY timestamp DESC LIMIT ?", (limit * 2,))
-            rows = c.fetchall()
-            conn.close()
+            rows = self.db.query("SELECT * FROM news WHERE is_approved = 1 ORDER BY timestamp DESC LIMIT ?", (limit * 2,))
         except Exception as e:
             print(f"⚠️ [NewsFeeder] get_news error: {e}")
             rows = []
-        finally:
-            try: conn.close()
-            except: pass
         
-        all_news = [dict(row) for row in rows]
+        return self._feed_order([dict(row) for row in rows], limit)
 
+    def _feed_order(self, all_news, limit):
+        """Feed presentation: relative times, fallback images, JRM first, near-dup collapse, geo-sort."""
         # Enhance with clean relative time and remove placeholders
         for item in all_news:
             if item.get('timestamp'):
@@ -405,46 +363,53 @@ class NewsFeeder:
             return 1
             
         all_news.sort(key=lambda x: (get_priority_score(x), x.get('timestamp', 0)), reverse=True)
+        # Collapse syndicated copies (sorted best-first, so the priority/newest copy survives)
+        all_news = near_deduplicate(all_news)
         return self.sorter.sort_results(all_news)[:limit]
 
+    def search_library(self, match, limit=20, order='rank', approved_only=True, since=None, keywords=None):
+        """
+        [library] Stored articles matching an FTS5 expression (see db.fts_match)
+        and/or containing any of `keywords` as a substring (title, snippet or source).
+        order='rank': BM25, title weighted over snippet and source. order='recent': the feed
+        presentation of the newest matches (same ordering as get_news).
+        """
+        if (match and not self.fts) or not (match or keywords):
+            return []
+        where, params = [], []
+        if match:
+            where.append("news_fts MATCH ?")
+            params.append(match)
+        if keywords:
+            sql, like_params = contains_any(['n.title', 'n.snippet', 'n.source'], keywords,
+                                            'news_kw' if self.kw_index else None, 'n.rowid')
+            where.append(sql)
+            params.extend(like_params)
+        if approved_only:
+            where.append("n.is_approved = 1")
+        if since:
+            where.append("n.timestamp >= ?")
+            params.append(since)
+        order_by = "bm25(news_fts, 10.0, 2.0, 1.0)" if order == 'rank' and match else "n.timestamp DESC"
+        source = "news_fts JOIN news n ON n.rowid = news_fts.rowid" if match else "news n"
+        try:
+            rows = self.db.query(f'''
+                SELECT n.* FROM {source}
+                WHERE {' AND '.join(where)} ORDER BY {order_by} LIMIT ?
+            ''', params + [limit * 2 if order == 'recent' else limit])
+        except Exception as e:
+            print(f"⚠️ [NewsFeeder] Library search failed: {e}")
+            return []
+        items = [dict(row) for row in rows]
+        return self._feed_order(items, limit) if order == 'recent' else items
+
     def _resolve_url(self, url):
         """
         Resolve Google News redirect URLs to the actual publisher's URL.
         This allows us to scrape the REAL metadata (OG Image) from the source.
+        Answers are persisted (resolved_urls table), so each link is fetched once.
         """
-        if "news.google.com" not in url and "google.com/rss" not in url:
-            return url
-            
-        # 1. Follow HTTP Redirects with Browser Headers
-        try:
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-                "Referer": "https://news.google.com/"
-            }
-            resp = self.session.get(url, headers=headers, timeout=10, allow_redirects=True)
-            
-            if resp.history:
-                final_url = resp.url
-                if "google.com" not in final_url and "googleusercontent.com" not in final_url:
-                    return final_url
-            
-            if "google.com" not in resp.url and "googleusercontent.com" not in resp.url:
-                return resp.url
-
-            soup = BeautifulSoup(resp.content, 'html.parser')
-            for link in soup.find_all('a', href=True):
-                href = link['href']
-                if href.startswith('http') and 'google.com' not in href and 'googleusercontent.com' not in href:
-                    return href
-            
-            match = re.search(r'window\.location\.replace\("([^"]+)"\)', resp.text)
-            if match: return match.group(1)
-
-        except Exception as e:
-            pass
-            
-        return url
+        return url_resolver.resolve(url)
 
     def get_news_by_language(self, lang, limit=50, topic_query=None):
         """Unified Master Feed search mixed across languages."""
@@ -456,7 +421,7 @@ class NewsFeeder:
         
         all_results = []
         with ThreadPoolExecutor(max_workers=3) as executor:
-            future_to_search = {executor.submit(self.search, s['q'], limit=15, lang=s['lang']): s for s in searches}
+            future_to_search = {executor.submit(self._search_feed_lang, s['q'], s['lang']): s for s in searches}
             for future in as_completed(future_to_search):
                 try: all_results.extend(future.result())
                 except: pass
@@ -500,9 +465,23 @@ class NewsFeeder:
             return 1
             
         unique_results.sort(key=lambda x: (get_priority_score(x), x.get('timestamp', 0)), reverse=True)
+        # Same story from the en/ta/hi feeds or different outlets -> keep the best copy
+        unique_results = near_deduplicate(unique_results)
         return self.sorter.sort_results(unique_results)[:limit]
 
 
+    def _search_feed_lang(self, query, lang, limit=15):
+        """
+        One language of the master feed. English is served library-first, so it
+        follows DB writes; ta/hi are live Google News searches that a library
+        write can't change, so snapshot rebuilds reuse them until the news TTL.
+        """
+        if lang == 'en':
+            return self.search(query, limit=limit, lang=lang)
+        from src.result_cache import search_cache
+        return search_cache.get_or_fetch(lambda: self.search(query, limit=limit, lang=lang),
+                                         query, 'news', region=lang, engine='GoogleNewsRSS', limit=limit)
+
     def search(self, query, limit=20, lang='en'):
         """Live search via Google News RSS."""
         hl, gl, ceid = ("en-IN", "IN", "IN:en")  # [FIX] Restore defaults
@@ -511,6 +490,10 @@ class NewsFeeder:
         
         # [STRICT TOPIC CONTROL]
         active_topics = topic_manager.get_active_keywords()
+        library_match = fts_match(query)
+        library_topics = None
+        if active_topics and not any(t.lower() in query.lower() for t in active_topics):
+            library_topics = active_topics
         if active_topics:
              topic_constraint = " AND (" + " OR ".join([f'"{t}"' for t in active_topics]) + ")"
              # Decode query just to check presence (it comes in plain text essentially but let's be safe)
@@ -518,6 +501,19 @@ class NewsFeeder:
                  query += topic_constraint
                  print(f"🔒 [NewsFeeder] Strict Topic applied: {query}")
 
+        # [LIBRARY FIRST] Fresh stored matches answer the query without a Google News round-trip.
+        # The library has no language column, so only English searches are served from it.
+        if lang == 'en':
+            local = self.search_library(library_match, limit=limit, since=time.time() - LIBRARY_MAX_AGE,
+                                        keywords=library_topics) if library_match else []
+            if len(local) >= min(limit, LIBRARY_MIN_RESULTS):
+                print(f"📚 [NewsFeeder] Library hit: {len(local)} stored articles for '{query}'")
+                for item in local:
+                    item['source_type'] = 'news'
+                    if self._is_bad_image(item.get('image')):
+                        item['image'] = None
+                return self.sorter.sort_results(near_deduplicate(local))
+
         import urllib.parse
         encoded = urllib.parse.quote(query)
             
@@ -526,13 +522,18 @@ class NewsFeeder:
         rss_url = f"https://news.google.com/rss/search?q={encoded}&hl={hl}&gl={gl}&ceid={ceid}"
         try:
             feed = feedparser.parse(rss_url)
+            entries = feed.entries[:limit]
+            # Resolve every redirect up front: known links come from the cache, new ones in parallel
+            resolved = url_resolver.resolve_many([entry.link for entry in entries])
+            # Articles already in the library keep their stored image: no page scrape / DDG lookup
+            ids = {e.link: hashlib.md5(resolved.get(e.link, e.link).encode()).hexdigest() for e in entries}
+            stored_images = self._stored_images(list(set(ids.values())))
             results = []
-            for entry in feed.entries[:limit]:
-                 # Resolve Redirect
-                 real_url = self._resolve_url(entry.link)
+            for entry in entries:
+                 real_url = resolved.get(entry.link, entry.link)
                  
                  # Prefer real images from RSS, then og:image, no generic placeholders
-                 img = self._extract_image(entry)
+                 img = self._extract_image(entry) or stored_images.get(ids[entry.link])
                  if not img:
                      img = self._fetch_og_image(real_url)
                  
@@ -549,7 +550,7 @@ class NewsFeeder:
                      snippet = BeautifulSoup(entry.summary, "html.parser").get_text(separator=" ", strip=True)[:180]
 
                  results.append({
-                     'id': hashlib.md5(real_url.encode()).hexdigest(),
+                     'id': ids[entry.link],
                      'title': entry.title,
                      'url': real_url,
                      'published': entry.published if 'published' in entry else (entry.updated if 'updated' in entry else ''),
@@ -559,44 +560,29 @@ class NewsFeeder:
                      'source_type': 'news' 
                  })
             # Deduplicate and geo-sort as usual
-            cleaned = self.sorter.sort_results(results)
+            cleaned = self.sorter.sort_results(near_deduplicate(results))
 
             # [NEW] Persist Search Results to DB (Live Scraping -> Library)
             if cleaned:
-                try:
-                    conn = sqlite3.connect(DB_FILE, timeout=30.0, check_same_thread=False)
-                    c = conn.cursor()
-                    count = 0
-                    for item in cleaned:
-                        try:
-                            c.execute('''
-                                INSERT OR IGNORE INTO news (id, title, url, published, source, image, snippet, timestamp, is_approved)
-                                VALUES (?, ?, ?, ?, ?, ?, ?, ?, 1)
-                            ''', (
-                                item['id'], 
-                                item['title'], 
-                                item['url'], 
-                                item.get('published', ''), 
-                                item.get('source', 'Search'), 
-                                item.get('image'), 
-                                item.get('snippet', ''), 
-                                time.time(),
-                                1 # Auto-approve search results
-                            ))
-                            if c.rowcount > 0: count += 1
-                        except: pass
-                    conn.commit()
-                    conn.close()
+                now = time.time()
+                rows = [(item['id'], item['title'], item['url'], item.get('published', ''), item.get('source', 'Search'),
+                         item.get('image'), item.get('snippet', ''), now) for item in cleaned]
+
+                def persist(conn):
+                    count = conn.executemany('''
+                        INSERT OR IGNORE INTO news (id, title, url, published, source, image, snippet, timestamp, is_approved)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, 1)
+                    ''', rows).rowcount  # Auto-approved (is_approved = 1); existing rows keep their moderation state
                     if count > 0: print(f"✅ [NewsFeeder] Saved {count} new items from search query '{query}'")
-                except Exception as e:
-                    print(f"⚠️ [NewsFeeder] Failed to persist search results: {e}")
+
+                # Queued on the writer thread; the search response doesn't wait for the commit
+                self.db.transaction(persist, wait=False)
 
             # Filter blocked images using pattern matching
             for item in cleaned:
                 if self._is_bad_image(item.get('image')):
                     item['image'] = None
             return cleaned
-            return cleaned
         except Exception as e:
             # [FALLBACK] If Google News RSS fails or returns nothing
             print(f"⚠️ [NewsFeeder] Primary search failed: {e}. Triggering DDG Fallback.")
@@ -610,8 +596,8 @@ class NewsFeeder:
                 print(f"❌ [NewsFeeder] Fallback also failed: {fe}")
             return []
 
-    def _fetch_and_store(self):
-        """Internal fetch cycle logic."""
+    def _fetch_and_store(self, force=False):
+        """Internal fetch cycle logic. Only feeds whose adaptive poll time has come are fetched."""
         active_topics = topic_manager.get_active_keywords()
         self.last_fetch = time.time()
         
@@ -631,98 +617,191 @@ class NewsFeeder:
             if not any(f[0] == url for f in all_target_feeds):
                 all_target_feeds.append((url, "Christianity"))
 
-        print(f"🔄 [NewsFeeder] Fetching {len(all_target_feeds)} feeds...")
-
-        raw_items = []
-        with ThreadPoolExecutor(max_workers=10) as executor:
-            future_to_meta = {executor.submit(feedparser.parse, url): category for url, category in all_target_feeds}
-            for future in as_completed(future_to_meta):
-                 category = future_to_meta[future]
-                 try:
-                     feed = future.result()
-                     source_name = feed.feed.get('title', 'RSS')
-                     for entry in feed.entries[:10]:
-                         raw_items.append((entry, source_name, category))
-                 except: pass
-
-        # Filter and Save
-        # Prepare data first (process then write pattern)
-        prepared_data = []
-        
-        christian_keywords = ['church', 'christian', 'christ', 'jesus', 'mohan', 'bishop', 'pastor', 'ministry', 'diocese', 'vatican', 'catholic', 'protestant', 'CSI', 'gospel', 'prayer', 'worship', 'faith', 'bible', 'religious', 'persecution', 'redeems', 'lazarus', 'jrm']
-        
-        for entry, source, category in raw_items:
-            url = entry.link
-            title = entry.title
-            if category == "Christianity":
-                if not any(k in (title + ' ' + entry.get('summary', '')).lower() for k in christian_keywords):
-                    continue
+        if not force:
+            due = set(feed_poller.due([url for url, _ in all_target_feeds]))
+            if not due:
+                return
+            all_target_feeds = [f for f in all_target_feeds if f[0] in due]
 
-            # Resolve URL if it's a redirect (common in Google News)
-            real_url = self._resolve_url(url)
-            
-            sid = hashlib.md5(real_url.encode()).hexdigest()
-            # Prefer real images; try RSS tags, then og:image, otherwise None
-            img = self._extract_image(entry)
-            if not img:
-                img = self._fetch_og_image(real_url)
-            
-            # [NEW] Real-time Fallback if still no image
-            if not img:
-                 # Clean title for better search results
-                 clean_title = re.sub(r'[^\w\s]', '', title)
-                 img = self._fetch_fallback_image(clean_title)
-            
-            ts_struct = entry.published_parsed if 'published_parsed' in entry else (entry.updated_parsed if 'updated_parsed' in entry else None)
-            ts = time.mktime(ts_struct) if ts_struct else time.time()
-            
-            snippet = BeautifulSoup(entry.get('summary', ''), "html.parser").get_text(separator=" ", strip=True)[:200]
+        print(f"🔄 [NewsFeeder] Fetching {len(all_target_feeds)} feeds...")
 
-            published_str = entry.published if 'published' in entry else (entry.updated if 'updated' in entry else '')
-            prepared_data.append((sid, title, real_url, published_str, source, img, entry.get('guid', url), ts, snippet))
-        
-        # Batch Insert (Fast, minimized lock time)
-        if prepared_data:
-            conn = None
-            try:
-                conn = self._get_connection()
-                c = conn.cursor()
-                # Use REPLACE to update existing items if content changed (or at least refresh timestamp if needed, but here we trust ID)
-                c.executemany("INSERT OR REPLACE INTO news (id, title, url, published, source, image, guid, timestamp, snippet, is_approved) VALUES (?,?,?,?,?,?,?,?,?,1)",
-                          prepared_data)
-                conn.commit()
-                print(f"✅ [NewsFeeder] Saved {len(prepared_data)} items.")
-                self.clear_bad_images_from_db() # [ENHANCED] Run purge after each batch
-            except Exception as e:
-                print(f"❌ [NewsFeeder] DB Save Error: {e}")
-            finally:
-                if conn: conn.close()
+        # parse -> filter -> resolve -> image-enrich -> image-fallback -> batch-insert.
+        # Each stage has its own bounded pool; rows are committed as they complete.
+        seen_links = set()
+        seen_lock = threading.Lock()
+        # feed url -> entry keys not yet stored; a feed's poll is committed only once it empties
+        outstanding = {}
+
+        def handled(feed, key):
+            with seen_lock:
+                outstanding[feed].discard(key)
+
+        def parse_stage(target):
+            raw = self._parse_feed(target)
+            with seen_lock:
+                outstanding.setdefault(target[0], set()).update(entry_key(entry) for entry, _, _ in raw)
+            return [(target[0], r) for r in raw]
+
+        def filter_stage(tagged):
+            feed, raw = tagged
+            item = self._prepare_entry(*raw)
+            if item is not None:
+                with seen_lock:
+                    if item['url'] in seen_links:
+                        item = None  # Same story listed by several feeds
+                    else:
+                        seen_links.add(item['url'])
+            if item is None:
+                handled(feed, entry_key(raw[0]))
+                return None
+            item['feed'] = feed
+            return item
+
+        def store_stage(items):
+            self._store_batch(items)
+            for item in items:
+                handled(item['feed'], item['guid'])
+
+        pipeline = StagedPipeline([
+            Stage('parse', parse_stage, workers=PARSE_WORKERS, expand=True),
+            Stage('filter', filter_stage, workers=1),
+            Stage('resolve', self._resolve_item, workers=RESOLVE_WORKERS),
+            Stage('image', self._enrich_image, workers=IMAGE_WORKERS),
+            Stage('fallback', self._enrich_fallback_image, workers=FALLBACK_WORKERS),
+        ], sink=store_stage, name='NewsFeeder')
+        stats = pipeline.run(all_target_feeds)
+
+        # Entries lost to a failed stage or sink stay outstanding: their feed is re-fetched
+        # in full next time instead of answering 304
+        for feed, keys in outstanding.items():
+            if not keys:
+                feed_poller.commit(feed)
+
+        saved = stats['sink']['in']
+        if saved:
+            print(f"✅ [NewsFeeder] Cycle done: {saved} items saved in {stats['sink']['batches']} batches ({stats['elapsed']}s).")
+            self.clear_bad_images_from_db() # [ENHANCED] Run purge after each cycle
+            feed_snapshots.invalidate('news')  # Rebuild served feeds once per cycle, not per batch
         else:
              print("⚠️ [NewsFeeder] No items prepared for insertion (All filtered out?).")
 
-    def get_all_news(self):
-        conn = None
+    # --- Fetch pipeline stages ---
+
+    def _parse_feed(self, target):
+        """[parse] One feed URL -> (entry, source, category) for entries not seen in earlier polls."""
+        url, category = target
+        # Conditional GET; a 304 or an unchanged window yields nothing to enrich
+        entries, source_name = feed_poller.poll(url, limit=10)
+        if not entries:
+            return []
+
+        # One bulk existence check: stored + unchanged entries are a no-op (approval and
+        # timestamp untouched), edited ones are re-enriched but keep their row
+        known = self._known_entries([entry_key(entry) for entry in entries])
+        out = []
+        for entry in entries:
+            row = known.get(entry_key(entry))
+            if row is not None:
+                if row['title'] == entry.title:
+                    continue
+                entry['_known'] = row
+            out.append((entry, source_name, category))
+        skipped = len(entries) - len(out)
+        if skipped:
+            print(f"⏭️ [NewsFeeder] {source_name}: {skipped} already-stored items skipped.")
+        return out
+
+    def _stored_images(self, ids):
+        """{id: image} for stored news rows that already have an image."""
+        if not ids:
+            return {}
+        try:
+            rows = self.db.query(f"SELECT id, image FROM news WHERE image IS NOT NULL AND id IN ({','.join('?' * len(ids))})", ids)
+            return {row['id']: row['image'] for row in rows}
+        except Exception as e:
+            print(f"⚠️ [NewsFeeder] Stored image lookup failed: {e}")
+            return {}
+
+    def _known_entries(self, guids):
+        """{guid: {id, title, image}} for the guids already in the news table."""
+        if not guids:
+            return {}
+        rows = self.db.query(f"SELECT id, guid, title, image FROM news WHERE guid IN ({','.join('?' * len(guids))})", guids)
+        return {row['guid']: dict(row) for row in rows}
+
+    def _prepare_entry(self, entry, source, category):
+        """[filter] Topic filter + the row fields that need no network."""
+        url = entry.link
+        title = entry.title
+        if category == "Christianity":
+            if not any(k in (title + ' ' + entry.get('summary', '')).lower() for k in self.CHRISTIAN_KEYWORDS):
+                return None
+
+        ts_struct = entry.published_parsed if 'published_parsed' in entry else (entry.updated_parsed if 'updated_parsed' in entry else None)
+        ts = time.mktime(ts_struct) if ts_struct else time.time()
+        snippet = BeautifulSoup(entry.get('summary', ''), "html.parser").get_text(separator=" ", strip=True)[:200]
+        published_str = entry.published if 'published' in entry else (entry.updated if 'updated' in entry else '')
+
+        known = entry.get('_known') or {}
+        return {
+            'title': title, 'url': url, 'published': published_str, 'source': source,
+            # Prefer real images; try RSS tags first (free), then what we stored last time,
+            # network lookups come later
+            'image': self._extract_image(entry) or known.get('image'), 'guid': entry_key(entry),
+            'timestamp': ts, 'snippet': snippet, 'known_id': known.get('id'),
+        }
+
+    def _resolve_item(self, item):
+        """[resolve] Follow Google News redirects to the publisher URL."""
+        item['url'] = self._resolve_url(item['url'])
+        # An edited entry keeps its row (and moderation state) even if its link moved
+        item['id'] = item['known_id'] or hashlib.md5(item['url'].encode()).hexdigest()
+        return item
+
+    def _enrich_image(self, item):
+        """[image] og:image & friends from the publisher page."""
+        if not item['image']:
+            item['image'] = self._fetch_og_image(item['url'])
+        return item
+
+    def _enrich_fallback_image(self, item):
+        """[fallback] Real-time DDG image search; small pool, DDG rate-limits hard."""
+        if not item['image']:
+            # Clean title for better search results
+            clean_title = re.sub(r'[^\w\s]', '', item['title'])
+            item['image'] = self._fetch_fallback_image(clean_title)
+        return item
+
+    def _store_batch(self, items):
+        """[insert] Commit one batch (Fast, minimized lock time)."""
+        rows = [(i['id'], i['title'], i['url'], i['published'], i['source'], i['image'], i['guid'], i['timestamp'], i['snippet'])
+                for i in items]
+        # Upsert: refresh content of changed items, but never reset moderation (is_approved)
+        # or drop an image we already had
+        self.db.executemany('''
+            INSERT INTO news (id, title, url, published, source, image, guid, timestamp, snippet, is_approved)
+            VALUES (?,?,?,?,?,?,?,?,?,1)
+            ON CONFLICT(id) DO UPDATE SET
+                title=excluded.title, url=excluded.url, published=excluded.published, source=excluded.source,
+                image=COALESCE(excluded.image, news.image), guid=excluded.guid,
+                timestamp=excluded.timestamp, snippet=excluded.snippet
+        ''', rows)
+        print(f"💾 [NewsFeeder] Saved batch of {len(rows)} items.")
+
+    def get_all_news(self, query=None):
+        """Admin: every stored article, or the best BM25 matches for `query`."""
         try:
-            conn = self._get_connection()
-            conn.row_factory = sqlite3.Row
-            c = conn.cursor()
-            c.execute("SELECT * FROM news ORDER BY timestamp DESC")
-            rows = c.fetchall()
+            if query:
+                return self.search_library(fts_match(query), limit=200, approved_only=False)
+            rows = self.db.query("SELECT * FROM news ORDER BY timestamp DESC")
             return [dict(row) for row in rows]
         except Exception as e:
             print(f"❌ [NewsFeeder] Read Error: {e}")
             return []
-        finally:
-            if conn: conn.close()
 
     def toggle_approval(self, nid, status):
-         conn = None
          try:
-             conn = self._get_connection()
-             c = conn.cursor()
-             c.execute("UPDATE news SET is_approved = ? WHERE id = ?", (1 if status else 0, nid))
-             conn.commit()
+             self.db.execute("UPDATE news SET is_approved = ? WHERE id = ?", (1 if status else 0, nid))
+             feed_snapshots.invalidate('news')
          except Exception as e:
              print(f"❌ [NewsFeeder] Update Error: {e}")
-         finally:
-             if conn: conn.close()
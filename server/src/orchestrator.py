@@ -1,8 +1,14 @@
+from src.fanout import fanout_engine, FanoutJob
+from src.near_dup import NearDuplicateIndex, near_deduplicate
+
+# Results scoring at least this (ContentFilter) count towards the early exit
+EARLY_EXIT_SCORE = 25
+
 class Orchestrator:
     """
     The 'Conductor' of the orchestra.
     Manages parallel execution of intents and aggregates results.
-    Pipeline: Search -> Dedupe -> ContentFilter -> HybridRanker.
+    Pipeline: Search -> Dedupe -> ContentFilter -> Near-Dup Collapse -> HybridRanker.
     """
     def __init__(self):
         # Precise Dorks (Moved intents definition below imports)
@@ -50,21 +56,60 @@ class Orchestrator:
         self.geo_sorter = GeoSorter()
         self.components_loaded = True
 
+    def _build_jobs(self, queries, limit, time_filter, serp_key):
+        """Wraps each dork query into a fan-out job for the selected engine."""
+        jobs = []
+        for q_obj in queries:
+            if serp_key:
+                job = FanoutJob(q_obj['q'], self.agents.search_google, q_obj['q'], q_obj['intent'], limit, time_filter, serp_key, meta=q_obj)
+            else:
+                job = FanoutJob(q_obj['q'], self.agents.search_ddg, q_obj['q'], q_obj['intent'], limit, time_filter, meta=q_obj)
+            jobs.append(job)
+        return jobs
+
+    def _enough_results(self, topic, limit, min_score=EARLY_EXIT_SCORE):
+        """
+        Early-exit predicate for the fan-out: true once `limit` unique URLs
+        have passed the ContentFilter's strong threshold.
+        Scores incrementally so each result is only scored once.
+        """
+        from src.search_utils import normalize_url
+        state = {'scored': 0, 'strong': set()}
+
+        def enough(collected):
+            for r in collected[state['scored']:]:
+                if self.content_filter.calculate_relevance(topic, r) >= min_score:
+                    state['strong'].add(normalize_url(r.get('url', '')))
+            state['scored'] = len(collected)
+            return len(state['strong']) >= limit
+
+        return enough
+
     def run(self, topic, active_intents=['general'], limit=100, time_filter=None, keys=None):
-        import concurrent.futures
-        from src.search_utils import sanitize_query
+        """Blocking search: returns `(results, errors)` from the final commit frame."""
+        for frame in self.run_stream(topic, active_intents=active_intents, limit=limit, time_filter=time_filter, keys=keys):
+            if frame['type'] == 'commit':
+                return frame['results'], frame['errors']
+        return [], []
+
+    def run_stream(self, topic, active_intents=['general'], limit=100, time_filter=None, keys=None):
+        """
+        Streaming search. Yields frames as agents return:
+        - {'type': 'partial', 'intent', 'query', 'results'}: new, deduplicated,
+          ContentFilter-approved results from one agent call (not yet ranked).
+        - {'type': 'commit', 'results', 'errors'}: the final ranked + geo-sorted list.
+        """
+        from src.search_utils import sanitize_query, normalize_url
         
         # Input validation
         if not topic or not isinstance(topic,str):
-            errors = ["Invalid topic provided"]
-            results = []
-            return results, errors
+            yield {'type': 'commit', 'results': [], 'errors': ["Invalid topic provided"]}
+            return
         
         topic = sanitize_query(topic)
         if not topic:
-            errors = ["Topic is empty after sanitization"]
-            results = []
-            return results, errors
+            yield {'type': 'commit', 'results': [], 'errors': ["Topic is empty after sanitization"]}
+            return
         
         # [STRICT TOPIC CONTROL]
         from src.topic_manager import topic_manager
@@ -106,29 +151,43 @@ class Orchestrator:
                         'intent': intent
                     })
         
-        # 4. Parallel Execution with Increased Workers for Speed
-        with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-            future_to_q = {}
-            for q_obj in queries:
-                if serp_key:
-                    future = executor.submit(self.agents.search_google, q_obj['q'], q_obj['intent'], limit, time_filter, serp_key)
-                else:
-                    future = executor.submit(self.agents.search_ddg, q_obj['q'], q_obj['intent'], limit, time_filter)
-                future_to_q[future] = q_obj
-            
-            for future in concurrent.futures.as_completed(future_to_q):
-                try:
-                    data = future.result()
-                    results.extend(data)
-                except Exception as e:
-                    # Capture the specific intent failure
-                    q_failed = future_to_q[future]
-                    error_msg = f"Agent Failed ({q_failed['intent']}): {str(e)}"
-                    print(f"⚠️ {error_msg}")
-                    errors.append(error_msg)
+        # 4. Async Fan-out (per-query + global deadlines, slow tail cancelled)
+        jobs = self._build_jobs(queries, limit, time_filter, serp_key)
+        enough = self._enough_results(topic, limit)
+        streamed_urls = set()
+        streamed_titles = set()
+        streamed_near = NearDuplicateIndex()
+        for job, data, error in fanout_engine.stream(jobs, enough=enough):
+            if error:
+                # Capture the specific intent failure
+                error_msg = f"Agent Failed ({job.meta['intent']}): {str(error)}"
+                print(f"⚠️ {error_msg}")
+                errors.append(error_msg)
+                continue
+
+            results.extend(data)
+
+            # Partial frame: only what this agent added that we haven't streamed yet
+            fresh = []
+            for r in data:
+                norm_url = normalize_url(r.get('url', ''))
+                norm_title = r.get('title', '').lower().strip()
+                if norm_url in streamed_urls or norm_title in streamed_titles:
+                    continue
+                streamed_urls.add(norm_url)
+                streamed_titles.add(norm_title)
+                fresh.append(dict(r))
+            fresh = self.content_filter.filter_batch(fresh, topic, min_score=5)
+            # Drop syndicated copies of something already streamed (filter order = best-first)
+            fresh = [
+                r for r in fresh
+                if streamed_near.check_and_add(normalize_url(r.get('url', '')), f"{r.get('title', '')} {r.get('snippet', '')}") is None
+            ]
+            if fresh:
+                yield {'type': 'partial', 'intent': job.meta['intent'], 'query': job.label, 'results': fresh}
 
         # 5. Aggressive Deduplication & Normalization using utility
-        from src.search_utils import deduplicate_results, normalize_url
+        from src.search_utils import deduplicate_results
         
         # First deduplicate by URL
         unique = deduplicate_results(results, key='url')
@@ -149,6 +208,10 @@ class Orchestrator:
         
         # 6. Content-Based Filtering (Quality Gate)
         filtered_results = self.content_filter.filter_batch(final_unique, topic, min_score=5)
+
+        # 6b. Near-Duplicate Collapse (syndicated copies with different titles/URLs)
+        # filter_batch returns best-first, so each cluster keeps its most relevant copy
+        filtered_results = near_deduplicate(filtered_results)
         
         # 7. Hybrid Re-Ranking (The User's Formula)
         # BM25 + Vectors + QualityBoost
@@ -159,4 +222,4 @@ class Orchestrator:
         final_sorted_results = self.geo_sorter.sort_results(ranked_results)
         
         print(f"✅ Orchestrator: Symphony complete. Final Count: {len(final_sorted_results)}")
-        return final_sorted_results, errors
+        yield {'type': 'commit', 'results': final_sorted_results, 'errors': errors}
@@ -0,0 +1,226 @@
+"""
+Page Metadata Extractor
+Downloads a page once, parses it once with lxml and pulls out everything
+the scrapers need (OG image candidates, description, publish time, title,
+authors and, on demand, main text). Parsed pages are cached by URL, so the
+feed image enricher, search meta enrichment and reader mode all share one
+download of the same article.
+"""
+import os
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from urllib.parse import urljoin
+
+import lxml.html
+import requests
+from lxml import etree
+
+from src.http_client import http_client
+
+try:
+    import trafilatura
+except ImportError:
+    trafilatura = None
+
+# Defaults (overridable via .env)
+CACHE_SIZE = int(os.getenv('PAGE_META_CACHE_SIZE', 128))
+CACHE_TTL = float(os.getenv('PAGE_META_TTL', 900))
+NEGATIVE_TTL = float(os.getenv('PAGE_META_NEGATIVE_TTL', 60))
+
+# Meta keys in preference order (property / name / itemprop, lowercased)
+IMAGE_KEYS = ('og:image', 'og:image:url', 'og:image:secure_url', 'twitter:image', 'twitter:image:src',
+              'thumbnail', 'image', 'sailthru.image', 'sailthru.image.full')
+DESCRIPTION_KEYS = ('og:description', 'twitter:description', 'description')
+PUBLISHED_KEYS = ('article:published_time', 'og:updated_time', 'pubdate', 'datepublished',
+                  'publish-date', 'date', 'article:modified_time')
+TITLE_KEYS = ('og:title', 'twitter:title')
+AUTHOR_KEYS = ('author', 'article:author', 'sailthru.author')
+
+
+class PageMeta:
+    """Everything extracted from one page download."""
+
+    def __init__(self, url, final_url, raw, tree, with_text=False):
+        self.url = url
+        self.final_url = final_url
+        self._raw = raw
+        self._lock = threading.Lock()
+        self._text = None
+        self._text_done = False
+
+        meta = self._collect_meta(tree)
+        self.title = self._first(meta, TITLE_KEYS) or self._title_tag(tree)
+        self.description = self._first(meta, DESCRIPTION_KEYS)
+        self.published = self._first(meta, PUBLISHED_KEYS)
+        author = self._first(meta, AUTHOR_KEYS)
+        self.authors = [author] if author and not author.startswith('http') else []
+        self.encoding = tree.getroottree().docinfo.encoding or 'utf-8'
+
+        # Every image candidate in preference order; callers apply their own blocklists
+        images = [meta[k] for k in IMAGE_KEYS if meta.get(k)]
+        for link in tree.iterfind('.//link[@rel="image_src"]'):
+            if link.get('href'):
+                images.append(link.get('href'))
+        declared = len(images)
+        first_img = tree.find('.//body//img[@src]')
+        if first_img is not None:
+            images.append(first_img.get('src'))
+        self.image = urljoin(final_url, images[0].strip()) if declared else None  # Page-declared image only
+        seen = set()
+        self.images = []
+        for src in images:
+            src = urljoin(final_url, src.strip())
+            if src not in seen:
+                seen.add(src)
+                self.images.append(src)
+
+        # trafilatura runs last: it prunes the tree in place. The tree itself is
+        # never cached (it's several times the size of the HTML).
+        if with_text:
+            self._text = self._extract_text(tree)
+            self._text_done = True
+
+    @staticmethod
+    def _collect_meta(tree):
+        meta = {}
+        for tag in tree.iter('meta'):
+            content = tag.get('content')
+            if not content:
+                continue
+            for attr in ('property', 'name', 'itemprop'):
+                key = tag.get(attr)
+                if key:
+                    meta.setdefault(key.strip().lower(), content.strip())
+        return meta
+
+    @staticmethod
+    def _first(meta, keys):
+        for key in keys:
+            if meta.get(key):
+                return meta[key]
+        return None
+
+    @staticmethod
+    def _title_tag(tree):
+        node = tree.find('.//title')
+        text = node.text_content().strip() if node is not None else ''
+        return text or None
+
+    @property
+    def html(self):
+        """Decoded HTML (for libraries that insist on their own parse, e.g. newspaper3k)."""
+        return self._raw.decode(self.encoding, errors='replace')
+
+    @property
+    def text(self):
+        """Main article text (computed once; re-parses only if the page was fetched without text)."""
+        if self._text_done:
+            return self._text
+        with self._lock:
+            if not self._text_done:
+                self._text = self._extract_text(_parse(self._raw))
+                self._text_done = True
+        return self._text
+
+    def _extract_text(self, tree):
+        if trafilatura is None:
+            return None
+        try:
+            return trafilatura.extract(tree, url=self.final_url) if tree is not None else None
+        except Exception as e:
+            print(f"⚠️ PageMeta: text extraction failed for {self.final_url[:60]}: {e}")
+            return None
+
+
+def _parse(raw):
+    try:
+        # Bytes in: lxml honours the page's own charset declaration
+        return lxml.html.document_fromstring(raw)
+    except (etree.ParserError, ValueError):
+        return None
+
+
+class PageMetaExtractor:
+    """
+    `fetch(url)` -> PageMeta, or None if the page can't be downloaded/parsed.
+    Results (including failures, briefly) are cached per URL in an LRU, and
+    concurrent requests for the same URL share a single download.
+    """
+
+    def __init__(self, client=None, cache_size=CACHE_SIZE, ttl=CACHE_TTL, negative_ttl=NEGATIVE_TTL):
+        self.client = client or http_client
+        self.cache_size = cache_size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._cache = OrderedDict()   # url -> (expires_at, PageMeta | None)
+        self._inflight = {}           # url -> Future
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def fetch(self, url, timeout=10, headers=None, with_text=False):
+        if not url:
+            return None
+        owner = False
+        with self._lock:
+            entry = self._cache.get(url)
+            if entry and entry[0] > time.monotonic():
+                self._cache.move_to_end(url)
+                self.hits += 1
+                future = None
+            else:
+                future = self._inflight.get(url)
+                if future is None:
+                    owner = True
+                    future = self._inflight[url] = Future()
+                    self.misses += 1
+
+        if future is None:
+            page = entry[1]
+        elif not owner:
+            page = future.result()
+        else:
+            try:
+                page = self._download(url, timeout, headers, with_text)
+            except requests.exceptions.RequestException:
+                page = None  # Timeouts / dead hosts are routine for scraped links
+            except Exception as e:
+                print(f"⚠️ PageMeta: fetch failed for {url[:60]}: {e}")
+                page = None
+            self._store(url, page)
+            with self._lock:
+                self._inflight.pop(url, None)
+            future.set_result(page)
+
+        if page is not None and with_text:
+            page.text  # No-op unless a meta-only fetch got here first
+        return page
+
+    def _download(self, url, timeout, headers, with_text):
+        resp = self.client.get(url, timeout=timeout, headers=headers)
+        if resp.status_code != 200 or not resp.content:
+            return None
+        tree = _parse(resp.content)
+        if tree is None:
+            return None
+        return PageMeta(url, resp.url or url, resp.content, tree, with_text=with_text)
+
+    def _store(self, url, page):
+        expires = time.monotonic() + (self.ttl if page is not None else self.negative_ttl)
+        with self._lock:
+            self._cache[url] = (expires, page)
+            self._cache.move_to_end(url)
+            if page is not None and page.final_url != url:
+                self._cache[page.final_url] = (expires, page)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            return {'cached': len(self._cache), 'hits': self.hits, 'misses': self.misses}
+
+
+# Shared extractor (one page cache for the whole process)
+page_meta = PageMetaExtractor()
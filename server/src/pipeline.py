@@ -0,0 +1,164 @@
+"""
+Staged Pipeline
+Thread-based producer/consumer pipeline: each stage has its own bounded
+worker pool and input queue, so a slow stage (e.g. image enrichment)
+applies backpressure upstream instead of buffering the whole cycle, and a
+batching sink commits results progressively while later items are still
+in flight.
+"""
+import os
+import queue
+import threading
+import time
+
+# Defaults (overridable via .env)
+QUEUE_SIZE = int(os.getenv('PIPELINE_QUEUE_SIZE', 64))
+SINK_BATCH = int(os.getenv('PIPELINE_SINK_BATCH', 25))
+SINK_FLUSH_SECONDS = float(os.getenv('PIPELINE_SINK_FLUSH', 2.0))
+
+_DONE = object()
+
+
+class Stage:
+    """
+    One pipeline step. `fn(item)` returns the transformed item, or None to
+    drop it. With `expand=True`, `fn(item)` returns an iterable and every
+    element is passed downstream (e.g. one feed -> many entries).
+    """
+    __slots__ = ('name', 'fn', 'workers', 'maxsize', 'expand')
+
+    def __init__(self, name, fn, workers=4, maxsize=QUEUE_SIZE, expand=False):
+        self.name = name
+        self.fn = fn
+        self.workers = max(1, workers)
+        self.maxsize = maxsize
+        self.expand = expand
+
+
+class StagedPipeline:
+    """
+    Runs `stages` in order over the `source` items and hands survivors to
+    `sink(batch)` in batches of `batch_size` (or whatever arrived within
+    `flush_seconds`). The sink runs on a single thread, so it can own the
+    DB writes without any locking of its own.
+
+    A failing item is counted and dropped; it never stalls its stage. If
+    `source` itself raises, what it yielded so far is still processed and
+    flushed before `run` re-raises.
+    """
+
+    def __init__(self, stages, sink, batch_size=SINK_BATCH, flush_seconds=SINK_FLUSH_SECONDS, name='pipeline'):
+        self.stages = list(stages)
+        self.sink = sink
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.name = name
+        self.stats = {}
+
+    def run(self, source):
+        """Blocks until every item has been processed and flushed. Returns stats."""
+        started = time.monotonic()
+        stats = {s.name: {'in': 0, 'out': 0, 'errors': 0} for s in self.stages}
+        stats['sink'] = {'in': 0, 'batches': 0, 'errors': 0}
+        lock = threading.Lock()
+
+        queues = [queue.Queue(maxsize=s.maxsize) for s in self.stages]
+        sink_queue = queue.Queue(maxsize=max(self.batch_size * 2, QUEUE_SIZE))
+        outputs = queues[1:] + [sink_queue]
+        remaining = [s.workers for s in self.stages]
+
+        def worker(idx):
+            stage, inbox, outbox = self.stages[idx], queues[idx], outputs[idx]
+            counters = stats[stage.name]
+            while True:
+                item = inbox.get()
+                if item is _DONE:
+                    break
+                try:
+                    result = stage.fn(item)
+                    if stage.expand and result is not None:
+                        result = list(result)
+                except Exception as e:
+                    with lock:
+                        counters['errors'] += 1
+                    print(f"⚠️ [{self.name}] {stage.name} failed: {e}")
+                    continue
+                if result is None:
+                    produced = ()
+                elif stage.expand:
+                    produced = result
+                else:
+                    produced = (result,)
+                n = 0
+                for r in produced:
+                    if r is None:
+                        continue
+                    outbox.put(r)  # Blocks when downstream is saturated (backpressure)
+                    n += 1
+                with lock:
+                    counters['in'] += 1
+                    counters['out'] += n
+
+            # Last worker out closes the next stage
+            with lock:
+                remaining[idx] -= 1
+                last = remaining[idx] == 0
+            if last:
+                downstream = self.stages[idx + 1].workers if idx + 1 < len(self.stages) else 1
+                for _ in range(downstream):
+                    outbox.put(_DONE)
+
+        def sink_loop():
+            counters = stats['sink']
+            batch = []
+            deadline = time.monotonic() + self.flush_seconds
+            finished = False
+            while not finished:
+                try:
+                    item = sink_queue.get(timeout=max(0.05, deadline - time.monotonic()))
+                    if item is _DONE:
+                        finished = True
+                    else:
+                        batch.append(item)
+                except queue.Empty:
+                    pass
+                if batch and (finished or len(batch) >= self.batch_size or time.monotonic() >= deadline):
+                    try:
+                        self.sink(batch)
+                        counters['in'] += len(batch)
+                        counters['batches'] += 1
+                    except Exception as e:
+                        counters['errors'] += 1
+                        print(f"❌ [{self.name}] sink failed on {len(batch)} items: {e}")
+                    batch = []
+                if time.monotonic() >= deadline:
+                    deadline = time.monotonic() + self.flush_seconds
+
+        threads = [threading.Thread(target=sink_loop, name=f'{self.name}-sink', daemon=True)]
+        for idx, stage in enumerate(self.stages):
+            for n in range(stage.workers):
+                threads.append(threading.Thread(target=worker, args=(idx,), name=f'{self.name}-{stage.name}-{n}', daemon=True))
+        for t in threads:
+            t.start()
+
+        inbox, closers = (queues[0], self.stages[0].workers) if self.stages else (sink_queue, 1)
+        source_error = None
+        try:
+            for item in source:
+                inbox.put(item)
+        except Exception as e:
+            source_error = e
+            print(f"❌ [{self.name}] source failed: {e}")
+        finally:
+            # Always close the pipeline, or the workers (and run) would wait forever
+            for _ in range(closers):
+                inbox.put(_DONE)
+
+        for t in threads:
+            t.join()
+
+        stats['elapsed'] = round(time.monotonic() - started, 2)
+        self.stats = stats
+        if source_error is not None:
+            raise source_error  # Items fed before the failure are processed and flushed
+        return stats
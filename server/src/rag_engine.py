@@ -1,9 +1,63 @@
 import os
 import chromadb
-from langchain_huggingface import HuggingFaceEmbeddings
 from langchain_text_splitters import RecursiveCharacterTextSplitter
-import uuid
+import time
+import threading
+from datetime import datetime, timedelta, timezone
+from collections import OrderedDict
+import numpy as np
 from .utils import retry_with_backoff
+from .embedding_service import embedding_service, text_key
+from .rag_ingest import rag_ingest
+
+# Chroma rejects oversized add/upsert calls; large batches are sent in slices
+UPSERT_SLICE = 1000
+# Chunk ids already in the collection, remembered so re-ingestion skips the Chroma lookup too
+KNOWN_IDS_CACHE = int(os.getenv('RAG_KNOWN_IDS_CACHE', 100000))
+# Optional MMR diversification of live context (0..1 relevance weight; unset = pure relevance)
+MMR_LAMBDA = float(os.getenv('RAG_MMR_LAMBDA')) if os.getenv('RAG_MMR_LAMBDA') else None
+# Weekly partitions: one collection per ISO week, the oldest dropped past the retention window
+RETENTION_WEEKS = int(os.getenv('RAG_RETENTION_WEEKS', 12))
+PARTITION_PREFIX = "analytics_"
+LEGACY_COLLECTION = "analytics_data"  # Pre-partitioning collection, searched until it ages out
+# Queries read the newest RAG_SEARCH_WEEKS partitions unless given `since`, newest first, and stop
+# early once k hits are within RAG_CLOSE_DISTANCE (squared L2 on normalized MiniLM vectors)
+SEARCH_WEEKS = int(os.getenv('RAG_SEARCH_WEEKS', 4))
+CLOSE_DISTANCE = float(os.getenv('RAG_CLOSE_DISTANCE', 0.8))
+
+
+def partition_name(ts=None):
+    """Collection name for the ISO week containing `ts` (epoch seconds, default now)."""
+    year, week, _ = datetime.fromtimestamp(ts if ts is not None else time.time(), timezone.utc).isocalendar()
+    return f"{PARTITION_PREFIX}{year}w{week:02d}"
+
+
+def _partition_start(name):
+    """Epoch seconds at which a partition's week starts (None for non-partition names)."""
+    try:
+        year, week = name[len(PARTITION_PREFIX):].split('w')
+        return datetime.fromisocalendar(int(year), int(week), 1).replace(tzinfo=timezone.utc).timestamp()
+    except ValueError:
+        return None
+
+
+def _where(types=None, query=None, exclude_types=None, since=None):
+    """Chroma metadata filter: `type` in / not in the given ones, the originating `query`, ingested since."""
+    clauses = []
+    if types:
+        types = [types] if isinstance(types, str) else list(types)
+        clauses.append({"type": types[0]} if len(types) == 1 else {"type": {"$in": types}})
+    if exclude_types:
+        exclude_types = [exclude_types] if isinstance(exclude_types, str) else list(exclude_types)
+        clauses.append({"type": {"$nin": exclude_types}})
+    if since is not None:
+        clauses.append({"ingested_at": {"$gte": int(since)}})
+    if query:
+        clauses.append({"query": query})
+    if not clauses:
+        return None
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
 
 class RAGEngine:
     def __init__(self, persist_directory=None):
@@ -18,34 +72,133 @@ class RAGEngine:
         if not os.path.exists(self.persist_directory):
             os.makedirs(self.persist_directory)
             
-        # Switch to Local Embeddings (Reliable & Free & Fixed Env)
-        try:
-            self.embeddings = HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2")
+        # Local Embeddings via the shared service (one model for RAG + ranking)
+        if embedding_service.ensure_loaded():
+            self.embeddings = embedding_service
             print("✅ RAG: Embeddings model loaded successfully.")
-        except Exception as e:
-            print(f"⚠️ RAG: Embeddings model failed to load. RAG features will be disabled. Error: {e}")
+        else:
+            print("⚠️ RAG: Embeddings model failed to load. RAG features will be disabled.")
             self.embeddings = None
         
-        # Initialize Chroma Client
-        self.client = chromadb.PersistentClient(path=persist_directory)
-        self.collection = self.client.get_or_create_collection(name="analytics_data")
+        # Initialize Chroma Client (one collection per week, see partition_name)
+        self.client = chromadb.PersistentClient(path=self.persist_directory)
+        self.retention_weeks = RETENTION_WEEKS
+        self.text_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=100)
+        self._known_ids = OrderedDict()   # (partition, chunk id) already stored
+        self._known_lock = threading.Lock()
+        self.counters = {'chunks_stored': 0, 'chunks_known': 0, 'partitions_dropped': 0}
+        self._partitions = {}
+        self._partitions_lock = threading.Lock()
+        self._load_partitions()
+        self.enforce_retention()
+
+        # Background ingestion (see src/rag_ingest.py) can start draining now
+        rag_ingest.attach(self)
         
-    @retry_with_backoff(retries=5, initial_delay=2)
+    # --- Partitions ---
+
+    def _load_partitions(self):
+        for c in self.client.list_collections():
+            name = c if isinstance(c, str) else c.name  # Names only since chromadb 0.6
+            if name == LEGACY_COLLECTION or (name.startswith(PARTITION_PREFIX) and _partition_start(name) is not None):
+                self._partitions[name] = self.client.get_collection(name=name)
+
+    def _partition(self, name):
+        """The collection for a partition, created on first write (a new week also triggers retention)."""
+        collection = self._partitions.get(name)
+        if collection is None:
+            with self._partitions_lock:
+                collection = self._partitions.get(name)
+                if collection is None:
+                    collection = self._partitions[name] = self.client.get_or_create_collection(name=name)
+                    print(f"🗂️ RAG: Opened partition '{name}'.")
+            self.enforce_retention()
+        return collection
+
+    def _partitions_since(self, since):
+        """(name, collection) for every weekly partition that may hold chunks ingested at or after `since`, newest first."""
+        with self._partitions_lock:
+            weekly = [(start, name) for name in self._partitions
+                      if (start := _partition_start(name)) is not None and start + 7 * 86400 > since]
+            return [(name, self._partitions[name]) for _, name in sorted(weekly, reverse=True)]
+
+    def enforce_retention(self):
+        """
+        Drop weekly partitions older than the retention window. The legacy
+        collection goes once the window is covered by weekly partitions.
+        """
+        cutoff = (datetime.now(timezone.utc) - timedelta(weeks=self.retention_weeks)).timestamp()
+        with self._partitions_lock:
+            weekly = [n for n in self._partitions if _partition_start(n) is not None]
+            expired = [n for n in weekly if _partition_start(n) + 7 * 86400 <= cutoff]
+            if LEGACY_COLLECTION in self._partitions and len(weekly) - len(expired) >= self.retention_weeks:
+                expired.append(LEGACY_COLLECTION)
+            for name in expired:
+                try:
+                    self.client.delete_collection(name=name)
+                    del self._partitions[name]
+                    self.counters['partitions_dropped'] += 1
+                    print(f"🗑️ RAG: Dropped partition '{name}' (retention {self.retention_weeks} weeks).")
+                except Exception as e:
+                    print(f"⚠️ RAG: Could not drop partition '{name}': {e}")
+        with self._known_lock:
+            for key in [k for k in self._known_ids if k[0] in expired]:
+                del self._known_ids[key]
+
+    def stats(self):
+        partitions = {}
+        with self._partitions_lock:
+            collections = list(self._partitions.items())
+        for name, collection in collections:
+            try:
+                partitions[name] = collection.count()
+            except Exception:
+                partitions[name] = None
+        return dict(self.counters, partitions=partitions, retention_weeks=self.retention_weeks)
+
+    # --- Ingestion ---
+
     def ingest(self, text, metadata=None):
         """
-        Chunks and ingests text into the vector store.
+        Chunks and ingests text into the vector store (synchronously).
         """
         if not text:
             return 0
+        return self.ingest_many([(text, metadata)])
 
-        text_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=100)
-        chunks = text_splitter.split_text(text)
+    @retry_with_backoff(retries=5, initial_delay=2)
+    def ingest_many(self, docs):
+        """
+        Chunks, embeds and bulk-upserts many (text, metadata) documents: one
+        embedding pass and one upsert per slice, however many documents.
+        Chunks go to the current week's partition, stamped with `ingested_at`.
+        Chunk ids are content hashes, so chunks already stored this week (by
+        an earlier search, scrape or feed) are skipped before embedding.
+        Returns the number of new chunks stored.
+        """
+        now = int(time.time())
+        by_id = OrderedDict()
+        for text, metadata in docs:
+            if not text:
+                continue
+            # Chroma metadata values must be scalars; None would fail the whole upsert
+            meta = {k: v for k, v in (metadata or {}).items() if v is not None}
+            meta['ingested_at'] = now
+            for chunk in self.text_splitter.split_text(text):
+                by_id.setdefault(text_key(chunk), (chunk, meta))  # First copy keeps its metadata
         
-        if not chunks:
+        if not by_id:
             return 0
-            
-        ids = [str(uuid.uuid4()) for _ in chunks]
-        metadatas = [metadata or {} for _ in chunks]
+
+        name = partition_name(now)
+        collection = self._partition(name)
+        ids = self._unknown_ids(name, collection, list(by_id))
+        with self._known_lock:
+            self.counters['chunks_known'] += len(by_id) - len(ids)
+        if not ids:
+            return 0
+        chunks = [by_id[i][0] for i in ids]
+        metadatas = [by_id[i][1] for i in ids]
         
         # Embed chunks
         if not self.embeddings:
@@ -58,78 +211,141 @@ class RAGEngine:
             print(f"❌ RAG Embedding Error: {e}")
             return 0
         
-        self.collection.add(
-            documents=chunks,
-            embeddings=embeddings,
-            metadatas=metadatas,
-            ids=ids
-        )
+        for i in range(0, len(chunks), UPSERT_SLICE):
+            collection.upsert(
+                documents=chunks[i:i + UPSERT_SLICE],
+                embeddings=embeddings[i:i + UPSERT_SLICE],
+                metadatas=metadatas[i:i + UPSERT_SLICE],
+                ids=ids[i:i + UPSERT_SLICE]
+            )
+        self._remember_ids(name, ids)
+        with self._known_lock:
+            self.counters['chunks_stored'] += len(ids)
         return len(chunks)
 
+    def _unknown_ids(self, name, collection, ids):
+        """The subset of chunk ids not yet in a partition (memory first, then one Chroma get per slice)."""
+        with self._known_lock:
+            pending = [i for i in ids if (name, i) not in self._known_ids]
+        if not pending:
+            return []
+        stored = set()
+        for i in range(0, len(pending), UPSERT_SLICE):
+            stored.update(collection.get(ids=pending[i:i + UPSERT_SLICE], include=[])['ids'])
+        self._remember_ids(name, stored)
+        return [i for i in pending if i not in stored]
+
+    def _remember_ids(self, name, ids):
+        with self._known_lock:
+            for i in ids:
+                self._known_ids[(name, i)] = True
+                self._known_ids.move_to_end((name, i))
+            while len(self._known_ids) > KNOWN_IDS_CACHE:
+                self._known_ids.popitem(last=False)
+
+    # --- Retrieval ---
+
     @retry_with_backoff(retries=5, initial_delay=2)
-    def search(self, query, k=5):
+    def search(self, query, k=5, query_embedding=None, types=None, exclude_types=None, source_query=None,
+               since=None, weeks=SEARCH_WEEKS):
         """
-        Retrieves relevant documents.
+        Retrieves relevant documents. Pass `query_embedding` to reuse an
+        embedding the caller already has. Optional filters: `types` /
+        `exclude_types` (metadata `type`, one or a list), `source_query` (the
+        search that ingested the chunk) and `since` (epoch seconds).
+
+        Only partitions that can hold matches are queried: those after
+        `since`, else the newest `weeks` (None = every retained week). They
+        are read newest first and the fan-out stops once k hits are close
+        enough. While the legacy collection is retained it is consulted when
+        the weeks didn't yield k hits; its chunks predate `ingested_at`, so
+        `since` doesn't apply to them. Hits merge by distance.
         """
         if not query or not self.embeddings:
             return []
 
-        query_embedding = self.embeddings.embed_query(query)
-        results = self.collection.query(
-            query_embeddings=[query_embedding],
-            n_results=k
-        )
-        
-        if not results['documents']:
-            return []
+        if query_embedding is None:
+            query_embedding = self.embeddings.embed_query(query)
+        where = _where(types, source_query, exclude_types, since)
+        legacy_where = _where(types, source_query, exclude_types)
+        if since is None and weeks is not None:
+            window = time.time() - weeks * 7 * 86400
+        else:
+            window = since or 0
+        targets = self._partitions_since(window)
+        if LEGACY_COLLECTION in self._partitions:
+            targets.append((LEGACY_COLLECTION, self._partitions[LEGACY_COLLECTION]))
 
-        # Flatten results
-        documents = results['documents'][0]
-        metadatas = results['metadatas'][0] if results['metadatas'] else [{}] * len(documents)
-        
-        return [{"content": doc, "metadata": meta} for doc, meta in zip(documents, metadatas)]
+        hits = {}
+        for name, collection in targets:
+            if name == LEGACY_COLLECTION and len(hits) >= k:
+                break
+            try:
+                results = collection.query(query_embeddings=[query_embedding], n_results=k,
+                                           where=legacy_where if name == LEGACY_COLLECTION else where)
+            except Exception as e:
+                print(f"⚠️ RAG: Search skipped partition '{name}': {e}")
+                continue
+            if not results['documents']:
+                continue
+            # Flatten results
+            documents = results['documents'][0]
+            metadatas = results['metadatas'][0] if results['metadatas'] else [{}] * len(documents)
+            distances = results['distances'][0] if results.get('distances') else [0.0] * len(documents)
+            for doc_id, doc, meta, dist in zip(results['ids'][0], documents, metadatas, distances):
+                # The same chunk can live in several weeks: keep its closest copy
+                if doc_id not in hits or dist < hits[doc_id][0]:
+                    hits[doc_id] = (dist, doc, meta)
+            # Newest first: once k close hits are in hand, older weeks can't improve much
+            if len(hits) >= k and sorted(h[0] for h in hits.values())[k - 1] <= CLOSE_DISTANCE:
+                break
+
+        ranked = sorted(hits.values(), key=lambda h: h[0])[:k]
+        return [{"content": doc, "metadata": meta} for _, doc, meta in ranked]
 
-    def search_hybrid(self, query, live_texts, k=5):
+    def search_hybrid(self, query, live_texts, k=5, mmr_lambda=MMR_LAMBDA, **filters):
         """
         Performs a hybrid search:
         1. Vectorizes 'live_texts' on-the-fly and finds top matches (Online Context).
         2. Queries the persistent ChromaDB for historical matches (Offline Context).
         3. Merges and deduplicates results.
+        The query is embedded once and reused by both stages. With `mmr_lambda`
+        set, live matches are diversified with MMR instead of taken by score alone.
+        `filters` (types, since, ...) are passed on to `search`.
         """
         hybrid_results = []
+        query_vec = None
+        if query and self.embeddings:
+            try:
+                query_vec = self.embeddings.embed_query(query)
+            except Exception as e:
+                print(f"⚠️ Hybrid Search Warning: Query embedding failed: {e}")
         
         # 1. Historical/DB Search
-        db_results = self.search(query, k=k)
+        db_results = self.search(query, k=k, query_embedding=query_vec, **filters) if query_vec is not None else []
         for res in db_results:
             res['source'] = 'historical_db'
         hybrid_results.extend(db_results)
         
         # 2. Live/Online Search (In-Memory Vectorization)
-        if live_texts and query and self.embeddings:
+        if live_texts and query_vec is not None:
             try:
-                # Embed query
-                query_vec = self.embeddings.embed_query(query)
-                
-                # Embed live texts (batch)
-                live_vecs = self.embeddings.embed_documents(live_texts)
-                
-                # Calculate Similarity (Cosine/Dot Product for normalized vectors)
-                # manual dot product to avoid numpy dependency issues if not installed
-                scores = []
-                for i, vec in enumerate(live_vecs):
-                    dot_product = sum(a*b for a, b in zip(query_vec, vec))
-                    scores.append((dot_product, i))
-                
-                # Sort by score descending
-                scores.sort(key=lambda x: x[0], reverse=True)
-                
-                # Take top k from live
-                top_live = scores[:k]
+                # Embed live texts (batch), then cosine similarity as one matrix x vector product
+                live_vecs = np.asarray(self.embeddings.embed_documents(live_texts), dtype=np.float32)
+                live_vecs /= np.maximum(np.linalg.norm(live_vecs, axis=1, keepdims=True), 1e-9)
+                q = np.asarray(query_vec, dtype=np.float32)
+                q /= max(float(np.linalg.norm(q)), 1e-9)
+                scores = live_vecs @ q
+
+                if mmr_lambda is not None:
+                    top_live = _mmr(live_vecs, scores, k, mmr_lambda)
+                else:
+                    top_live = _top_k(scores, k)
                 
-                for score, idx in top_live:
+                for idx in top_live:
                     hybrid_results.append({
                         "content": live_texts[idx],
-                        "metadata": {"source": "live_web_search", "score": score},
+                        "metadata": {"source": "live_web_search", "score": float(scores[idx])},
                         "source": "live_web"
                     })
                     
@@ -144,3 +360,34 @@ class RAGEngine:
                     })
 
         return hybrid_results
+
+
+def _top_k(scores, k):
+    """Indices of the k highest scores, best first (argpartition: O(n) + O(k log k))."""
+    if k >= len(scores):
+        return np.argsort(-scores, kind='stable')
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top], kind='stable')]
+
+
+def _mmr(vecs, scores, k, lam, pool_factor=4):
+    """
+    Maximal Marginal Relevance over the best `k * pool_factor` candidates:
+    each pick maximizes lam * relevance - (1 - lam) * max similarity to
+    the picks so far. `vecs` must be L2-normalized.
+    """
+    pool = _top_k(scores, k * pool_factor)
+    pool_vecs = vecs[pool]
+    pair_sim = pool_vecs @ pool_vecs.T
+    chosen = [0]  # Best match always leads
+    max_sim = pair_sim[0].copy()
+    remaining = np.ones(len(pool), dtype=bool)
+    remaining[0] = False
+    while len(chosen) < min(k, len(pool)):
+        mmr = lam * scores[pool] - (1 - lam) * max_sim
+        mmr[~remaining] = -np.inf
+        pick = int(np.argmax(mmr))
+        chosen.append(pick)
+        remaining[pick] = False
+        max_sim = np.maximum(max_sim, pair_sim[pick])
+    return pool[chosen]
@@ -0,0 +1,139 @@
+"""
+RAG Ingestion Queue
+Takes RAG ingestion off the request path. Endpoints `submit()` documents
+and return immediately; one background worker coalesces everything queued
+within a short window (across requests) into a single split -> embed ->
+bulk-upsert pass on the RAGEngine.
+"""
+import os
+import time
+import queue
+import threading
+
+# Defaults (overridable via .env)
+QUEUE_SIZE = int(os.getenv('RAG_INGEST_QUEUE_SIZE', 2000))
+BATCH_DOCS = int(os.getenv('RAG_INGEST_BATCH_DOCS', 64))
+BATCH_WINDOW = float(os.getenv('RAG_INGEST_WINDOW_MS', 500)) / 1000.0
+
+
+class RagIngestQueue:
+    """
+    `submit(text, metadata)` -> True if queued (False if the queue is full or
+    the text is empty). Documents wait until an engine is attached, so
+    requests served while the heavy models load aren't lost.
+    `flush(timeout)` blocks until everything submitted so far is ingested.
+    """
+
+    def __init__(self, engine=None, maxsize=QUEUE_SIZE, batch_docs=BATCH_DOCS, window=BATCH_WINDOW):
+        self.engine = engine
+        self.batch_docs = batch_docs
+        self.window = window
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._ready = threading.Event()
+        self._idle = threading.Condition()
+        self._in_progress = 0
+        self._worker = None
+        self._lock = threading.Lock()
+        self.counters = {'submitted': 0, 'dropped': 0, 'ingested_docs': 0, 'chunks': 0, 'batches': 0, 'errors': 0}
+        self.last_lag = 0.0      # seconds from submit to stored, for the oldest doc of the last batch
+        self.max_lag = 0.0
+        self.last_batch_seconds = 0.0
+        if engine is not None:
+            self.attach(engine)
+
+    def attach(self, engine):
+        self.engine = engine
+        self._ready.set()
+
+    def submit(self, text, metadata=None):
+        if not text:
+            return False
+        with self._idle:
+            self._in_progress += 1
+        try:
+            self._queue.put_nowait((text, metadata or {}, time.time()))
+        except queue.Full:
+            with self._idle:
+                self._in_progress -= 1
+                self._idle.notify_all()
+            self._count('dropped')
+            return False
+        self._count('submitted')
+        self._ensure_worker()
+        return True
+
+    def flush(self, timeout=None):
+        """True once every submitted document has been processed (or dropped on error)."""
+        deadline = None if timeout is None else time.time() + timeout
+        with self._idle:
+            while self._in_progress:
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._idle.wait(remaining)
+        return True
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+        oldest = self._oldest_queued()
+        stats.update({
+            'depth': self._queue.qsize(),
+            'attached': self._ready.is_set(),
+            'oldest_queued_seconds': round(time.time() - oldest, 2) if oldest else 0.0,
+            'last_lag_seconds': round(self.last_lag, 2),
+            'max_lag_seconds': round(self.max_lag, 2),
+            'last_batch_seconds': round(self.last_batch_seconds, 2),
+        })
+        return stats
+
+    # --- Worker ---
+
+    def _count(self, name, n=1):
+        with self._lock:
+            self.counters[name] += n
+
+    def _oldest_queued(self):
+        with self._queue.mutex:
+            return self._queue.queue[0][2] if self._queue.queue else None
+
+    def _ensure_worker(self):
+        if self._worker is None:
+            with self._lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._loop, daemon=True, name='rag-ingest')
+                    self._worker.start()
+
+    def _loop(self):
+        while True:
+            batch = [self._queue.get()]
+            self._ready.wait()
+            # Let concurrent requests pile in, then take everything up to the batch size
+            deadline = time.time() + self.window
+            while len(batch) < self.batch_docs:
+                try:
+                    batch.append(self._queue.get(timeout=max(0.0, deadline - time.time())))
+                except queue.Empty:
+                    break
+
+            started = time.time()
+            try:
+                chunks = self.engine.ingest_many([(text, meta) for text, meta, _ in batch])
+                self._count('ingested_docs', len(batch))
+                self._count('chunks', chunks)
+                self._count('batches')
+                done = time.time()
+                self.last_batch_seconds = done - started
+                self.last_lag = done - batch[0][2]
+                self.max_lag = max(self.max_lag, self.last_lag)
+            except Exception as e:
+                self._count('errors')
+                print(f"❌ [RagIngest] Batch of {len(batch)} documents failed: {e}")
+            finally:
+                with self._idle:
+                    self._in_progress -= len(batch)
+                    self._idle.notify_all()
+
+
+# Shared ingestion queue (the RAGEngine attaches itself once loaded)
+rag_ingest = RagIngestQueue()
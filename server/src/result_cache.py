@@ -0,0 +1,225 @@
+"""
+Search Result Cache
+Two-tier (memory LRU + SQLite) cache for agent search results with
+per-intent TTLs and stale-while-revalidate refresh.
+"""
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+from src.db import get_database
+
+# Database File Path
+CACHE_DB = os.getenv('SEARCH_CACHE_DB', os.path.join(os.path.dirname(__file__), '..', 'search_cache.db'))
+
+# Freshness per intent (seconds). News goes stale fast, reference material doesn't.
+# Override any of them with SEARCH_CACHE_TTL_<INTENT>=seconds in .env
+DEFAULT_TTLS = {
+    'news': 15 * 60,
+    'video': 2 * 3600,
+    'social': 2 * 3600,
+    'commerce': 3600,
+    'general': 6 * 3600,
+    'christ_data': 12 * 3600,
+    'academic': 24 * 3600,
+}
+FALLBACK_TTL = 3600
+
+
+class SearchResultCache:
+    """
+    Keyed on (query, intent, time_filter, region, engine).
+
+    - Fresh entries (age < ttl) are served directly.
+    - Stale entries (ttl <= age < ttl * stale_factor) are served immediately
+      while a background thread refreshes them (stale-while-revalidate).
+    - Anything older is a miss and is fetched inline.
+
+    The memory tier is a bounded LRU; the SQLite tier survives restarts and
+    is trimmed to `max_disk_entries` by last access.
+    """
+
+    def __init__(self, db_path=CACHE_DB, max_entries=1024, max_disk_entries=20000, stale_factor=4):
+        self.db = get_database(db_path) if db_path else None
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.stale_factor = stale_factor
+
+        self._memory = OrderedDict()  # key -> (results, stored_at)
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._writes = 0
+        self.counters = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'disk_hits': 0, 'refreshes': 0, 'evictions': 0}
+
+        self._init_db()
+
+    def _init_db(self):
+        if not self.db:
+            return
+        try:
+            self.db.migrate('search_cache', [
+                '''
+                CREATE TABLE IF NOT EXISTS search_cache (
+                    key TEXT PRIMARY KEY,
+                    intent TEXT,
+                    payload TEXT,
+                    stored_at REAL,
+                    last_access REAL
+                )
+                ''',
+                'CREATE INDEX IF NOT EXISTS idx_search_cache_access ON search_cache(last_access)',
+            ])
+        except Exception as e:
+            print(f"⚠️ [SearchCache] DB Init Error: {e}. Running memory-only.")
+            self.db = None
+
+    @staticmethod
+    def make_key(query, intent, time_filter, region, engine, limit=None):
+        raw = json.dumps([' '.join((query or '').lower().split()), intent, time_filter, region, engine, limit])
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def ttl_for(self, intent):
+        override = os.getenv(f"SEARCH_CACHE_TTL_{(intent or '').upper()}")
+        if override:
+            try: return float(override)
+            except ValueError: pass
+        return DEFAULT_TTLS.get(intent, FALLBACK_TTL)
+
+    # --- Public API ---
+
+    def get_or_fetch(self, fetch_fn, query, intent, time_filter=None, region=None, engine=None, limit=None):
+        """Return cached results for the key, calling `fetch_fn()` on a miss."""
+        key = self.make_key(query, intent, time_filter, region, engine, limit)
+        ttl = self.ttl_for(intent)
+
+        entry = self._get(key)
+        if entry:
+            results, stored_at = entry
+            age = time.time() - stored_at
+            if age < ttl:
+                self._count('hits')
+                return self._copy(results)
+            if age < ttl * self.stale_factor:
+                self._count('stale_hits')
+                self._refresh_async(key, intent, fetch_fn)
+                return self._copy(results)
+
+        self._count('misses')
+        results = fetch_fn()
+        if results:
+            # Empty lists are usually transient agent errors - don't pin them
+            self._put(key, intent, results)
+        return results
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+            stats['memory_entries'] = len(self._memory)
+        lookups = stats['hits'] + stats['stale_hits'] + stats['misses']
+        stats['hit_rate'] = round((stats['hits'] + stats['stale_hits']) / lookups, 3) if lookups else 0.0
+        return stats
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        if self.db:
+            try:
+                self.db.execute("DELETE FROM search_cache")
+            except Exception as e:
+                print(f"⚠️ [SearchCache] Clear failed: {e}")
+
+    # --- Internals ---
+
+    def _count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    @staticmethod
+    def _copy(results):
+        # Callers mutate result dicts (scores, geo tiers) - never hand out the cached ones
+        return [dict(r) for r in results]
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry:
+                self._memory.move_to_end(key)
+                return entry
+
+        if not self.db:
+            return None
+        try:
+            row = self.db.query_one("SELECT payload, stored_at FROM search_cache WHERE key = ?", (key,))
+            if row:
+                # Only orders the disk trim: fire-and-forget
+                self.db.execute("UPDATE search_cache SET last_access = ? WHERE key = ?", (time.time(), key), wait=False)
+        except Exception as e:
+            print(f"⚠️ [SearchCache] Disk read failed: {e}")
+            return None
+
+        if not row:
+            return None
+        entry = (json.loads(row[0]), row[1])
+        self._count('disk_hits')
+        self._remember(key, entry)
+        return entry
+
+    def _remember(self, key, entry):
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+                self.counters['evictions'] += 1
+
+    def _put(self, key, intent, results):
+        now = time.time()
+        self._remember(key, (self._copy(results), now))
+        if not self.db:
+            return
+        payload = json.dumps(results)
+        with self._lock:
+            self._writes += 1
+            trim = self._writes % 100 == 0
+
+        def store(conn):
+            conn.execute(
+                "INSERT OR REPLACE INTO search_cache (key, intent, payload, stored_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, intent, payload, now, now)
+            )
+            if trim:
+                # Size-bound the disk tier: drop least recently used rows
+                conn.execute('''
+                    DELETE FROM search_cache WHERE key IN (
+                        SELECT key FROM search_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?
+                    )
+                ''', (self.max_disk_entries,))
+        # The memory tier already serves the entry; the disk copy is for restarts (failures are logged)
+        self.db.transaction(store, wait=False)
+
+    def _refresh_async(self, key, intent, fetch_fn):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def _refresh():
+            try:
+                results = fetch_fn()
+                if results:
+                    self._put(key, intent, results)
+                self._count('refreshes')
+            except Exception as e:
+                print(f"⚠️ [SearchCache] Background refresh failed: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=_refresh, daemon=True).start()
+
+
+# Singleton instance
+search_cache = SearchResultCache()
@@ -14,9 +14,22 @@ DEFAULT_TOPICS = {
 
 class TopicManager:
     def __init__(self):
+        self._listeners = []
         self._ensure_data_dir()
         self.load_topics()
 
+    def add_listener(self, fn):
+        """Register `fn(active_keywords)`, called whenever the active topic set changes."""
+        self._listeners.append(fn)
+
+    def _notify(self):
+        active = self.get_active_keywords()
+        for fn in self._listeners:
+            try:
+                fn(active)
+            except Exception as e:
+                print(f"⚠️ Topic listener failed: {e}")
+
     def _ensure_data_dir(self):
         directory = os.path.dirname(TOPICS_FILE)
         if not os.path.exists(directory):
@@ -52,6 +65,7 @@ class TopicManager:
         if topic in self.topics:
             self.topics[topic] = bool(status)
             self.save_topics()
+            self._notify()
             return True
         return False
 
@@ -60,6 +74,7 @@ class TopicManager:
         if topic and topic not in self.topics:
             self.topics[topic] = True
             self.save_topics()
+            self._notify()
             return True
         return False
 
@@ -67,9 +82,10 @@ class TopicManager:
         """Returns a list of enabled topic names."""
         return [k for k, v in self.topics.items() if v]
 
-    def get_active_topic_query(self):
+    def get_active_topic_query(self, active=None):
         """Returns a query string for search (e.g. 'Christianity OR Sports')."""
-        active = self.get_active_keywords()
+        if active is None:
+            active = self.get_active_keywords()
         if not active:
             return None # Implies no topics active
         return " OR ".join([f'"{t}"' for t in active])
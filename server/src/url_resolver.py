@@ -0,0 +1,232 @@
+"""
+Redirect URL Resolver
+Resolves Google News redirect links to the publisher's URL once and
+remembers the answer: an in-process LRU in front of a `resolved_urls`
+table in news.db. Failures are cached briefly so a dead link isn't
+re-fetched on every feed cycle, search or reader-mode open.
+"""
+import os
+import re
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from src.http_client import http_client
+from src.db import get_database
+
+# Database Configuration (shares the news DB)
+DB_FILE = os.getenv('NEWS_DB_FILE', os.path.join(os.path.dirname(__file__), '..', 'news.db'))
+
+# Defaults (overridable via .env)
+CACHE_SIZE = int(os.getenv('RESOLVER_CACHE_SIZE', 5000))
+NEGATIVE_TTL = float(os.getenv('RESOLVER_NEGATIVE_TTL', 3600))
+RETENTION_DAYS = float(os.getenv('RESOLVER_RETENTION_DAYS', 30))
+MAX_WORKERS = int(os.getenv('RESOLVER_MAX_WORKERS', 8))
+
+REDIRECT_MARKERS = ("news.google.com", "google.com/rss", "google.com/url")
+GOOGLE_HOSTS = ("google.com", "googleusercontent.com")
+BLOCKED_DOMAINS = ["google.com", "gstatic.com", "googleusercontent.com", "google-analytics.com",
+                   "doubleclick.net", "googletagmanager.com", "googlesyndication.com"]
+
+# USE A SPOOFED MOBILE USER AGENT - Google often redirects mobile bots faster
+RESOLVE_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Mobile/15E148 Safari/604.1",
+    "Referer": "https://news.google.com/",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+}
+
+_LOCATION_REPLACE = re.compile(r'window\.location\.replace\("([^"]+)"\)')
+# More specific pattern for JSON-like arrays in Google splash pages first
+_SPLASH_PATTERNS = [re.compile(r'\["(https?://[^"]+)"'), re.compile(r'"(https?://[^"]+)"')]
+
+
+def is_redirect_url(url):
+    return bool(url) and any(m in url for m in REDIRECT_MARKERS)
+
+
+def _off_google(url):
+    return bool(url) and not any(h in url for h in GOOGLE_HOSTS)
+
+
+class UrlResolver:
+    """
+    `resolve(url)` -> publisher URL, or the input URL if it isn't a redirect
+    link or can't be resolved. `resolve_many(urls)` looks every link up in
+    one query and resolves the misses in parallel.
+    """
+
+    def __init__(self, db_file=DB_FILE, cache_size=CACHE_SIZE, negative_ttl=NEGATIVE_TTL):
+        self.db = get_database(db_file)
+        self.cache_size = cache_size
+        self.negative_ttl = negative_ttl
+        self._cache = OrderedDict()   # url -> (resolved url | None, expires_at)
+        self._lock = threading.Lock()
+        self._init_db()
+
+    def _init_db(self):
+        try:
+            self.db.migrate('resolved_urls', [
+                '''
+                CREATE TABLE IF NOT EXISTS resolved_urls (
+                    url TEXT PRIMARY KEY,
+                    resolved TEXT,
+                    ok INTEGER,
+                    timestamp REAL
+                )
+                ''',
+            ])
+        except Exception as e:
+            print(f"❌ [UrlResolver] DB Init Error: {e}")
+
+    # --- Cache layers ---
+
+    def _cache_get(self, url):
+        """(hit, resolved) from the LRU; resolved is None for a cached failure."""
+        entry = self._cache.get(url)
+        if entry is None:
+            return False, None
+        if entry[1] is not None and entry[1] < time.time():
+            with self._lock:
+                self._cache.pop(url, None)
+            return False, None
+        with self._lock:
+            if url in self._cache:
+                self._cache.move_to_end(url)
+        return True, entry[0]
+
+    def _cache_put(self, url, resolved, expires=None):
+        with self._lock:
+            self._cache[url] = (resolved, expires)
+            self._cache.move_to_end(url)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _db_lookup(self, urls):
+        """{url: (resolved | None, expires | None)} for every fresh row."""
+        found = {}
+        if not urls:
+            return found
+        neg_cutoff = time.time() - self.negative_ttl
+        try:
+            urls = list(urls)
+            for i in range(0, len(urls), 500):
+                chunk = urls[i:i + 500]
+                rows = self.db.query(
+                    f"SELECT url, resolved, ok, timestamp FROM resolved_urls WHERE url IN ({','.join('?' * len(chunk))})",
+                    chunk)
+                for url, resolved, ok, ts in rows:
+                    if ok:
+                        found[url] = (resolved, None)
+                    elif ts > neg_cutoff:
+                        found[url] = (None, ts + self.negative_ttl)
+        except Exception as e:
+            print(f"⚠️ [UrlResolver] Lookup failed: {e}")
+        return found
+
+    def _db_store(self, results):
+        """results: {url: resolved | None}."""
+        if not results:
+            return
+        now = time.time()
+        # Fire-and-forget: the LRU already has the answer for this process
+        self.db.executemany("INSERT OR REPLACE INTO resolved_urls (url, resolved, ok, timestamp) VALUES (?,?,?,?)",
+                            [(u, r, 1 if r else 0, now) for u, r in results.items()], wait=False)
+
+    # --- Public API ---
+
+    def resolve(self, url):
+        if not is_redirect_url(url):
+            return url
+        hit, resolved = self._cache_get(url)
+        if not hit:
+            row = self._db_lookup([url]).get(url)
+            if row is None:
+                resolved = self._resolve_live(url)
+                self._db_store({url: resolved})
+                row = (resolved, None if resolved else time.time() + self.negative_ttl)
+            resolved = row[0]
+            self._cache_put(url, *row)
+        return resolved or url
+
+    def resolve_many(self, urls, max_workers=MAX_WORKERS):
+        """{url: resolved url} for every input (unresolvable links map to themselves)."""
+        out = {}
+        pending = []
+        for url in dict.fromkeys(u for u in urls if u):
+            if not is_redirect_url(url):
+                out[url] = url
+                continue
+            hit, resolved = self._cache_get(url)
+            if hit:
+                out[url] = resolved or url
+            else:
+                pending.append(url)
+
+        if pending:
+            rows = self._db_lookup(pending)
+            for url, row in rows.items():
+                self._cache_put(url, *row)
+                out[url] = row[0] or url
+            misses = [u for u in pending if u not in rows]
+            if misses:
+                with ThreadPoolExecutor(max_workers=min(max_workers, len(misses))) as executor:
+                    live = dict(zip(misses, executor.map(self._resolve_live, misses)))
+                self._db_store(live)
+                expires = time.time() + self.negative_ttl
+                for url, resolved in live.items():
+                    self._cache_put(url, resolved, None if resolved else expires)
+                    out[url] = resolved or url
+                print(f"🔗 [UrlResolver] Resolved {sum(1 for r in live.values() if r)}/{len(misses)} new links ({len(pending) - len(misses)} from DB).")
+        return out
+
+    def prune(self, retention_days=RETENTION_DAYS):
+        """Drop rows older than the retention window (and expired failures)."""
+        try:
+            now = time.time()
+            self.db.execute("DELETE FROM resolved_urls WHERE timestamp < ? OR (ok = 0 AND timestamp < ?)",
+                            (now - retention_days * 86400, now - self.negative_ttl))
+        except Exception as e:
+            print(f"⚠️ [UrlResolver] Prune failed: {e}")
+
+    # --- Live resolution ---
+
+    def _resolve_live(self, url):
+        """Publisher URL for a redirect link, or None if it couldn't be found."""
+        try:
+            # Try a quick HEAD request first (very fast)
+            try:
+                resp = http_client.head(url, headers=RESOLVE_HEADERS, timeout=5, allow_redirects=True)
+                if _off_google(resp.url):
+                    return resp.url
+            except Exception:
+                pass
+
+            # Simple GET with redirects
+            resp = http_client.get(url, headers=RESOLVE_HEADERS, timeout=8, allow_redirects=True)
+            if _off_google(resp.url):
+                return resp.url
+
+            # Extract from Splash Page (JS redirect, WIZ_global_data or IJ_values)
+            text = resp.text
+            match = _LOCATION_REPLACE.search(text)
+            if match and _off_google(match.group(1)):
+                return match.group(1)
+
+            found_urls = []
+            for pattern in _SPLASH_PATTERNS:
+                for m in pattern.findall(text):
+                    # BLOCK tracking and meta domains
+                    if not any(b in m for b in BLOCKED_DOMAINS):
+                        found_urls.append(m)
+            if found_urls:
+                # Prioritize URLs that contain 'article', 'news', or common extensions
+                priority_urls = [u for u in found_urls if any(p in u.lower() for p in ['/20', '.html', 'article', 'news'])]
+                return priority_urls[0] if priority_urls else found_urls[0]
+        except Exception as e:
+            print(f"⚠️ [UrlResolver] Resolution failed for {url[:60]}: {e}")
+        return None
+
+
+# Shared resolver (NewsFeeder + ContentExtractor)
+url_resolver = UrlResolver()
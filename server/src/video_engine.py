@@ -1,4 +1,3 @@
-import sqlite3
 import scrapetube
 import threading
 import time
@@ -10,10 +9,41 @@ import concurrent.futures
 from datetime import datetime
 
 # Database File Path
-DB_FILE = os.path.join(os.path.dirname(__file__), '..', 'videos.db')
+DB_FILE = os.getenv('VIDEOS_DB_FILE', os.path.join(os.path.dirname(__file__), '..', 'videos.db'))
 
 from src.topic_manager import topic_manager
 from src.geo_sorter import GeoSorter
+from src.near_dup import near_deduplicate, MinHasher, char_shingles
+from src.keyword_matcher import KeywordMatcher
+from src.db import get_database, add_column, fts_index, fts_match, contains_any
+from src.feed_snapshots import feed_snapshots
+from src.http_client import http_client
+
+# Stored-video cap (was a hard 200; the fuzzy-title index keeps dedup sub-linear)
+MAX_VIDEOS = int(os.getenv('VIDEO_MAX_STORED', 20000))
+
+# Fetch cycle: channels and topic searches run on a bounded pool; YouTube requests
+# share one per-host token bucket instead of a fixed sleep per channel
+FETCH_WORKERS = int(os.getenv('VIDEO_FETCH_WORKERS', 6))
+YOUTUBE_RATE = float(os.getenv('VIDEO_YOUTUBE_RATE', 2.0))
+YOUTUBE_BURST = float(os.getenv('VIDEO_YOUTUBE_BURST', 3))
+YOUTUBE_HOST = 'www.youtube.com'
+
+# Fuzzy-title LSH: char 3-gram MinHash, 20 bands x 3 rows. Titles that difflib
+# would call duplicates (ratio > 0.85) almost always share a band; only those
+# candidates are compared with difflib.
+TITLE_HASHER = MinHasher(num_perm=60, bands=20, shingler=char_shingles)
+
+# [TOPIC MASK] Every stored video carries a bitmask of the topics its title/channel
+# match (bit 0 = priority content), so strict-topic cleanup is one SQL DELETE.
+# Bits are assigned per topic name once and persisted (topic_bits table).
+PRIORITY_BIT = 1
+PRIORITY_KEYWORDS = ['jesus redeems', 'mohan c lazarus', 'jrm']
+TOPIC_EXTRA_KEYWORDS = {
+    # Also count common christian terms when Christianity is active
+    "Christianity": ['church', 'jesus', 'christ', 'gospel', 'worship', 'pastor', 'bible'],
+}
+MAX_TOPIC_BITS = 62  # SQLite integers are signed 64-bit
 
 # Curated Channel Modules
 # "Christianity" Module (Default)
@@ -129,19 +159,30 @@ TARGET_TOPICS = [
     "Jesus Redeems Testimony"
 ]
 
+def _normalize_title(title):
+    """Lowercase alphanumerics only (what the fuzzy dedup compares)."""
+    return "".join(e for e in (title or '').lower() if e.isalnum())
+
+def _video_text(item):
+    """Near-dup key for videos: the title (re-uploads differ in channel, not title)."""
+    return item.get('title', '')
+
 class VideoEngine:
     def __init__(self):
+        self.db = get_database(DB_FILE)
+        self._topic_bits = {}
+        self._topic_matcher = None
+        self._topic_lock = threading.Lock()
+        self._channel_seen = {}   # channel -> newest video id seen last cycle
         self._init_db()
         self.stop_event = threading.Event()
+        topic_manager.add_listener(self._on_topics_changed)
         self.cleanup_irrelevant_videos() # [Fix] Clean on startup
 
     def _init_db(self):
-        """Initialize the SQLite database. Creates if not exists."""
-        conn = sqlite3.connect(DB_FILE, timeout=30.0, check_same_thread=False)
-        c = conn.cursor()
-        # [CRITICAL] Enable WAL mode
-        c.execute('PRAGMA journal_mode=WAL;')
-        c.execute('''
+        """Initialize the SQLite database (append-only migration steps)."""
+        self.db.migrate('videos', [
+            '''
             CREATE TABLE IF NOT EXISTS videos (
                 id TEXT PRIMARY KEY,
                 title TEXT,
@@ -153,20 +194,186 @@ class VideoEngine:
                 timestamp REAL,
                 is_approved INTEGER DEFAULT 1
             )
-        ''')
-        conn.commit()
-        conn.close()
+            ''',
+            # Very old DBs predate moderation
+            add_column('videos', 'is_approved', 'INTEGER DEFAULT 1'),
+            # [FUZZY INDEX] Normalized titles + LSH band keys for sub-linear dedup
+            add_column('videos', 'norm_title', 'TEXT'),
+            "CREATE INDEX IF NOT EXISTS idx_videos_norm_title ON videos(norm_title)",
+            '''
+            CREATE TABLE IF NOT EXISTS video_lsh (
+                band INTEGER,
+                key INTEGER,
+                video_id TEXT,
+                PRIMARY KEY (band, key, video_id)
+            ) WITHOUT ROWID
+            ''',
+            "CREATE INDEX IF NOT EXISTS idx_video_lsh_video ON video_lsh(video_id)",
+            '''
+            CREATE TRIGGER IF NOT EXISTS trg_videos_lsh_delete AFTER DELETE ON videos
+            BEGIN
+                DELETE FROM video_lsh WHERE video_id = old.id;
+            END
+            ''',
+            # Feed query (is_approved = 1 ORDER BY timestamp DESC LIMIT n) walks this index in order
+            "CREATE INDEX IF NOT EXISTS idx_videos_approved_ts ON videos(is_approved, timestamp DESC)",
+            # Admin listing / oldest-first trimming
+            "CREATE INDEX IF NOT EXISTS idx_videos_ts ON videos(timestamp)",
+            # Keyword filters (topic feeds, strict-topic cleanup, admin search) via FTS5 + BM25
+            fts_index('videos', ['title', 'channel']),
+            # [TOPIC MASK] NULL = not classified yet (never deleted by cleanup)
+            add_column('videos', 'topic_mask', 'INTEGER'),
+            '''
+            CREATE TABLE IF NOT EXISTS topic_bits (
+                topic TEXT PRIMARY KEY,
+                bit INTEGER UNIQUE
+            )
+            ''',
+            # Newest upload per channel, so unchanged channels yield no candidates
+            '''
+            CREATE TABLE IF NOT EXISTS channel_state (
+                channel TEXT PRIMARY KEY,
+                last_video_id TEXT,
+                last_checked REAL
+            )
+            ''',
+            # Topic keyword filters keep substring semantics ("news" in "CBSNews") via trigrams
+            fts_index('videos', ['title', 'channel'], tokenize='trigram', name='videos_kw'),
+        ])
+        self._channel_seen = {r[0]: r[1] for r in self.db.query("SELECT channel, last_video_id FROM channel_state")}
+        self.fts = self.db.has_table('videos_fts')
+        self.kw_index = self.db.has_table('videos_kw')
+        self._topic_bits = {}
+        self._topic_matcher = None
+        self._sync_topic_bits()
+        self.db.transaction(self._backfill_title_index)
+
+    def _backfill_title_index(self, conn):
+        """Index rows saved before the fuzzy-title index existed."""
+        rows = conn.execute("SELECT id, title FROM videos WHERE norm_title IS NULL").fetchall()
+        if not rows:
+            return
+        print(f"🧬 [VideoEngine] Indexing {len(rows)} existing titles for fuzzy dedup...")
+        for i in range(0, len(rows), 1000):
+            batch = rows[i:i + 1000]
+            norms = [_normalize_title(title) for _, title in batch]
+            conn.executemany("UPDATE videos SET norm_title = ? WHERE id = ?", [(n, vid) for n, (vid, _) in zip(norms, batch)])
+            self._index_titles(conn, [vid for vid, _ in batch], norms)
+
+    def _on_topics_changed(self, active):
+        self._sync_topic_bits()
+        # Uploads skipped as off-topic may match now: re-read every channel's recent videos
+        self._forget_channel_markers()
+
+    def _forget_channel_markers(self):
+        self._channel_seen = {}
+        self.db.execute("DELETE FROM channel_state", wait=False)
+
+    # --- Topic classification ---
+
+    def _sync_topic_bits(self):
+        """
+        Give every known topic (active or not) a bit, then classify: new topics are
+        matched against already-classified rows, unclassified rows get a full mask.
+        Cheap no-op when nothing changed.
+        """
+        with self._topic_lock:
+            try:
+                self.db.transaction(self._classify_topics)
+            except Exception as e:
+                print(f"⚠️ [VideoEngine] Topic classification failed: {e}")
+
+    def _classify_topics(self, conn):
+        bits = {topic: bit for topic, bit in conn.execute("SELECT topic, bit FROM topic_bits")}
+        new_topics = [t for t in topic_manager.get_topics() if t not in bits]
+        next_bit = max(bits.values(), default=0) + 1
+        for topic in new_topics:
+            if next_bit > MAX_TOPIC_BITS:
+                print(f"⚠️ [VideoEngine] No topic bit left for '{topic}'; its videos are only kept via other topics.")
+                break
+            conn.execute("INSERT INTO topic_bits (topic, bit) VALUES (?, ?)", (topic, next_bit))
+            bits[topic] = next_bit
+            next_bit += 1
+        added = [t for t in new_topics if t in bits]
+        matcher = self._topic_matcher
+        if bits != self._topic_bits or matcher is None:
+            matcher = self._build_topic_matcher(bits)
+
+        # A new topic only adds its own bit to rows classified before it existed
+        if added:
+            added_matcher = self._build_topic_matcher({t: bits[t] for t in added})
+            updates = []
+            for vid, title, channel in conn.execute("SELECT id, title, channel FROM videos WHERE topic_mask IS NOT NULL"):
+                mask = self._mask_of(added_matcher, title, channel) & ~PRIORITY_BIT
+                if mask:
+                    updates.append((mask, vid))
+            conn.executemany("UPDATE videos SET topic_mask = topic_mask | ? WHERE id = ?", updates)
+            if updates:
+                print(f"🏷️ [VideoEngine] New topic bits for {added}: {len(updates)} stored videos match.")
+
+        rows = conn.execute("SELECT id, title, channel FROM videos WHERE topic_mask IS NULL").fetchall()
+        if rows:
+            conn.executemany("UPDATE videos SET topic_mask = ? WHERE id = ?",
+                             [(self._mask_of(matcher, title, channel), vid) for vid, title, channel in rows])
+            print(f"🏷️ [VideoEngine] Classified {len(rows)} stored videos by topic.")
+
+        # Swapped on the writer thread, so inserts queued after this see the new bits
+        self._topic_bits = bits
+        self._topic_matcher = matcher
+
+    @staticmethod
+    def _build_topic_matcher(bits):
+        categories = {PRIORITY_BIT: PRIORITY_KEYWORDS}
+        for topic, bit in bits.items():
+            categories[1 << bit] = [topic.lower()] + TOPIC_EXTRA_KEYWORDS.get(topic, [])
+        return KeywordMatcher(categories)
+
+    @staticmethod
+    def _mask_of(matcher, title, channel):
+        """Topic bitmask for one video (same substring rules the old Python cleanup used)."""
+        counts = matcher.counts(matcher.find(((title or '') + ' ' + (channel or '')).lower()))
+        mask = 0
+        for flag, n in counts.items():
+            if n:
+                mask |= flag
+        return mask
+
+    def _topic_mask(self, title, channel):
+        matcher = self._topic_matcher
+        return self._mask_of(matcher, title, channel) if matcher else None
+
+    def _title_bands(self, norm_titles):
+        """LSH band keys per normalized title (None for empty titles)."""
+        sigs, valid = TITLE_HASHER.signatures(norm_titles)
+        keys = TITLE_HASHER.band_keys(sigs).tolist()
+        return [k if ok else None for k, ok in zip(keys, valid)]
+
+    def _index_titles(self, conn, video_ids, norm_titles, bands=None):
+        bands = bands or self._title_bands(norm_titles)
+        conn.executemany(
+            "INSERT OR IGNORE INTO video_lsh (band, key, video_id) VALUES (?, ?, ?)",
+            [(b, key, vid) for vid, keys in zip(video_ids, bands) if keys for b, key in enumerate(keys)]
+        )
 
     def reset_database(self):
         """Wipes and recreates the database for a fresh start."""
         print("⚠️ [VideoEngine] RESETTING DATABASE...")
-        if os.path.exists(DB_FILE):
-             try:
-                 os.remove(DB_FILE)
-             except Exception as e:
-                 print(f"❌ [VideoEngine] Failed to delete DB: {e}")
+        # Connections are long-lived now, so drop the tables instead of deleting the file
+        def wipe(conn):
+            conn.execute("DROP TABLE IF EXISTS video_lsh")
+            conn.execute("DROP TABLE IF EXISTS videos_fts")
+            conn.execute("DROP TABLE IF EXISTS videos_kw")
+            conn.execute("DROP TABLE IF EXISTS topic_bits")
+            conn.execute("DROP TABLE IF EXISTS channel_state")
+            conn.execute("DROP TABLE IF EXISTS videos")
+            conn.execute("DELETE FROM schema_migrations WHERE component = 'videos'")
+        try:
+            self.db.transaction(wipe)
+        except Exception as e:
+            print(f"❌ [VideoEngine] Failed to wipe DB: {e}")
         
         self._init_db()
+        feed_snapshots.invalidate('videos')
         print("✅ [VideoEngine] Database reset complete.")
 
     def start_background_worker(self):
@@ -185,54 +392,18 @@ class VideoEngine:
         if not active_topics: return # If no strict control, leave as is (or default cleanup)
         
         print(f"🧹 [VideoEngine] Cleaning videos not matching: {active_topics}")
+        self._sync_topic_bits()
+        keep = PRIORITY_BIT
+        for topic in active_topics:
+            if topic in self._topic_bits:
+                keep |= 1 << self._topic_bits[topic]
         try:
-            conn = sqlite3.connect(DB_FILE, timeout=30.0, check_same_thread=False)
-            c = conn.cursor()
-            
-            # Simple retrieval to filter in python (easier than complex SQL LIKEs)
-            c.execute("SELECT id, title, channel FROM videos") 
-            
-            rows = c.fetchall()
-            ids_to_delete = []
-            
-            priority_keywords = ['jesus redeems', 'mohan c lazarus', 'jrm']
-            # Re-use topic keywords logic or just strict topic match?
-            # User wants strict control.
-            
-            for r in rows:
-                vid, title, channel = r[0], r[1], r[2] 
-                text = (title + ' ' + channel).lower()
-                
-                # SAVE JRM
-                if any(k in text for k in priority_keywords):
-                    continue
-                    
-                # Check match
-                matched = False
-                for t in active_topics:
-                    if t.lower() in text:
-                        matched = True
-                        break
-                
-                # Also check common christian terms if Christianity is active
-                if not matched and "Christianity" in active_topics:
-                     christian_terms = ['church', 'jesus', 'christ', 'gospel', 'worship', 'pastor', 'bible']
-                     if any(ct in text for ct in christian_terms):
-                         matched = True
-                
-                if not matched:
-                    ids_to_delete.append(vid)
-            
-            if ids_to_delete:
-                print(f"🧹 [VideoEngine] Deleting {len(ids_to_delete)} irrelevant videos...")
-                # Chunk deletions
-                for i in range(0, len(ids_to_delete), 50):
-                    batch = ids_to_delete[i:i+50]
-                    placeholders = ','.join('?' * len(batch))
-                    c.execute(f"DELETE FROM videos WHERE id IN ({placeholders})", batch)
-                conn.commit()
-            
-            conn.close()
+            # Set-based: rows are classified on insert, so no Python pass over the table.
+            # (NULL masks - not classified yet - never match and are kept.)
+            deleted = self.db.execute("DELETE FROM videos WHERE topic_mask & ? = 0", (keep,))
+            if deleted:
+                print(f"🧹 [VideoEngine] Deleted {deleted} irrelevant videos.")
+                feed_snapshots.invalidate('videos')
         except Exception as e:
             print(f"⚠️ [VideoEngine] Cleanup error: {e}")
 
@@ -278,35 +449,30 @@ class VideoEngine:
 
         print(f"🔄 [VideoEngine] Fetching from {len(target_channels)} channels (Topics: {active_topics})...")
 
-        # 1. Fetch from Channels
-        for channel in target_channels:
-            try:
-                # [ENHANCED] Try channel fetch, fallback to search if channel blocked/failing
-                try:
-                    videos = scrapetube.get_channel(channel_username=channel, limit=3)
-                    processed = self._process_videos(videos, source_tag="Channel")
-                    if not processed: raise Exception("No videos in channel stream")
-                    new_items.extend(processed)
-                except Exception:
-                    # Fallback to search for the channel name
-                    search_query = channel if channel != "jesusredeems" else "Jesus Redeems Ministries"
-                    videos = scrapetube.get_search(search_query, limit=3)
-                    processed = self._process_videos(videos, source_tag="ChannelFallback")
-                    new_items.extend(processed)
-            except Exception: pass
-            time.sleep(1.0) # Be polite
-
-        # 2. Fetch from Topics (Multilingual: En, Ta, Hi)
+        # 1. Channels + 2. Topics (Multilingual: En, Ta, Hi), fetched concurrently
         base_topics = active_topics or ["Christianity"]
+        searches = []
         for topic in base_topics:
-             try:
-                 # English
-                 new_items.extend(self._process_videos(scrapetube.get_search(f"{topic} latest", limit=5), f"Topic-En:{topic}"))
-                 # Tamil
-                 new_items.extend(self._process_videos(scrapetube.get_search(f"{topic} Tamil", limit=3), f"Topic-Ta:{topic}"))
-                 # Hindi
-                 new_items.extend(self._process_videos(scrapetube.get_search(f"{topic} Hindi", limit=3), f"Topic-Hi:{topic}"))
-             except Exception: pass
+            searches += [(f"{topic} latest", 5, f"Topic-En:{topic}"),
+                         (f"{topic} Tamil", 3, f"Topic-Ta:{topic}"),
+                         (f"{topic} Hindi", 3, f"Topic-Hi:{topic}")]
+
+        started = time.time()
+        seen = {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+            channel_jobs = {executor.submit(self._fetch_channel, channel): channel for channel in target_channels}
+            search_jobs = [executor.submit(self._fetch_search, *s) for s in searches]
+            for future in concurrent.futures.as_completed(list(channel_jobs) + search_jobs):
+                try:
+                    items, newest = future.result()
+                except Exception:
+                    continue
+                new_items.extend(items)
+                if future in channel_jobs and newest:
+                    seen[channel_jobs[future]] = newest
+
+        unchanged = sum(1 for c in target_channels if c in seen and seen[c] == self._channel_seen.get(c))
+        print(f"📡 [VideoEngine] Fetched {len(target_channels)} channels ({unchanged} unchanged) + {len(searches)} searches in {time.time() - started:.1f}s.")
 
         # 3. Deduplicate and Save
         if new_items:
@@ -315,6 +481,50 @@ class VideoEngine:
         else:
             print("⚠️ [VideoEngine] No videos found this cycle.")
 
+        # Only advance channel markers once their uploads are stored
+        if seen:
+            self._channel_seen.update(seen)
+            now = time.time()
+            self.db.executemany("INSERT OR REPLACE INTO channel_state (channel, last_video_id, last_checked) VALUES (?, ?, ?)",
+                                [(c, vid, now) for c, vid in seen.items()], wait=False)
+
+    def _fetch_channel(self, channel):
+        """
+        Newest uploads of one channel -> (videos not seen last cycle, newest id).
+        Falls back to a search for the channel name if the channel stream fails.
+        """
+        try:
+            # [ENHANCED] Try channel fetch, fallback to search if channel blocked/failing
+            try:
+                http_client.pace(YOUTUBE_HOST, rate=YOUTUBE_RATE, burst=YOUTUBE_BURST)
+                processed = self._process_videos(scrapetube.get_channel(channel_username=channel, limit=3), source_tag="Channel")
+                if not processed: raise Exception("No videos in channel stream")
+            except Exception:
+                # Fallback to search for the channel name
+                search_query = channel if channel != "jesusredeems" else "Jesus Redeems Ministries"
+                return self._fetch_search(search_query, 3, "ChannelFallback")
+        except Exception:
+            return [], None
+
+        # Channel streams are newest-first: everything from the last seen upload on is already stored,
+        # unless cleanup or the MAX_VIDEOS trim has deleted that upload since
+        last_seen = self._channel_seen.get(channel)
+        if last_seen and not self.db.query("SELECT 1 FROM videos WHERE id = ?", (last_seen,)):
+            last_seen = None
+        fresh = []
+        for video in processed:
+            if video['id'] == last_seen:
+                break
+            fresh.append(video)
+        return fresh, processed[0]['id']
+
+    def _fetch_search(self, query, limit, source_tag):
+        try:
+            http_client.pace(YOUTUBE_HOST, rate=YOUTUBE_RATE, burst=YOUTUBE_BURST)
+            return self._process_videos(scrapetube.get_search(query, limit=limit), source_tag), None
+        except Exception:
+            return [], None
+
     def _process_videos(self, video_generator, source_tag=""):
         """Normalizes video data from scrapetube generators."""
         results = []
@@ -366,96 +576,88 @@ class VideoEngine:
             pass
         return results
 
-    def _is_fuzzy_duplicate(self, title, existing_titles, threshold=0.85):
-        """Checks if title is too similar to any existing title."""
-        # Normalize: lowercase, remove punctuation for comparison
-        norm_title = "".join(e for e in title.lower() if e.isalnum())
-        
+    def _is_fuzzy_duplicate(self, c, norm_title, bands, threshold=0.85):
+        """
+        Checks if a normalized title is too similar to any stored title.
+        Exact matches hit the norm_title index; fuzzy ones only compare
+        against LSH candidates sharing a band, not the whole table.
+        """
         if not norm_title: return False
 
-        for existing in existing_titles:
-            norm_existing = "".join(e for e in existing.lower() if e.isalnum())
-            if not norm_existing: continue
-            
-            # Direct match check
-            if norm_title == norm_existing:
-                return True
-                
-            # Fuzzy match check
-            ratio = difflib.SequenceMatcher(None, norm_title, norm_existing).ratio()
-            if ratio > threshold:
+        # Direct match check
+        if c.execute("SELECT 1 FROM videos WHERE norm_title = ? LIMIT 1", (norm_title,)).fetchone():
+            return True
+
+        if not bands: return False
+        placeholders = ','.join('(?, ?)' for _ in bands)
+        params = [v for band, key in enumerate(bands) for v in (band, key)]
+        candidates = c.execute(f'''
+            SELECT DISTINCT v.norm_title FROM video_lsh l JOIN videos v ON v.id = l.video_id
+            WHERE (l.band, l.key) IN (VALUES {placeholders})
+        ''', params).fetchall()
+
+        # Fuzzy match check (difflib only on candidates; cheap upper bounds first)
+        for (candidate,) in candidates:
+            if not candidate: continue
+            matcher = difflib.SequenceMatcher(None, norm_title, candidate)
+            if matcher.real_quick_ratio() > threshold and matcher.quick_ratio() > threshold and matcher.ratio() > threshold:
                 return True
         return False
 
     def _save_to_db(self, videos):
         """Saves videos with strict deduplication."""
-        conn = sqlite3.connect(DB_FILE, timeout=60.0, check_same_thread=False)
-        # Handle 'is_approved' column check/migration just in case
-        try:
-             conn.execute("SELECT is_approved FROM videos LIMIT 1")
-        except:
-             try: conn.execute("ALTER TABLE videos ADD COLUMN is_approved INTEGER DEFAULT 1")
-             except: pass
-        
-        # Get existing titles for fuzzy dedup
-        existing_rows = conn.execute("SELECT title FROM videos").fetchall()
-        existing_titles = [r[0] for r in existing_rows]
-        
-        c = conn.cursor()
-        saved_count = 0
-        
-        for v in videos:
-            # 1. Check ID existence (Absolute Duplicate)
-            c.execute("SELECT id FROM videos WHERE id=?", (v['id'],))
-            if c.fetchone():
-                continue # Skip ID duplicates
-            
-            # 2. Check Fuzzy Title (Near Duplicate)
-            if self._is_fuzzy_duplicate(v['title'], existing_titles):
-                # print(f"  [Dedup] Skipping similar: {v['title']}")
-                continue
-
-            # 3. Insert
-            c.execute('''
-                INSERT INTO videos (id, title, url, thumbnail, channel, views, published, timestamp, is_approved)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, 1)
-            ''', (v['id'], v['title'], v['url'], v['thumbnail'], v['channel'], v['views'], v['published'], v['timestamp']))
-            
-            existing_titles.append(v['title']) # Update local list for subsequent checks in this batch
-            saved_count += 1
-            
-        conn.commit()
-        
-        # Cleanup: Keep max 200 videos, delete oldest
-        c.execute("SELECT COUNT(*) FROM videos")
-        count = c.fetchone()[0]
-        if count > 200:
-            limit = count - 200
-            c.execute("DELETE FROM videos WHERE id IN (SELECT id FROM videos ORDER BY timestamp ASC LIMIT ?)", (limit,))
-            conn.commit()
-
-        conn.close()
+        norm_titles = [_normalize_title(v['title']) for v in videos]
+        all_bands = self._title_bands(norm_titles)
+
+        # Check-then-insert runs as one transaction on the DB writer thread
+        def save(c):
+            saved_count = 0
+            for v, norm_title, bands in zip(videos, norm_titles, all_bands):
+                # 1. Check ID existence (Absolute Duplicate)
+                if c.execute("SELECT 1 FROM videos WHERE id=?", (v['id'],)).fetchone():
+                    continue # Skip ID duplicates
+                
+                # 2. Check Fuzzy Title (Near Duplicate) - also sees rows inserted earlier in this batch
+                if self._is_fuzzy_duplicate(c, norm_title, bands):
+                    # print(f"  [Dedup] Skipping similar: {v['title']}")
+                    continue
+
+                # 3. Insert
+                c.execute('''
+                    INSERT INTO videos (id, title, url, thumbnail, channel, views, published, timestamp, is_approved, norm_title, topic_mask)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, 1, ?, ?)
+                ''', (v['id'], v['title'], v['url'], v['thumbnail'], v['channel'], v['views'], v['published'], v['timestamp'], norm_title,
+                      self._topic_mask(v['title'], v['channel'])))
+                self._index_titles(c, [v['id']], [norm_title], [bands])
+                saved_count += 1
+
+            # Cleanup: Keep max MAX_VIDEOS videos, delete oldest (trigger drops their LSH rows)
+            count = c.execute("SELECT COUNT(*) FROM videos").fetchone()[0]
+            if count > MAX_VIDEOS:
+                limit = count - MAX_VIDEOS
+                c.execute("DELETE FROM videos WHERE id IN (SELECT id FROM videos ORDER BY timestamp ASC LIMIT ?)", (limit,))
+            return saved_count
+
+        saved_count = self.db.transaction(save)
         if saved_count > 0:
             print(f"✅ [VideoEngine] Saved {saved_count} new videos to DB.")
+            feed_snapshots.invalidate('videos')
 
     def get_trending(self, limit=50):
         """Fetch videos for the Feed (Approved Only)."""
-        conn = sqlite3.connect(DB_FILE, timeout=60.0, check_same_thread=False)
-        conn.row_factory = sqlite3.Row
-        c = conn.cursor()
         try:
-            c.execute("SELECT * FROM videos WHERE is_approved = 1 ORDER BY timestamp DESC LIMIT ?", (limit,))
-            rows = c.fetchall()
+            rows = self.db.query("SELECT * FROM videos WHERE is_approved = 1 ORDER BY timestamp DESC LIMIT ?", (limit,))
         except Exception:
             rows = []
-        conn.close()
         
         if not rows:
              pass 
              
         # Convert to dicts
-        all_videos = [dict(row) for row in rows]
-        
+        return self._feed_order([dict(row) for row in rows])
+
+    def _feed_order(self, all_videos):
+        """Feed presentation: JRM first, then newest; near-dup collapse; geo-sort."""
         # --- PRIORITY BOOST: Jesus Redeems Ministries ---
         priority_keywords = ['jesus redeems', 'mohan c lazarus', 'mohan c. lazarus']
         
@@ -471,29 +673,59 @@ class VideoEngine:
         all_videos.sort(key=lambda x: (get_priority_score(x), x.get('timestamp', 0)), reverse=True)
         # ------------------------------------------------
         
+        # Collapse re-uploads / near-identical titles (best-first: priority, then newest)
+        all_videos = near_deduplicate(all_videos, text_of=_video_text)
+
         # Apply Geo-Sorting
         sorter = GeoSorter()
         return sorter.sort_results(all_videos)
 
-    def get_all_videos(self):
-        """Admin: Fetch all videos."""
-        conn = sqlite3.connect(DB_FILE, timeout=60.0, check_same_thread=False)
-        conn.row_factory = sqlite3.Row
-        c = conn.cursor()
+    def search_library(self, match, limit=50, order='rank', approved_only=True, keywords=None):
+        """
+        [library] Stored videos matching an FTS5 expression (see db.fts_match)
+        and/or containing any of `keywords` as a substring (title or channel).
+        order='rank': BM25, title weighted over channel. order='recent': feed presentation
+        of the newest matches (same ordering as get_trending).
+        """
+        if (match and not self.fts) or not (match or keywords):
+            return []
+        where, params = [], []
+        if match:
+            where.append("videos_fts MATCH ?")
+            params.append(match)
+        if keywords:
+            sql, like_params = contains_any(['v.title', 'v.channel'], keywords,
+                                            'videos_kw' if self.kw_index else None, 'v.rowid')
+            where.append(sql)
+            params.extend(like_params)
+        if approved_only:
+            where.append("v.is_approved = 1")
+        order_by = "bm25(videos_fts, 5.0, 1.0)" if order == 'rank' and match else "v.timestamp DESC"
+        source = "videos_fts JOIN videos v ON v.rowid = videos_fts.rowid" if match else "videos v"
+        try:
+            rows = self.db.query(f'''
+                SELECT v.* FROM {source}
+                WHERE {' AND '.join(where)} ORDER BY {order_by} LIMIT ?
+            ''', params + [limit])
+        except Exception as e:
+            print(f"⚠️ [VideoEngine] Library search failed: {e}")
+            return []
+        videos = [dict(row) for row in rows]
+        return self._feed_order(videos) if order == 'recent' else videos
+
+    def get_all_videos(self, query=None):
+        """Admin: Fetch all videos (or the best BM25 matches for `query`)."""
+        if query:
+            return self.search_library(fts_match(query), limit=200, approved_only=False)
         try:
-            c.execute("SELECT * FROM videos ORDER BY timestamp DESC")
-            rows = c.fetchall()
+            rows = self.db.query("SELECT * FROM videos ORDER BY timestamp DESC")
         except: rows = []
-        conn.close()
         return [dict(row) for row in rows]
 
     def toggle_approval(self, video_id, status):
         """Admin: Toggle approval."""
-        conn = sqlite3.connect(DB_FILE, timeout=60.0, check_same_thread=False)
-        c = conn.cursor()
-        c.execute("UPDATE videos SET is_approved = ? WHERE id = ?", (1 if status else 0, video_id))
-        conn.commit()
-        conn.close()
+        self.db.execute("UPDATE videos SET is_approved = ? WHERE id = ?", (1 if status else 0, video_id))
+        feed_snapshots.invalidate('videos')
         return True
 
     def search(self, query, limit=50, lang='en', apply_strict=True):
@@ -624,6 +856,7 @@ class VideoEngine:
             return 1
             
         unique_results.sort(key=lambda x: (get_priority_score(x), x.get('timestamp', 0)), reverse=True)
+        unique_results = near_deduplicate(unique_results, text_of=_video_text)
 
         # Apply Geo-Sorting
         sorter = GeoSorter()
@@ -0,0 +1,10 @@
+import os
+import tempfile
+
+# Module singletons (feed_snapshots, feed_poller, url_resolver, ...) open their
+# database on import: point them at a scratch directory before any src import.
+_scratch = tempfile.mkdtemp(prefix='gyan-tests-')
+os.environ.setdefault('NEWS_DB_FILE', os.path.join(_scratch, 'news.db'))
+os.environ.setdefault('VIDEOS_DB_FILE', os.path.join(_scratch, 'videos.db'))
+os.environ.setdefault('SEARCH_CACHE_DB', os.path.join(_scratch, 'search_cache.db'))
+os.environ.setdefault('EMBED_DISK_CACHE_DIR', os.path.join(_scratch, 'embedding_cache'))
@@ -0,0 +1,79 @@
+import math
+
+import numpy as np
+
+from src.bm25_index import BM25Index, tokenize
+
+
+def _reference_bm25(query, corpus, texts, k1=1.5, b=0.75):
+    """Textbook BM25 (non-negative IDF) over the distinct documents in `corpus`."""
+    docs = [tokenize(t) for t in dict.fromkeys(corpus)]
+    n, avgdl = len(docs), sum(map(len, docs)) / len(docs)
+    out = []
+    for text in texts:
+        tokens = tokenize(text)
+        score = 0.0
+        for term in set(tokenize(query)):
+            df = sum(1 for d in docs if term in d)
+            if not df:
+                continue
+            idf = math.log((n - df + 0.5) / (df + 0.5) + 1.0)
+            tf = tokens.count(term)
+            score += idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * len(tokens) / avgdl))
+        out.append(score)
+    return out
+
+
+def test_tokenize_drops_stop_words_and_keeps_unicode():
+    assert tokenize("The Church in Chennai, a சபை!") == ['church', 'chennai', 'சபை']
+
+
+def test_tokenize_splits_at_danda():
+    assert tokenize("चुनाव। नतीजे॥") == ['चुनाव', 'नतीजे']
+
+
+def test_scores_match_reference():
+    history = ["Pastor arrested in Tamil Nadu", "Church attack in Odisha", "Cricket final tonight"]
+    candidates = ["Church leaders meet pastor", "Pastor pastor church", "Weather update"]
+    index = BM25Index()
+    index.add(history)
+    scores = index.score("church pastor", candidates)
+    expected = _reference_bm25("church pastor", history + candidates, candidates)
+    np.testing.assert_allclose(scores, expected, rtol=1e-5)
+
+
+def test_repeated_documents_count_once():
+    index = BM25Index()
+    index.add(["church news", "church news", "other story"])
+    index.score("church", ["church news"])
+    assert index.stats()['documents'] == 2
+
+
+def test_unknown_query_terms_score_zero():
+    index = BM25Index()
+    assert index.score("vatican", ["church news", "other"]).tolist() == [0.0, 0.0]
+    assert index.score("church", []).shape == (0,)
+
+
+def test_compaction_keeps_newest_documents_and_bounds_vocabulary():
+    index = BM25Index(max_rows=8, max_vocab=1000)
+    index.add([f"story{i} common" for i in range(8)])
+    index.add(["church common", "pastor common"])
+
+    stats = index.stats()
+    assert stats['compactions'] == 1
+    assert stats['documents'] == stats['matrix_rows'] == 4  # Newest 2 of the first 8 + the new 2
+    assert set(index.vocab) == {'story6', 'story7', 'common', 'church', 'pastor'}
+
+    candidates = ["church common", "story7 common"]
+    expected = _reference_bm25("church common", ["story6 common", "story7 common", "church common", "pastor common"],
+                               candidates)
+    np.testing.assert_allclose(index.score("church common", candidates), expected, rtol=1e-5)
+
+
+def test_vocabulary_limit_triggers_compaction():
+    index = BM25Index(max_rows=1000, max_vocab=10)
+    for i in range(20):
+        index.add([f"alpha{i} beta{i} gamma{i}"])
+    assert len(index.vocab) <= 13
+    assert index.stats()['compactions'] > 0
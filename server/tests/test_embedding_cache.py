@@ -0,0 +1,45 @@
+import pytest
+
+import src.embedding_cache as embedding_cache
+from src.embedding_cache import EmbeddingCache
+
+
+@pytest.fixture(autouse=True)
+def small_files(monkeypatch):
+    monkeypatch.setattr(embedding_cache, 'GROW_ROWS', 2)
+
+
+def _index(cache):
+    return {row['key']: row['row'] for row in cache.db.query("SELECT key, row FROM embedding_rows")}
+
+
+def test_round_trip_and_reload(tmp_path):
+    cache = EmbeddingCache('model', cache_dir=str(tmp_path), capacity=8)
+    cache.put_many({'a': [1.0, 2.0], 'b': [3.0, 4.0], 'c': [5.0, 6.0]})
+    assert cache.get_many(['a', 'c', 'missing']) == {'a': [1.0, 2.0], 'c': [5.0, 6.0]}
+
+    cache.db.execute("SELECT 1")  # Drain queued index writes
+    reloaded = EmbeddingCache('model', cache_dir=str(tmp_path), capacity=8)
+    assert reloaded.get_many(['b']) == {'b': [3.0, 4.0]}
+
+
+def test_evicted_key_leaves_index_before_row_is_reused(tmp_path):
+    cache = EmbeddingCache('model', cache_dir=str(tmp_path), capacity=2)
+    cache.put_many({'a': [1.0], 'b': [2.0]})
+    cache.get_many(['a'])  # 'b' is now least recently used
+    cache.put_many({'c': [3.0]})
+
+    # The eviction was committed synchronously: no index row maps 'b' to c's vector
+    assert 'b' not in _index(cache)
+    assert cache.get_many(['b', 'c']) == {'c': [3.0]}
+    assert cache.stats()['evicted'] == 1
+
+    cache.db.execute("SELECT 1")
+    reloaded = EmbeddingCache('model', cache_dir=str(tmp_path), capacity=2)
+    assert reloaded.get_many(['a', 'b', 'c']) == {'a': [1.0], 'c': [3.0]}
+
+
+def test_model_change_resets(tmp_path):
+    EmbeddingCache('model', cache_dir=str(tmp_path)).put_many({'a': [1.0]})
+    other = EmbeddingCache('other-model', cache_dir=str(tmp_path))
+    assert other.get_many(['a']) == {}
@@ -0,0 +1,52 @@
+import threading
+
+import numpy as np
+
+from src.embedding_service import EmbeddingService, text_key
+
+
+class FakeModel:
+    def __init__(self):
+        self.calls = []
+
+    def embed_documents(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(t)), 0.5] for t in texts]
+
+
+def _service():
+    service = EmbeddingService(disk_cache=False)
+    service._model = FakeModel()
+    return service
+
+
+def test_vectors_are_cached_as_float32_and_returned_as_lists():
+    service = _service()
+    assert service.embed_documents(['ab', 'abc', 'ab']) == [[2.0, 0.5], [3.0, 0.5], [2.0, 0.5]]
+
+    cached = service._cache[text_key('abc')]
+    assert isinstance(cached, np.ndarray) and cached.dtype == np.float32
+
+    vec = service.embed_query('abc')
+    vec.append(99.0)  # Callers get their own lists
+    assert service.embed_query('abc') == [3.0, 0.5]
+    assert service._model.calls == [['ab', 'abc']]
+
+
+def test_concurrent_first_calls_start_one_batcher(monkeypatch):
+    service = _service()
+    started = []
+    monkeypatch.setattr(service, '_batch_loop', lambda: started.append(1))
+    barrier = threading.Barrier(16)
+
+    def start():
+        barrier.wait()
+        service._start_batcher()
+
+    threads = [threading.Thread(target=start) for _ in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    service._batcher.join()
+    assert started == [1]
@@ -0,0 +1,61 @@
+import json
+import time
+
+import pytest
+
+import src.feed_snapshots as feed_snapshots_module
+from src.feed_snapshots import FeedSnapshots
+
+
+@pytest.fixture
+def snapshots(tmp_path):
+    store = FeedSnapshots(db_file=str(tmp_path / 'news.db'))
+    builds = []
+
+    def builder(lang, topics):
+        builds.append((lang, tuple(topics)))
+        return [{'lang': lang, 'topics': topics}]
+
+    store.register('news', builder)
+    store.builds = builds
+    return store
+
+
+def _rows(store):
+    store.db.execute("SELECT 1")  # Drain queued writes
+    return store.db.query("SELECT kind, lang, topics FROM feed_snapshots ORDER BY lang")
+
+
+def test_get_builds_once_and_serves_bytes(snapshots):
+    first = snapshots.get('news', 'en', ['Sports', 'Christianity'])
+    second = snapshots.get('news', 'en', ['Christianity', 'Sports'])
+    assert first == second
+    assert json.loads(first) == [{'lang': 'en', 'topics': ['Christianity', 'Sports']}]
+    assert snapshots.builds == [('en', ('Christianity', 'Sports'))]
+
+
+def test_unsupported_lang_falls_back_to_en(snapshots):
+    snapshots.get('news', 'en', [])
+    for lang in ('xx', '../../etc', None, ''):
+        snapshots.get('news', lang, [])
+    assert snapshots.builds == [('en', ())]
+    assert [tuple(r) for r in _rows(snapshots)] == [('news', 'en', '[]')]
+
+
+def test_evicted_snapshots_leave_the_table(snapshots, monkeypatch):
+    monkeypatch.setattr(feed_snapshots_module, 'MAX_SNAPSHOTS', 2)
+    for lang in ('en', 'ta', 'hi'):
+        snapshots.get('news', lang, [])
+        time.sleep(0.01)
+    assert [r['lang'] for r in _rows(snapshots)] == ['hi', 'ta']
+
+
+def test_old_rows_are_pruned_on_load(tmp_path):
+    store = FeedSnapshots(db_file=str(tmp_path / 'news.db'))
+    store.db.executemany("INSERT INTO feed_snapshots (kind, lang, topics, payload, item_count, built_at) VALUES (?,?,?,?,?,?)", [
+        ('news', 'en', '[]', b'[]', 0, time.time()),
+        ('news', 'ta', '[]', b'[]', 0, time.time() - feed_snapshots_module.SNAPSHOT_RECENT - 1),
+        ('news', 'zz', '[]', b'[]', 0, time.time()),
+    ])
+    reloaded = FeedSnapshots(db_file=str(tmp_path / 'news.db'))
+    assert [tuple(r) for r in _rows(reloaded)] == [('news', 'en', '[]')]
@@ -0,0 +1,34 @@
+import pytest
+
+from src.geo_sorter import GeoSorter
+
+
+@pytest.mark.parametrize('item, tier', [
+    # Plurals and demonyms run on past the gazetteer name
+    ({'title': 'Indians celebrate Christmas'}, 'India'),
+    ({'title': 'Chennaiites brace for cyclone'}, 'Tamil Nadu'),
+    # Compound publisher domains match inside the host
+    ({'title': 'Budget news', 'url': 'https://timesofindia.indiatimes.com/x'}, 'India'),
+    ({'title': 'Rains', 'url': 'https://example.com/news/tamil-nadu-rains'}, 'Tamil Nadu'),
+    # Short, ambiguous names only match as whole words
+    ({'title': 'Dinner in Jerusalem', 'snippet': 'An eroded Athenian wall'}, 'Global'),
+    ({'title': 'Salem church reopens'}, 'Tamil Nadu'),
+    ({'title': 'Rupee vs INR explained'}, 'India'),
+])
+def test_classify_tier(item, tier):
+    assert GeoSorter()._scan(item)[0] == tier
+
+
+def test_longest_name_wins():
+    sorter = GeoSorter()
+    assert sorter._names[sorter._pattern.search('persecution india today').lastindex - 1] == 'persecution india'
+
+
+def test_global_has_no_confidence():
+    assert GeoSorter()._scan({'title': 'Vatican synod opens', 'url': 'https://example.com/a'}) == ('Global', 0.0)
+
+
+def test_sort_results_orders_tiers():
+    results = [{'title': 'Vatican synod'}, {'title': 'Delhi church'}, {'title': 'Madurai festival'}]
+    ordered = GeoSorter().sort_results(results)
+    assert [r['_geo_tier'] for r in ordered] == ['Tamil Nadu', 'India', 'Global']
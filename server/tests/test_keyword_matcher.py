@@ -0,0 +1,48 @@
+import sys
+import threading
+
+from src.keyword_matcher import KeywordMatcher
+
+CATEGORIES = {'faith': ['church', 'gospel', 'holy spirit'], 'sport': ['cricket', 'goal']}
+
+
+def _reference(text):
+    return {k for kws in CATEGORIES.values() for k in kws if k in text}
+
+
+def test_find_matches_plain_substring_semantics():
+    matcher = KeywordMatcher(CATEGORIES)
+    text = 'churches and the holy spirit at the cricketers goalpost'
+    assert matcher.find(text) == _reference(text)
+    assert matcher.find(text) == _reference(text)  # Memoized path
+    assert matcher.counts(matcher.find(text)) == {'faith': 2, 'sport': 2}
+
+
+def test_find_survives_memo_replacement():
+    matcher = KeywordMatcher(CATEGORIES, memo_size=3)
+    for i in range(20):
+        text = f'church{i} word{i} goal{i}'
+        assert matcher.find(text) == {'church', 'goal'}
+
+
+def test_concurrent_finds_never_lose_hits():
+    old_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # Switch threads often enough to hit the memo replacement
+    matcher = KeywordMatcher(CATEGORIES, memo_size=8)
+    errors = []
+
+    def worker(n):
+        for i in range(2000):
+            text = f'gospel{n}x{i} filler{i} cricket{i % 7}'
+            if matcher.find(text) != {'gospel', 'cricket'}:
+                errors.append(text)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    try:
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        sys.setswitchinterval(old_interval)
+    assert errors == []
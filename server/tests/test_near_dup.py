@@ -0,0 +1,57 @@
+from src.near_dup import NearDuplicateIndex, near_deduplicate, normalize_text, numbers, numbers_conflict
+
+
+def test_syndicated_copies_collapse_into_the_first():
+    items = [
+        {'title': 'Church attacked in Odisha village, three injured', 'snippet': 'Police said on Sunday'},
+        {'title': 'Unrelated cricket final report', 'snippet': 'India won by six wickets'},
+        {'title': 'Church attacked in Odisha village; three injured', 'snippet': 'Police said on Sunday.'},
+    ]
+    kept = near_deduplicate(items)
+    assert [k['title'] for k in kept] == [items[0]['title'], items[1]['title']]
+    assert kept[0]['_near_dups'] == 1
+
+
+def test_rank_decides_the_representative():
+    items = [{'title': 'Pastor arrested in Chennai over prayer meeting', 'rank': 1},
+             {'title': 'Pastor arrested in Chennai over prayer meeting!', 'rank': 5}]
+    kept = near_deduplicate(items, rank_of=lambda i: i['rank'])
+    assert [k['rank'] for k in kept] == [5]
+
+
+def test_empty_texts_are_never_duplicates():
+    items = [{'title': ''}, {'title': ''}, {'title': 'Something'}]
+    assert len(near_deduplicate(items)) == 3
+
+
+def test_index_check_and_add():
+    index = NearDuplicateIndex()
+    assert index.check_and_add('a', 'Bishop visits flood hit Kerala villages') is None
+    assert index.check_and_add('b', 'Bishop visits flood-hit Kerala villages') == 'a'
+    assert index.check_and_add('c', 'Parliament passes new budget bill') is None
+
+
+def test_normalize_text():
+    assert normalize_text('  The Church, in  CHENNAI!! ') == normalize_text('church chennai')
+
+
+def _video_titles(titles):
+    return [k['title'] for k in near_deduplicate([{'title': t} for t in titles], text_of=lambda i: i['title'])]
+
+
+def test_numbered_episodes_are_not_collapsed():
+    titles = ['40 Days of Prayer with Pastor John | Day 12', '40 Days of Prayer with Pastor John | Day 13',
+              'Book of Acts Bible Study Part 1', 'Book of Acts Bible Study Part 2']
+    assert _video_titles(titles) == titles
+
+
+def test_copies_with_the_same_or_added_numbers_still_collapse():
+    titles = ['40 Days of Prayer with Pastor John | Day 12', '40 Days of Prayer with Pastor John - Day 12',
+              'Church attacked in Odisha, 3 injured', 'Church attacked in Odisha, 3 injured on 5 January']
+    assert _video_titles(titles) == [titles[0], titles[2]]
+
+
+def test_numbers_conflict():
+    assert numbers_conflict(numbers('Day 12'), numbers('Day 13'))
+    assert not numbers_conflict(numbers('Day 12'), numbers('Day twelve'))
+    assert not numbers_conflict(numbers('3 injured'), numbers('3 injured on 5 January'))
@@ -0,0 +1,69 @@
+import threading
+
+import pytest
+
+from src.pipeline import StagedPipeline, Stage
+
+
+def _run_in_thread(pipeline, source):
+    outcome = {}
+
+    def run():
+        try:
+            outcome['stats'] = pipeline.run(source)
+        except Exception as e:
+            outcome['error'] = e
+
+    t = threading.Thread(target=run, daemon=True)
+    t.start()
+    t.join(timeout=10)
+    assert not t.is_alive(), "pipeline.run() hung"
+    return outcome
+
+
+def test_stages_transform_drop_expand_and_batch():
+    batches = []
+    pipeline = StagedPipeline([
+        Stage('split', lambda n: range(n), workers=2, expand=True),
+        Stage('double', lambda n: n * 2 if n % 3 else None, workers=3),
+    ], sink=batches.append, batch_size=4, flush_seconds=0.1)
+
+    stats = _run_in_thread(pipeline, [3, 4])['stats']
+
+    assert sorted(x for batch in batches for x in batch) == [2, 2, 4, 4]
+    assert all(len(batch) <= 4 for batch in batches)
+    assert stats['split'] == {'in': 2, 'out': 7, 'errors': 0}
+    assert stats['double'] == {'in': 7, 'out': 4, 'errors': 0}
+    assert stats['sink']['in'] == 4
+
+
+def test_failing_items_and_sink_batches_are_counted():
+    def fragile(n):
+        if n == 2:
+            raise ValueError("bad item")
+        return n
+
+    def sink(batch):
+        if 3 in batch:
+            raise RuntimeError("db down")
+
+    pipeline = StagedPipeline([Stage('fragile', fragile, workers=1)], sink=sink, batch_size=1, flush_seconds=0.1)
+    stats = _run_in_thread(pipeline, [1, 2, 3])['stats']
+
+    assert stats['fragile']['errors'] == 1
+    assert stats['sink'] == {'in': 1, 'batches': 1, 'errors': 1}
+
+
+@pytest.mark.parametrize('stages', [[Stage('identity', lambda x: x, workers=2)], []])
+def test_failing_source_still_closes_the_pipeline(stages):
+    def source():
+        yield 1
+        yield 2
+        raise IOError("feed list unavailable")
+
+    batches = []
+    pipeline = StagedPipeline(stages, sink=batches.append, flush_seconds=0.1)
+    outcome = _run_in_thread(pipeline, source())
+
+    assert isinstance(outcome['error'], IOError)
+    assert sorted(x for batch in batches for x in batch) == [1, 2]
@@ -0,0 +1,110 @@
+import time
+
+import numpy as np
+import pytest
+
+pytest.importorskip('chromadb')
+pytest.importorskip('langchain_text_splitters')
+
+from src import rag_engine
+from src.rag_engine import RAGEngine, partition_name, LEGACY_COLLECTION, _top_k, _mmr
+from src.embedding_service import text_key
+
+
+class FakeEmbeddings:
+    def __init__(self):
+        self.embedded = []
+
+    def embed_documents(self, texts):
+        self.embedded.extend(texts)
+        return [[float(len(t)), 1.0, 0.0] for t in texts]
+
+    def embed_query(self, text):
+        return [float(len(text)), 1.0, 0.0]
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    monkeypatch.setattr(rag_engine.embedding_service, 'ensure_loaded', lambda: False)
+    monkeypatch.setattr(rag_engine.rag_ingest, 'attach', lambda engine: None)
+    engine = RAGEngine(persist_directory=str(tmp_path))
+    engine.embeddings = FakeEmbeddings()
+    return engine
+
+
+def _stored_ids(engine):
+    return set(engine._partition(partition_name()).get(include=[])['ids'])
+
+
+def test_chunk_ids_are_content_hashes(engine):
+    assert engine.ingest("Pastors gather in Madurai", {'type': 'news'}) == 1
+    assert _stored_ids(engine) == {text_key("Pastors gather in Madurai")}
+
+
+def test_repeats_within_a_batch_are_embedded_once(engine):
+    stored = engine.ingest_many([("Same snippet", {'type': 'news'}), ("Same snippet", {'type': 'web'}),
+                                 ("Other snippet", None)])
+    assert stored == 2
+    assert engine.embeddings.embedded == ["Same snippet", "Other snippet"]
+    metadata = engine._partition(partition_name()).get(ids=[text_key("Same snippet")])['metadatas'][0]
+    assert metadata['type'] == 'news'  # First copy keeps its metadata
+
+
+def test_known_chunks_skip_embedding(engine):
+    engine.ingest("Known snippet")
+    engine.embeddings.embedded.clear()
+
+    assert engine.ingest_many([("Known snippet", None), ("New snippet", None)]) == 1
+    assert engine.embeddings.embedded == ["New snippet"]
+    assert engine.counters['chunks_known'] == 1
+    assert engine.counters['chunks_stored'] == 2
+
+
+def test_known_chunks_are_found_in_chroma_after_restart(engine, tmp_path):
+    engine.ingest("Persisted snippet")
+    restarted = RAGEngine(persist_directory=str(tmp_path))
+    restarted.embeddings = FakeEmbeddings()
+
+    assert restarted.ingest("Persisted snippet") == 0
+    assert restarted.embeddings.embedded == []
+
+
+def test_legacy_chunks_are_searched_with_since(engine):
+    # Pre-partitioning chunks carry no ingested_at
+    legacy = engine.client.create_collection(name=LEGACY_COLLECTION)
+    legacy.add(ids=['old-1', 'old-2'], documents=['Old news item', 'Old video'],
+               embeddings=[[13.0, 1.0, 0.0], [9.0, 1.0, 0.0]],
+               metadatas=[{'type': 'news'}, {'type': 'video'}])
+    engine._partitions[LEGACY_COLLECTION] = legacy
+    engine.ingest("Fresh news item", {'type': 'news'})
+
+    hits = engine.search("Some query text", k=5, since=time.time() - 86400, exclude_types=['video'])
+
+    assert [h['content'] for h in hits] == ['Fresh news item', 'Old news item']
+
+
+# --- Ranking ---
+
+def test_top_k_matches_full_argsort():
+    scores = np.random.RandomState(3).rand(50).astype(np.float32)
+    full = np.argsort(-scores, kind='stable')
+    for k in (1, 5, 49, 50, 80):
+        assert _top_k(scores, k).tolist() == full[:k].tolist()
+
+
+def _unit(rows):
+    rows = np.asarray(rows, dtype=np.float32)
+    return rows / np.linalg.norm(rows, axis=1, keepdims=True)
+
+
+def test_mmr_without_diversity_is_top_k():
+    rng = np.random.RandomState(5)
+    vecs, scores = _unit(rng.rand(20, 8)), rng.rand(20).astype(np.float32)
+    assert _mmr(vecs, scores, 5, lam=1.0).tolist() == _top_k(scores, 5).tolist()
+
+
+def test_mmr_skips_a_near_duplicate():
+    vecs = _unit([[1, 0, 0], [1, 0.01, 0], [0, 1, 0], [0, 0, 1]])
+    scores = np.array([0.9, 0.89, 0.6, 0.5], dtype=np.float32)
+    assert _top_k(scores, 2).tolist() == [0, 1]
+    assert _mmr(vecs, scores, 2, lam=0.5).tolist() == [0, 2]
@@ -0,0 +1,68 @@
+import threading
+
+from src.rag_ingest import RagIngestQueue
+
+
+class FakeEngine:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.batches = []
+
+    def ingest_many(self, docs):
+        self.batches.append(list(docs))
+        if self.fail:
+            raise RuntimeError("chroma unavailable")
+        return len(docs)
+
+
+def test_documents_queued_before_attach_are_ingested_in_one_batch():
+    ingest = RagIngestQueue(window=0.05)
+    for i in range(3):
+        assert ingest.submit(f"doc {i}", {'type': 'news'})
+    assert not ingest.submit("")
+
+    engine = FakeEngine()
+    ingest.attach(engine)
+    assert ingest.flush(timeout=5)
+
+    assert engine.batches == [[(f"doc {i}", {'type': 'news'}) for i in range(3)]]
+    stats = ingest.stats()
+    assert (stats['submitted'], stats['ingested_docs'], stats['batches'], stats['depth']) == (3, 3, 1, 0)
+
+
+def test_flush_returns_after_a_failing_batch():
+    engine = FakeEngine(fail=True)
+    ingest = RagIngestQueue(engine, window=0.01)
+    ingest.submit("doc")
+
+    assert ingest.flush(timeout=5)
+    assert ingest.stats()['errors'] == 1
+    assert ingest.stats()['ingested_docs'] == 0
+
+
+def test_full_queue_drops_and_counts(monkeypatch):
+    ingest = RagIngestQueue(maxsize=2)
+    monkeypatch.setattr(ingest, '_ensure_worker', lambda: None)  # Nothing drains the queue
+
+    results = [ingest.submit(f"doc {i}") for i in range(4)]
+
+    assert results == [True, True, False, False]
+    stats = ingest.stats()
+    assert (stats['submitted'], stats['dropped'], stats['depth']) == (2, 2, 2)
+    assert not ingest.flush(timeout=0.05)  # Queued documents are still outstanding
+
+
+def test_concurrent_submits_are_all_ingested():
+    engine = FakeEngine()
+    ingest = RagIngestQueue(engine, batch_docs=16, window=0.01)
+    threads = [threading.Thread(target=lambda n=n: [ingest.submit(f"doc {n}-{i}") for i in range(25)])
+               for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert ingest.flush(timeout=5)
+    assert sorted(text for batch in engine.batches for text, _ in batch) == \
+        sorted(f"doc {n}-{i}" for n in range(4) for i in range(25))
+    assert all(len(batch) <= 16 for batch in engine.batches)
@@ -0,0 +1,41 @@
+from src.result_cache import SearchResultCache
+
+
+def _fetcher(results, calls):
+    def fetch():
+        calls.append(1)
+        return results
+    return fetch
+
+
+def test_fresh_entries_are_served_from_memory(tmp_path):
+    cache = SearchResultCache(db_path=str(tmp_path / 'cache.db'))
+    calls = []
+    first = cache.get_or_fetch(_fetcher([{'title': 'a'}], calls), 'Query', 'news')
+    first[0]['title'] = 'mutated'  # Callers get copies
+
+    assert cache.get_or_fetch(_fetcher([], calls), 'query ', 'news') == [{'title': 'a'}]
+    assert len(calls) == 1
+
+
+def test_disk_tier_survives_a_restart(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    cache = SearchResultCache(db_path=path)
+    cache.get_or_fetch(_fetcher([{'title': 'a'}], []), 'query', 'general')
+    cache.db.execute("SELECT 1")  # Drain the queued disk write
+
+    calls = []
+    restarted = SearchResultCache(db_path=path)
+    assert restarted.get_or_fetch(_fetcher([], calls), 'query', 'general') == [{'title': 'a'}]
+    assert calls == []
+    assert restarted.stats()['disk_hits'] == 1
+
+
+def test_memory_only_without_a_db_path():
+    cache = SearchResultCache(db_path=None)
+    calls = []
+    cache.get_or_fetch(_fetcher([{'title': 'a'}], calls), 'query', 'news')
+    cache.get_or_fetch(_fetcher([{'title': 'a'}], calls), 'query', 'news')
+    cache.clear()
+    cache.get_or_fetch(_fetcher([{'title': 'a'}], calls), 'query', 'news')
+    assert len(calls) == 2
@@ -0,0 +1,108 @@
+import sys
+import types
+import importlib
+
+import pytest
+
+from src import topic_manager as topic_manager_module
+from src.topic_manager import topic_manager
+
+
+@pytest.fixture
+def video_engine(monkeypatch):
+    # scrapetube is only needed for live fetches; nothing here reaches YouTube
+    monkeypatch.setitem(sys.modules, 'scrapetube', sys.modules.get('scrapetube') or types.ModuleType('scrapetube'))
+    return importlib.import_module('src.video_engine')
+
+
+@pytest.fixture
+def engine(video_engine, tmp_path, monkeypatch):
+    monkeypatch.setattr(topic_manager_module, 'TOPICS_FILE', str(tmp_path / 'topics.json'))
+    monkeypatch.setattr(topic_manager, 'topics', {'Christianity': True, 'Sports': True})
+    monkeypatch.setattr(topic_manager, '_listeners', [])
+    monkeypatch.setattr(video_engine, 'DB_FILE', str(tmp_path / 'videos.db'))
+    monkeypatch.setattr(video_engine.feed_snapshots, 'invalidate', lambda kind: None)
+    return video_engine.VideoEngine()
+
+
+def _video(vid, title, channel='Some Channel'):
+    return {'id': vid, 'title': title, 'url': f'https://youtu.be/{vid}', 'thumbnail': '',
+            'channel': channel, 'views': '1', 'published': '', 'timestamp': 1.0}
+
+
+def _masks(engine):
+    return {row['id']: row['topic_mask'] for row in engine.db.query("SELECT id, topic_mask FROM videos")}
+
+
+def test_videos_are_classified_on_insert(engine, video_engine):
+    engine._save_to_db([_video('a', 'Sunday worship live'), _video('b', 'Sports highlights tonight'),
+                        _video('c', 'Cooking pasta at home'), _video('d', 'Message', channel='Jesus Redeems')])
+    bits = engine._topic_bits
+    masks = _masks(engine)
+
+    assert masks['a'] == 1 << bits['Christianity']  # Extra Christian terms count
+    assert masks['b'] == 1 << bits['Sports']
+    assert masks['c'] == 0
+    assert masks['d'] & video_engine.PRIORITY_BIT
+
+
+def test_cleanup_keeps_active_topics_and_priority_rows(engine):
+    engine._save_to_db([_video('a', 'Church choir'), _video('b', 'Sports recap'),
+                        _video('c', 'Cooking pasta'), _video('d', 'Message', channel='Jesus Redeems')])
+    engine.db.execute("INSERT INTO videos (id, title, timestamp) VALUES ('e', 'Bible study', 1.0)")
+    topic_manager.topics['Sports'] = False
+
+    engine.cleanup_irrelevant_videos()  # Classifies 'e' before deleting
+
+    assert set(_masks(engine)) == {'a', 'd', 'e'}
+
+
+def test_new_topic_bit_is_backfilled_into_stored_rows(engine):
+    engine._save_to_db([_video('a', 'Cricket world cup final'), _video('b', 'Gospel music')])
+    topic_manager.topics['Cricket'] = True
+
+    engine._sync_topic_bits()
+
+    cricket = 1 << engine._topic_bits['Cricket']
+    masks = _masks(engine)
+    assert masks['a'] & cricket
+    assert not masks['b'] & cricket
+
+
+def _upload(vid, title):
+    return {'videoId': vid, 'title': {'runs': [{'text': title}]}, 'thumbnail': {'thumbnails': []}}
+
+
+@pytest.fixture
+def channel(engine, video_engine, monkeypatch):
+    uploads = [_upload('n3', 'Sermon three'), _upload('n2', 'Sermon two'), _upload('n1', 'Sermon one')]
+    monkeypatch.setattr(video_engine.http_client, 'pace', lambda *args, **kwargs: None)
+    monkeypatch.setattr(video_engine.scrapetube, 'get_channel', lambda **kwargs: iter(uploads), raising=False)
+    return uploads
+
+
+def _fetch_ids(engine):
+    fresh, newest = engine._fetch_channel('grace')
+    return [v['id'] for v in fresh], newest
+
+
+def test_channel_fetch_stops_at_stored_marker(engine, channel):
+    engine._save_to_db([_video('n2', 'Sermon two')])
+    engine._channel_seen['grace'] = 'n2'
+    assert _fetch_ids(engine) == (['n3'], 'n3')
+
+
+def test_channel_marker_is_ignored_once_its_video_is_deleted(engine, channel):
+    engine._channel_seen['grace'] = 'n2'  # Marker set, video trimmed since
+    assert _fetch_ids(engine) == (['n3', 'n2', 'n1'], 'n3')
+
+
+def test_topic_change_forgets_channel_markers(engine):
+    engine.db.execute("INSERT INTO channel_state (channel, last_video_id, last_checked) VALUES ('grace', 'n2', 1)")
+    engine._channel_seen['grace'] = 'n2'
+
+    engine._on_topics_changed(['Christianity'])
+    engine.db.execute("SELECT 1")  # Drain the queued delete
+
+    assert engine._channel_seen == {}
+    assert engine.db.query("SELECT * FROM channel_state") == []